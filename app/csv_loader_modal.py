@@ -1,19 +1,25 @@
 # app/csv_loader_modal.py
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 import threading
 import time
 
 from .progress_modal import ProgressModal, centrar_ventana
 
+# Frecuencia máxima de refresco de la barra de progreso (segundos entre updates)
+INTERVALO_PROGRESO = 0.1
+
 
 class CSVLoaderModal(tk.Toplevel):
-    def __init__(self, parent, df, callback):
+    def __init__(self, parent, filepath, csv_manager, callback):
         super().__init__(parent)
         self.parent = parent
-        self.df = df
+        self.filepath = filepath
+        self.csv_manager = csv_manager
         self.callback = callback
+        # Solo se cuentan líneas (lectura de bytes), el parseo real se hace al aceptar
+        self.total_filas = csv_manager.contar_filas(filepath)
         self.title("Seleccionar filas a cargar")
         self.geometry("300x150")
         self.resizable(False, False)
@@ -22,7 +28,7 @@ class CSVLoaderModal(tk.Toplevel):
         # Centrar sobre ventana principal
         centrar_ventana(self, parent)
 
-        tk.Label(self, text=f"Total de elementos: {len(df)}").grid(row=0, column=0, columnspan=2, pady=10)
+        tk.Label(self, text=f"Total de elementos: {self.total_filas}").grid(row=0, column=0, columnspan=2, pady=10)
 
         # Variables de control
         self.var_cargar_todo = tk.IntVar(value=1)
@@ -72,29 +78,52 @@ class CSVLoaderModal(tk.Toplevel):
     def _aceptar(self):
         # Determinar filas a cargar
         if self.var_cargar_todo.get():
-            df_seleccion = self.df
+            nrows = None
+            total = self.total_filas
         else:
-            n = int(self.entry_n.get())
-            df_seleccion = self.df.head(n)
+            nrows = int(self.entry_n.get())
+            total = min(nrows, self.total_filas)
 
         # Cerrar modal original
         self.destroy()
 
         # Crear modal de progreso
-        progress_modal = ProgressModal(self.parent, len(df_seleccion))
+        progress_modal = ProgressModal(self.parent, total)
+        ultimo_refresco = [0.0]
+
+        def progreso(filas):
+            # Limitar los updates de la GUI a INTERVALO_PROGRESO (y siempre el último)
+            ahora = time.perf_counter()
+            if ahora - ultimo_refresco[0] >= INTERVALO_PROGRESO or filas >= total:
+                ultimo_refresco[0] = ahora
+                self.parent.after(0, progress_modal.establecer, filas)
 
         def cargar_elementos():
-            for idx, row in df_seleccion.iterrows():
-                if progress_modal.cancelled:
-                    break
-                # Simula procesamiento de cada fila (reemplazar con tu lógica real)
-                time.sleep(0.05)
-                # Actualiza barra en hilo principal
-                self.parent.after(0, progress_modal.actualizar)
+            try:
+                df = self.csv_manager.cargar_csv_por_bloques(
+                    self.filepath,
+                    nrows=nrows,
+                    progreso=progreso,
+                    cancelado=lambda: progress_modal.cancelled,
+                )
+            except Exception as e:
+                mensaje = f"No se pudo cargar el CSV: {str(e)}"
+                self.parent.after(0, lambda: (
+                    progress_modal.cerrar(),
+                    messagebox.showerror("Error", mensaje)
+                ))
+                return
 
             # Llamar callback al terminar si no se canceló
-            if not progress_modal.cancelled:
-                self.parent.after(0, lambda: self.callback(df_seleccion))
+            if df is not None and not progress_modal.cancelled:
+                self.parent.after(0, lambda: self._finalizar(progress_modal, df))
 
         # Ejecutar la carga en hilo separado
         threading.Thread(target=cargar_elementos, daemon=True).start()
+
+    def _finalizar(self, progress_modal, df):
+        progress_modal.cerrar()
+        informe = self.csv_manager.informe_calidad
+        if informe is not None and (informe.duplicates or informe.ohlc_violations):
+            messagebox.showwarning("Calidad de datos", str(informe))
+        self.callback(df)
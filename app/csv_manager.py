@@ -2,38 +2,129 @@
 
 import pandas as pd
 import os
-import pickle
 import tkinter as tk
 from tkinter import filedialog, messagebox
 
+from datastore import (ColumnarStore, OHLCVStore, IncrementalIngestor, DataCatalog, parse_dukascopy_timestamps,
+                       parse_dukascopy_name, scan_quality)
+
+# Formatos de la carpeta processed/: columnar (actual), almacén mapeado en
+# memoria (.ohlcv) y pickle (heredado, solo lectura)
+EXTENSIONES_PROCESADOS = ('.feather', '.ohlcv', '.pkl')
+
 class CSVManager:
     def __init__(self, root):
         self.root = root
         self.df_cache = None
+        self.store = None
+        # (symbol, timeframe, año) de los datos cargados, si el nombre del fichero lo indica
+        self.origen = None
+        # Validación de calidad al cargar CSV: None (solo informar), 'drop' o 'ffill'
+        self.reparacion = None
+        self.informe_calidad = None
         # Definir la ruta base del proyecto
         self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        # Catálogo de processed/ y de los CSV de DukascopyCSVParser (csv/processed):
+        # al arrancar solo se leen metadatos; si se repite una clave gana processed/
+        self.catalogo = DataCatalog([self.obtener_ruta_processed(),
+                                     os.path.join(self.base_dir, 'csv', 'processed')]).scan()
 
-    def cargar_csv(self):
-        # Empezar desde la carpeta csv/ del proyecto
+    def seleccionar_csv(self):
+        """Abre el diálogo de selección de CSV (carpeta csv/ del proyecto)."""
         initial_dir = os.path.join(self.base_dir, 'csv')
         filepath = filedialog.askopenfilename(
             initialdir=initial_dir,
             filetypes=[("CSV Files", "*.csv")]
         )
+        return filepath or None
+
+    @staticmethod
+    def contar_filas(filepath, block_bytes=16 * 1024 * 1024):
+        """Cuenta las filas del CSV leyendo bloques de bytes (sin parsear)."""
+        filas = 0
+        ultimo = b'\n'
+        with open(filepath, 'rb') as f:
+            while True:
+                bloque = f.read(block_bytes)
+                if not bloque:
+                    break
+                filas += bloque.count(b'\n')
+                ultimo = bloque[-1:]
+        # Última línea sin salto de línea final
+        return filas + (0 if ultimo == b'\n' else 1)
+
+    def cargar_csv_por_bloques(self, filepath, nrows=None, chunksize=100_000,
+                               progreso=None, cancelado=None):
+        """
+        Carga un CSV crudo de Dukascopy por bloques.
+        - nrows: número máximo de filas a cargar (None = todas).
+        - progreso: callable(filas_cargadas) llamado tras cada bloque.
+        - cancelado: callable() -> bool; si devuelve True se detiene la carga y
+          se devuelve None.
+        No muestra diálogos (puede ejecutarse en un hilo): los errores se propagan.
+        """
+        reader = pd.read_csv(filepath, sep=';', header=None, nrows=nrows, chunksize=chunksize,
+                             names=['DateTime', 'Open', 'High', 'Low', 'Close', 'Volume'])
+        bloques = []
+        cargadas = 0
+        for chunk in reader:
+            if cancelado is not None and cancelado():
+                return None
+            chunk['DateTime'] = parse_dukascopy_timestamps(chunk['DateTime'].to_numpy())
+            chunk.set_index('DateTime', inplace=True)
+            bloques.append(chunk)
+            cargadas += len(chunk)
+            if progreso is not None:
+                progreso(cargadas)
+
+        if not bloques:
+            raise ValueError("El fichero no contiene filas")
+        df = pd.concat(bloques) if len(bloques) > 1 else bloques[0]
+        # Validación en línea: huecos, duplicados y velas OHLC inválidas
+        df, self.informe_calidad = scan_quality(df, repair=self.reparacion)
+        self.df_cache = df
+        self.origen = parse_dukascopy_name(filepath)
+        return df
+
+    def cargar_csv(self):
+        filepath = self.seleccionar_csv()
         if not filepath:
             return None
 
         try:
-            df = pd.read_csv(filepath, sep=';', header=None,
-                             names=['DateTime', 'Open', 'High', 'Low', 'Close', 'Volume'])
-            df['DateTime'] = pd.to_datetime(df['DateTime'], format='%Y%m%d %H%M%S')
-            df.set_index('DateTime', inplace=True)
-            self.df_cache = df
+            df = self.cargar_csv_por_bloques(filepath)
+            if self.informe_calidad.duplicates or self.informe_calidad.ohlc_violations:
+                messagebox.showwarning("Calidad de datos", str(self.informe_calidad))
             return df
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo cargar el CSV: {str(e)}")
             return None
 
+    def actualizar_csv_incremental(self, filepath=None):
+        """
+        Ingiere solo las velas nuevas de un CSV que crece (feed diario) y las añade
+        al almacén processed/<SYMBOL>_<TF>.ohlcv. Devuelve el DataFrame completo
+        (vistas sobre el almacén, sin copia).
+        """
+        if not filepath:
+            filepath = filedialog.askopenfilename(
+                initialdir=os.path.join(self.base_dir, 'csv'),
+                filetypes=[("CSV Files", "*.csv")]
+            )
+        if not filepath:
+            return None
+
+        try:
+            resumen = IncrementalIngestor(self.obtener_ruta_processed()).ingest(filepath)
+            self.catalogo.scan()
+            self.store = OHLCVStore.open(resumen['store'])
+            self.df_cache = self.store.to_frame()
+            self.origen = parse_dukascopy_name(resumen['store'])
+            return self.df_cache
+        except Exception as e:
+            messagebox.showerror("Error", f"No se pudo actualizar el CSV: {str(e)}")
+            return None
+
     def guardar_procesados(self, filename=None):
         if self.df_cache is None:
             messagebox.showwarning("Atención", "No hay datos para guardar.")
@@ -44,19 +135,13 @@ class CSVManager:
         os.makedirs(folder, exist_ok=True)
 
         if not filename:
-            # Sugerir nombre basado en el rango de fechas
-            if not self.df_cache.empty:
-                start_date = self.df_cache.index[0].strftime('%Y%m%d')
-                end_date = self.df_cache.index[-1].strftime('%Y%m%d')
-                default_name = f"processed_data_{start_date}_{end_date}.pkl"
-            else:
-                default_name = "processed_data.pkl"
-                
+            default_name = self.nombre_por_defecto()
+
             filename = filedialog.asksaveasfilename(
                 initialdir=folder,
                 initialfile=default_name,
-                defaultextension=".pkl",
-                filetypes=[("Pickle Files", "*.pkl")]
+                defaultextension=".feather",
+                filetypes=[("Feather Files", "*.feather")]
             )
 
         if not filename:
@@ -66,42 +151,110 @@ class CSVManager:
             # Asegurar que se guarda en la carpeta processed/
             if not filename.startswith(folder):
                 filename = os.path.join(folder, os.path.basename(filename))
+            if not filename.endswith('.feather'):
+                filename = os.path.splitext(filename)[0] + '.feather'
             
-            with open(filename, 'wb') as f:
-                pickle.dump(self.df_cache, f)
+            ColumnarStore.save(self.df_cache, filename)
+            self.catalogo.scan()
             messagebox.showinfo("Éxito", f"Datos guardados en {os.path.basename(filename)}")
         except Exception as e:
             messagebox.showerror("Error", f"No se pudieron guardar los datos: {str(e)}")
 
-    def cargar_procesados(self):
+    def nombre_por_defecto(self):
+        """
+        Nombre sugerido al guardar df_cache, con la convención del catálogo:
+        SYMBOL_TF_AÑO.feather si las velas son de un solo año, SYMBOL_TF.feather
+        si abarcan varios. Sin symbol/timeframe conocidos se usa el rango de fechas
+        (el fichero no aparecerá en el catálogo).
+        """
+        if self.df_cache.empty:
+            return "processed_data.feather"
+        inicio, fin = self.df_cache.index[0], self.df_cache.index[-1]
+        if self.origen is None:
+            return f"processed_data_{inicio:%Y%m%d}_{fin:%Y%m%d}.feather"
+        symbol, timeframe = self.origen[0], self.origen[1]
+        if inicio.year == fin.year:
+            return f"{symbol}_{timeframe}_{inicio.year}.feather"
+        return f"{symbol}_{timeframe}.feather"
+
+    def cargar_procesados(self, filepath=None, columnas=None, inicio=None, fin=None):
+        """
+        Carga un fichero de processed/.
+        columnas, inicio y fin permiten leer solo un subconjunto de columnas y
+        un rango de fechas sin cargar el fichero completo (solo formato columnar).
+        """
         # Usar la carpeta processed/ del proyecto
         folder = os.path.join(self.base_dir, 'processed')
         os.makedirs(folder, exist_ok=True)
 
-        filepath = filedialog.askopenfilename(
-            initialdir=folder,
-            filetypes=[("Pickle Files", "*.pkl")]
-        )
+        if not filepath:
+            filepath = filedialog.askopenfilename(
+                initialdir=folder,
+                filetypes=[("Feather Files", "*.feather"), ("Pickle Files (antiguo)", "*.pkl")]
+            )
         
         if not filepath:
             return None
 
         try:
-            with open(filepath, 'rb') as f:
-                df = pickle.load(f)
+            if filepath.endswith('.pkl'):
+                # Formato heredado: se carga completo y se filtra en memoria
+                df = pd.read_pickle(filepath)
+                if columnas is not None:
+                    df = df[columnas]
+                if inicio is not None or fin is not None:
+                    df = df.loc[inicio:fin]
+            else:
+                df = ColumnarStore.load(filepath, columns=columnas, start=inicio, end=fin)
             self.df_cache = df
+            self.origen = parse_dukascopy_name(filepath)
             return df
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo cargar el archivo: {str(e)}")
             return None
 
+    def guardar_ohlcv_store(self, nombre):
+        """Guarda df_cache como almacén mapeado en memoria processed/<nombre>.ohlcv"""
+        if self.df_cache is None:
+            return None
+        if not nombre.endswith('.ohlcv'):
+            nombre += '.ohlcv'
+        path = os.path.join(self.obtener_ruta_processed(), nombre)
+        self.store = OHLCVStore.write(self.df_cache, path)
+        self.catalogo.scan()
+        return self.store
+
+    def cargar_ohlcv_store(self, path, inicio=None, fin=None):
+        """
+        Abre un almacén .ohlcv (ruta o nombre dentro de processed/) y devuelve la
+        ventana [inicio, fin] sin copiar datos. df_cache pasa a ser un DataFrame
+        de solo lectura sobre esa misma memoria.
+        """
+        if not os.path.isabs(path):
+            path = os.path.join(self.obtener_ruta_processed(), path)
+        self.store = OHLCVStore.open(path).window(inicio, fin)
+        self.df_cache = self.store.to_frame()
+        self.origen = parse_dukascopy_name(path)
+        return self.store
+
+    def cargar_del_catalogo(self, symbol, timeframe, year=None):
+        """Carga (con caché LRU) los datos de processed/ para symbol/timeframe/año."""
+        try:
+            df = self.catalogo.load(symbol, timeframe, year)
+            self.df_cache = df
+            self.origen = (symbol, timeframe, None if year is None else str(year))
+            return df
+        except Exception as e:
+            messagebox.showerror("Error", f"No se pudo cargar {symbol} {timeframe} {year or ''}: {str(e)}")
+            return None
+
     def obtener_ruta_processed(self):
         """Devuelve la ruta absoluta a la carpeta processed/"""
         return os.path.join(self.base_dir, 'processed')
 
     def listar_archivos_procesados(self):
-        """Lista todos los archivos .pkl en la carpeta processed/"""
+        """Lista todos los archivos .feather (y .pkl heredados) en la carpeta processed/"""
         folder = self.obtener_ruta_processed()
         if os.path.exists(folder):
-            return [f for f in os.listdir(folder) if f.endswith('.pkl')]
+            return [f for f in os.listdir(folder) if f.endswith(EXTENSIONES_PROCESADOS)]
         return []
\ No newline at end of file
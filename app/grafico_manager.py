@@ -1,8 +1,11 @@
 # app/grafico_manager.py
 
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+import pandas as pd
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from .candlestick_chart import CandlestickChart
+from datastore import Resampler
 import numpy as np
 
 class GraficoManager:
@@ -12,13 +15,38 @@ class GraficoManager:
         self.grafico = None
         self.fig = None
         self.ax = None
+        self.resampler = None
 
-    def dibujar_csv(self, df):
+    def dibujar_csv(self, df, timeframe=None):
+        """Dibuja las velas de df; con timeframe ('M5', 'H1', ...) dibuja la vista agregada."""
+        if timeframe is not None:
+            # Reutilizar la caché de agregados mientras los datos sean los mismos
+            if self.resampler is None or self.resampler.source is not df:
+                self.resampler = Resampler(df)
+            df = self.resampler.get(timeframe)
         self.grafico = CandlestickChart.from_dataframe(df)
         self.fig, self.ax = self.grafico.crear_figura()
         self._dibujar_canvas()
         return self.fig, self.ax
 
+    def fecha_central(self):
+        """Fecha en el centro de la vista actual (None si no hay gráfico)."""
+        if self.ax is None:
+            return None
+        x0, x1 = self.ax.get_xlim()
+        return pd.Timestamp(mdates.num2date((x0 + x1) / 2)).tz_localize(None)
+
+    def centrar_en(self, fecha, ancho=None):
+        """Centra la vista en una fecha conservando el ancho visible (ancho en días opcional)."""
+        if self.ax is None:
+            return
+        x0, x1 = self.ax.get_xlim()
+        ancho = ancho if ancho is not None else x1 - x0
+        centro = mdates.date2num(pd.Timestamp(fecha))
+        self.ax.set_xlim(centro - ancho / 2, centro + ancho / 2)
+        if self.canvas:
+            self.canvas.draw_idle()
+
     def _dibujar_canvas(self):
         if self.canvas:
             self.canvas.get_tk_widget().destroy()
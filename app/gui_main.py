@@ -17,7 +17,7 @@ from .strategies_modal import EstrategiasModal
 from patterns.candlestickpatterns import CandlestickPatterns
 
 # Imports externos
-from strategies import ForexStrategies, CandleStrategies
+from strategies import ForexStrategies, CandleStrategies, EnsembleRunner
 from backtesting.backtester import ForexBacktester
 from rl.rl_agent import RLTradingAgent
 from strategies.risk_manager import RiskManager, RiskManagerIntegration, Operacion  
@@ -43,6 +43,7 @@ class GUIPrincipal:
         self.grafico_manager = GraficoManager(frame=None)
         self.tooltip_zoom_pan = None
         self.df_actual = None
+        self.indice_patrones = None  # OccurrenceIndex del último PatternsModal
         self.dinero_ficticio = 0
         self.beneficios = 0
         self.perdidas = 0
@@ -171,6 +172,20 @@ class GUIPrincipal:
         self.btn_reset_zoom = ttk.Button(self.frame_left, text="Reset Zoom", command=self.reset_zoom)
         self.btn_reset_zoom.pack(side="left", padx=5)
 
+        # Navegación por apariciones de patrones (se habilita tras aplicar patrones)
+        self.combo_patron_nav = ttk.Combobox(self.frame_left, width=18, state="disabled", values=[])
+        self.combo_patron_nav.pack(side="left", padx=(5, 0))
+        self.btn_patron_anterior = ttk.Button(
+            self.frame_left, text="◀", width=3, command=lambda: self._navegar_patron(-1), state="disabled"
+        )
+        self.btn_patron_anterior.pack(side="left")
+        self.btn_patron_siguiente = ttk.Button(
+            self.frame_left, text="▶", width=3, command=lambda: self._navegar_patron(1), state="disabled"
+        )
+        self.btn_patron_siguiente.pack(side="left", padx=(0, 5))
+        self.root.bind("<Control-Left>", lambda e: self._navegar_patron(-1))
+        self.root.bind("<Control-Right>", lambda e: self._navegar_patron(1))
+
         # ---------------- Dinero/beneficios/pérdidas (centro) ----------------
         self.label_dinero = tk.Label(
             self.frame_center, text=f"Dinero: ${self.dinero_ficticio:,.2f}", fg="black", bg="#F0F0F0"
@@ -233,9 +248,9 @@ class GUIPrincipal:
 
     # ---------------- Funciones CSV ----------------
     def cargar_csv(self):
-        df = self.csv_manager.cargar_csv()
-        if df is not None:
-            CSVLoaderModal(self.root, df, callback=self._on_csv_cargado)
+        filepath = self.csv_manager.seleccionar_csv()
+        if filepath:
+            CSVLoaderModal(self.root, filepath, self.csv_manager, callback=self._on_csv_cargado)
 
     def _on_csv_cargado(self, df_seleccion):
         self.df_actual = df_seleccion
@@ -276,9 +291,8 @@ class GUIPrincipal:
             messagebox.showwarning("Atención", "Cargue primero un CSV o datos procesados")
             return
     
-        # Instanciar estrategias con el DataFrame actual
-        self.strategies_fx = ForexStrategies(self.df_actual)
-        self.strategies_candle = CandleStrategies(self.df_actual)
+        # Runner con las estrategias instanciadas sobre el DataFrame actual
+        self.ensemble = EnsembleRunner(self.df_actual)
 
         # Obtener métodos públicos de cada clase
         fx_methods = [
@@ -322,60 +336,41 @@ class GUIPrincipal:
         self.risk_integration = RiskManagerIntegration(self.risk_manager, None)
         self.risk_manager.reset()
 
-        # Asegurar que las instancias existen
-        if not hasattr(self, 'strategies_fx'):
-            self.strategies_fx = ForexStrategies(self.df_actual)
-        if not hasattr(self, 'strategies_candle'):
-            self.strategies_candle = CandleStrategies(self.df_actual)
+        # Asegurar que el runner existe
+        if getattr(self, 'ensemble', None) is None:
+            self.ensemble = EnsembleRunner(self.df_actual)
 
-        df_new = self.df_actual.copy()
-
-        # Primera pasada: aplicar estrategias y generar señales
+        # Primera pasada: todas las estrategias juntas (indicadores y patrones
+        # compartidos, ejecución en paralelo) -> matriz de señales estrategias x velas
+        tareas = []
         for nombre, params in seleccion.items():
-            try:
-                if params.get("tipo") == "forex":
-                    # Estrategia Forex con gestión de riesgo
-                    metodo = getattr(self.strategies_fx, nombre, None)
-                    if not callable(metodo):
-                        self.log(f"Estrategia Forex no encontrada: {nombre}", color='red')
-                        continue
-                    
-                    risk_kwargs = {
-                        'risk_per_trade': params.get('riesgo', 0.01),
-                        'rr_ratio': params.get('rr', 2.0),
-                    }
-                    df_res = metodo(**risk_kwargs)
-                    
-                else:
-                    # Estrategia Candle sin gestión de riesgo
-                    metodo = getattr(self.strategies_candle, nombre, None)
-                    if not callable(metodo):
-                        self.log(f"Estrategia Candle no encontrada: {nombre}", color='red')
-                        continue
-                    df_res = metodo()
-
-                if 'Signal' in df_res.columns:
-                    col_name = f"{nombre}_Signal"
-                    sig_series = df_res['Signal']
-                    # Limitar a max_orders señales por estrategia
-                    sig_indices = sig_series[sig_series != 0].index[:max_orders]
-                    df_new[col_name] = 0
-                    df_new.loc[sig_indices, col_name] = sig_series.loc[sig_indices]
-                    
-                    # Loguear detección de señales solo si está habilitado
-                    if opciones["mostrar_deteccion"]:
-                        for idx in sig_indices:
-                            val = sig_series.loc[idx]
-                            close_val = df_new.loc[idx, 'Close'] if 'Close' in df_new.columns else None
-                            fecha_str = idx.strftime('%d/%m/%Y %H:%M') if hasattr(idx, 'strftime') else str(idx)
-                            tipo = "Forex" if params.get("tipo") == "forex" else "Candle"
-                            msg = f"DETECCIÓN: {nombre} ({tipo}) | Fecha: {fecha_str} | Señal: {val}"
-                            if close_val is not None:
-                                msg += f" | Precio: {close_val:.5f}"
-                            self.log(msg, color='cyan' if tipo == "Forex" else 'yellow')
-                        
-            except Exception as e:
-                self.log(f"Error aplicando estrategia {nombre}: {e}", color='red')
+            tipo = "forex" if params.get("tipo") == "forex" else "candle"
+            # Estrategias Forex con gestión de riesgo; las de velas sin parámetros
+            kwargs = {
+                'risk_per_trade': params.get('riesgo', 0.01),
+                'rr_ratio': params.get('rr', 2.0),
+            } if tipo == "forex" else {}
+            tareas.append((nombre, tipo, kwargs))
+        resultado = self.ensemble.run(tareas)
+        for nombre, error in resultado.errors.items():
+            self.log(f"Error aplicando estrategia {nombre}: {error}", color='red')
+
+        # Limitar a max_orders señales por estrategia y añadir todas las columnas de una vez
+        resultado = resultado.limit(max_orders)
+        df_new = pd.concat([self.df_actual.drop(columns=[f"{n}_Signal" for n in resultado.names],
+                                                errors='ignore'),
+                            resultado.to_frame().reindex(self.df_actual.index, fill_value=0)], axis=1)
+
+        # Loguear detección de señales solo si está habilitado
+        if opciones["mostrar_deteccion"]:
+            closes = self.ensemble.fx.data['Close'].to_numpy()
+            for nombre, fila in zip(resultado.names, resultado.signals):
+                tipo = "Forex" if seleccion[nombre].get("tipo") == "forex" else "Candle"
+                for pos in np.flatnonzero(fila):
+                    idx = resultado.index[pos]
+                    fecha_str = idx.strftime('%d/%m/%Y %H:%M') if hasattr(idx, 'strftime') else str(idx)
+                    msg = f"DETECCIÓN: {nombre} ({tipo}) | Fecha: {fecha_str} | Señal: {int(fila[pos])} | Precio: {closes[pos]:.5f}"
+                    self.log(msg, color='cyan' if tipo == "Forex" else 'yellow')
 
         # Segunda pasada: procesar el dataframe completo con el Risk Manager solo si está habilitado
         if opciones["mostrar_simulacion"]:
@@ -610,19 +605,19 @@ class GUIPrincipal:
         # 1) Detectar patrones seleccionados y loguearlos
         try:
             if patrones_sel:
-                patterns = CandlestickPatterns(self.df_actual)
+                # Una sola pasada del motor para todos los patrones seleccionados
+                resultado = CandlestickPatterns(self.df_actual).detect(patrones_sel)
                 for p in patrones_sel:
                     try:
-                        serie = patterns.__getattribute__(p)()['Signal']
-                        for idx, val in serie.items():
-                            if val != 0:
-                                row = self.df_actual.loc[idx]
-                                fecha_str = idx.strftime('%d/%m/%Y') if hasattr(idx, 'strftime') else str(idx)
-                                color = 'green' if row['Close'] > row['Open'] else ('red' if row['Close'] < row['Open'] else 'gray')
-                                self.log(
-                                    f"Patrón: {p} | Fecha: {fecha_str} | Open: {row['Open']:.5f} | Close: {row['Close']:.5f}",
-                                    color=color,
-                                )
+                        for pos in np.flatnonzero(resultado[p]):
+                            idx = resultado.index[pos]
+                            row = self.df_actual.iloc[pos]
+                            fecha_str = idx.strftime('%d/%m/%Y') if hasattr(idx, 'strftime') else str(idx)
+                            color = 'green' if row['Close'] > row['Open'] else ('red' if row['Close'] < row['Open'] else 'gray')
+                            self.log(
+                                f"Patrón: {p} | Fecha: {fecha_str} | Open: {row['Open']:.5f} | Close: {row['Close']:.5f}",
+                                color=color,
+                            )
                     except Exception as e:
                         self.log(f"Error detectando patrón {p}: {e}", color='red')
         except Exception as e:
@@ -663,6 +658,41 @@ class GUIPrincipal:
         else:
             messagebox.showwarning("Atención", "No hay datos cargados para aplicar patrones")
 
+    def establecer_indice_patrones(self, indice):
+        """Guarda el OccurrenceIndex de los patrones aplicados y actualiza los controles de navegación."""
+        self.indice_patrones = indice
+        nombres = [] if indice is None else [n for n in indice.names if indice.count(n) > 0]
+        self.combo_patron_nav.config(values=nombres, state="readonly" if nombres else "disabled")
+        self.combo_patron_nav.set(nombres[0] if nombres else "")
+        estado = "normal" if nombres else "disabled"
+        self.btn_patron_anterior.config(state=estado)
+        self.btn_patron_siguiente.config(state=estado)
+
+    def _navegar_patron(self, sentido):
+        nombre = self.combo_patron_nav.get()
+        if not nombre:
+            return
+        fecha = self.ir_a_patron(nombre, sentido)
+        if fecha is None:
+            self.log(f"No hay más apariciones de {nombre} {'después' if sentido > 0 else 'antes'} de la vista actual", color="yellow")
+        else:
+            self.log(f"{nombre}: {pd.Timestamp(fecha).strftime('%Y-%m-%d %H:%M')}", color="white")
+
+    def ir_a_patron(self, nombre, sentido=1):
+        """Centra el gráfico en la siguiente (sentido=1) o anterior (-1) aparición del patrón."""
+        indice = self.indice_patrones
+        if indice is None or nombre not in indice:
+            return None
+        fecha_actual = self.grafico_manager.fecha_central()
+        if fecha_actual is None:
+            return None
+        pos = indice.next(nombre, fecha_actual) if sentido > 0 else indice.previous(nombre, fecha_actual)
+        if pos is None:
+            return None
+        fecha = indice.index[pos]
+        self.grafico_manager.centrar_en(fecha)
+        return fecha
+
     # ---------------- Funciones RL ----------------
     def entrenar_rl(self):
         if self.df_actual is None:
@@ -729,6 +759,7 @@ class GUIPrincipal:
 
     def limpiar_grafico(self):
         self.df_actual = None
+        self.establecer_indice_patrones(None)
         if self.tooltip_zoom_pan:
             self.tooltip_zoom_pan.cleanup()
         self.tooltip_zoom_pan = None
@@ -3,8 +3,10 @@
 import tkinter as tk
 from tkinter import ttk
 from patterns.candlestickpatterns import CandlestickPatterns
+from patterns.registry import REGISTRY, GROUPS
 import threading
 import pandas as pd
+import numpy as np
 
 class ScrollableFrame(ttk.Frame):
     """Frame con scroll vertical confiable"""
@@ -58,19 +60,6 @@ class PatternsModal(tk.Toplevel):
         self.resizable(True, True)
         self.grab_set()
 
-        self.one_candle_patterns = [
-            'doji', 'hammer', 'hanging_man', 'shooting_star', 'spinning_top', 'inverted_hammer'
-        ]
-        self.two_candle_patterns = [
-            'bullish_engulfing', 'bearish_engulfing', 'piercing_line', 'dark_cloud_cover',
-            'tweezer_top', 'tweezer_bottom'
-        ]
-        self.three_candle_patterns = [
-            'morning_star', 'evening_star', 'three_white_soldiers', 'three_black_crows',
-            'three_inside_up', 'three_inside_down', 'rising_three_methods', 'falling_three_methods'
-        ]
-        self.other_patterns = []
-
         self.vars = {}
         self.vars_strat = {}
 
@@ -90,10 +79,9 @@ class PatternsModal(tk.Toplevel):
                 chk.pack(fill="x", anchor="w", pady=1)
                 self.vars[pattern] = var
 
-        add_section("----- Patrones de una vela -----", self.one_candle_patterns)
-        add_section("----- Patrones de dos velas -----", self.two_candle_patterns)
-        add_section("----- Patrones de tres velas -----", self.three_candle_patterns)
-        add_section("----- Otros patrones -----", self.other_patterns)
+        # Secciones construidas desde el registro de patrones
+        for grupo, nombres in REGISTRY.groups().items():
+            add_section(f"----- {GROUPS[grupo]} -----", nombres)
 
         # Opcional: sección de estrategias para backtesting
         if self.include_strategies and self.strategies_list:
@@ -159,50 +147,49 @@ class PatternsModal(tk.Toplevel):
         self.lbl_progress.config(text=f"Procesando 0/{len(selected_patterns)} patrones...")
         # Deshabilitar aceptar mientras procesa
         self.btn_accept.state(["disabled"])
-        # Ejecutar procesamiento en thread para no bloquear GUI
-        df_patrones = self.df.copy()
+        # Una sola pasada del motor fusionado; el DataFrame se construye al final
+        resultado = patterns.detect(selected_patterns)
+        coincidencias = resultado.counts()
         encontrados_totales = 0
-        for pattern_name in selected_patterns:
-            df_patrones[pattern_name] = patterns.__getattribute__(pattern_name)()['Signal']
-            # contar coincidencias del patrón actual
-            encontrados_patron = (df_patrones[pattern_name] != 0).sum()
-            encontrados_totales += int(encontrados_patron)
+        for idx_actual, pattern_name in enumerate(selected_patterns, start=1):
+            encontrados_totales += coincidencias[pattern_name]
             # actualizar progreso en el hilo de UI
-            idx_actual = selected_patterns.index(pattern_name) + 1
-            self.after(0, lambda i=idx_actual, total=len(selected_patterns), p=pattern_name, found=encontrados_totales: (
+            self.after(0, lambda i=idx_actual, total=len(selected_patterns), found=encontrados_totales: (
                 self.progress.config(value=i),
                 self.lbl_progress.config(text=f"Procesando {i}/{total} patrones... | Coincidencias: {found}")
             ))
 
-        pattern_cols = df_patrones.columns.difference(['Open','High','Low','Close'])
-        has_bull = (df_patrones[pattern_cols] == 1).any(axis=1)
-        has_bear = (df_patrones[pattern_cols] == -1).any(axis=1)
-        df_patrones['Final_Signal'] = 0
-        df_patrones.loc[has_bull & ~has_bear, 'Final_Signal'] = 1
-        df_patrones.loc[has_bear & ~has_bull, 'Final_Signal'] = -1
+        df_patrones = resultado.to_frame(self.df)
+        df_patrones['Final_Signal'] = resultado.final_signal().astype(np.int64)
 
         # Actualizar GUI usando after
-        self.after(0, lambda: self.actualizar_grafico_log(df_patrones, selected_patterns))
+        indice = resultado.occurrences()
+        self.after(0, lambda: self.actualizar_grafico_log(df_patrones, selected_patterns, indice))
 
-    def actualizar_grafico_log(self, df_patrones, patterns_list):
+    def actualizar_grafico_log(self, df_patrones, patterns_list, indice=None):
         if self.grafico_manager:
             self.grafico_manager.dibujar_csv(df_patrones)
         if self.callback:
             self.callback(df_patrones)
 
         if self.gui_principal is not None:
+            if indice is None:
+                indice = CandlestickPatterns(df_patrones).detect(patterns_list).occurrences()
+            # Índice disponible para la navegación del gráfico (siguiente/anterior patrón)
+            self.gui_principal.establecer_indice_patrones(indice)
+            opens = df_patrones['Open'].to_numpy()
+            closes = df_patrones['Close'].to_numpy()
             for pattern_name in patterns_list:
-                for i, row in df_patrones.iterrows():
-                    if row[pattern_name] != 0:
-                        fecha = row.name if isinstance(row.name, pd.Timestamp) else pd.to_datetime(row.name)
-                        fecha_str = fecha.strftime("%d/%m/%Y")
-                        color = "gray"
-                        if row["Close"] > row["Open"]:
-                            color = "green"
-                        elif row["Close"] < row["Open"]:
-                            color = "red"
-                        mensaje = f"Patrón: {pattern_name} | Fecha: {fecha_str} | Open: {row['Open']:.5f} | Close: {row['Close']:.5f}"
-                        self.gui_principal.log(mensaje, color=color)
+                posiciones = indice.positions(pattern_name)
+                fechas = pd.to_datetime(df_patrones.index[posiciones]).strftime("%d/%m/%Y")
+                for pos, fecha_str in zip(posiciones, fechas):
+                    color = "gray"
+                    if closes[pos] > opens[pos]:
+                        color = "green"
+                    elif closes[pos] < opens[pos]:
+                        color = "red"
+                    mensaje = f"Patrón: {pattern_name} | Fecha: {fecha_str} | Open: {opens[pos]:.5f} | Close: {closes[pos]:.5f}"
+                    self.gui_principal.log(mensaje, color=color)
 
         # Completar progreso y re-habilitar por si el modal no se cerrara aún
         try:
@@ -69,6 +69,29 @@ class ProgressModal:
             # La ventana fue destruida mientras se actualizaba
             pass
 
+    def establecer(self, valor):
+        """Fijar el progreso a un valor absoluto (p.ej. filas cargadas)"""
+        if self.cancelled or not self.top.winfo_exists():
+            return
+
+        try:
+            self.value = min(valor, self.total_items)
+            self.progress['value'] = self.value
+            porcentaje = int((self.value / self.total_items) * 100) if self.total_items else 100
+            self.label_percent.config(text=f"{porcentaje}% ({self.value:,}/{self.total_items:,})")
+            self.top.update_idletasks()
+        except tk.TclError:
+            # La ventana fue destruida mientras se actualizaba
+            pass
+
+    def cerrar(self):
+        """Cerrar el modal al terminar sin marcarlo como cancelado"""
+        try:
+            if self.top.winfo_exists():
+                self.top.destroy()
+        except tk.TclError:
+            pass
+
     def cancelar(self):
         """Cancelar la carga"""
         self.cancelled = True
@@ -1,4 +1,5 @@
 # backtesting/__init__.py
 from .backtester import ForexBacktester
+from .walk_forward import WalkForward, WalkForwardResult, DEFAULT_GRIDS
 
-__all__ = ["ForexBacktester"]
\ No newline at end of file
+__all__ = ["ForexBacktester", "WalkForward", "WalkForwardResult", "DEFAULT_GRIDS"]
\ No newline at end of file
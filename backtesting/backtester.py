@@ -2,21 +2,33 @@
 
 import pandas as pd
 import numpy as np
+from datastore import OHLCVStore
+from strategies.indicators import INDICATORS, data_version
 
 class ForexBacktester:
-    def __init__(self, data, initial_balance=10000):
+    def __init__(self, data, initial_balance=10000, engine=None):
         """
-        data: DataFrame con columnas ['Open', 'High', 'Low', 'Close']
+        data: DataFrame con columnas ['Open', 'High', 'Low', 'Close'] o un OHLCVStore
         initial_balance: saldo inicial para el backtest
+        engine: IndicatorEngine (por defecto el compartido con las estrategias)
         """
-        self.data = data.copy()
+        # Con un OHLCVStore se trabaja sobre vistas del fichero mapeado, sin copia
+        self.data = data.to_frame() if isinstance(data, OHLCVStore) else data.copy()
         self.initial_balance = initial_balance
+        self.engine = engine if engine is not None else INDICATORS
+        self._version = None
+
+    def _data_version(self):
+        """Versión de self.data para la caché de indicadores (se calcula una vez)."""
+        if self._version is None:
+            self._version = data_version(self.data)
+        return self._version
     
     # ---------------- Trend Following ----------------
     def trend_following(self, short_window=20, long_window=50):
         df = self.data.copy()
-        df['EMA_short'] = df['Close'].ewm(span=short_window, adjust=False).mean()
-        df['EMA_long'] = df['Close'].ewm(span=long_window, adjust=False).mean()
+        df['EMA_short'] = self.engine.ema(self.data, short_window, adjust=False, version=self._data_version())
+        df['EMA_long'] = self.engine.ema(self.data, long_window, adjust=False, version=self._data_version())
         df['Signal'] = 0
         
         # Use .iloc for positional indexing
@@ -30,8 +42,8 @@ class ForexBacktester:
     # ---------------- Breakout Strategy ----------------
     def breakout(self, window=20):
         df = self.data.copy()
-        df['High_Max'] = df['High'].rolling(window=window).max()
-        df['Low_Min'] = df['Low'].rolling(window=window).min()
+        df['High_Max'] = self.engine.rolling_max(self.data, window, version=self._data_version())
+        df['Low_Min'] = self.engine.rolling_min(self.data, window, version=self._data_version())
         df['Signal'] = 0
         # Fixed chained assignment
         condition_high = df['Close'] > df['High_Max'].shift(1)
@@ -0,0 +1,247 @@
+# backtesting/walk_forward.py
+
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+
+from datastore import OHLCVStore
+from datastore.mmap_store import COLUMNAS_OHLCV
+from strategies.indicators import IndicatorEngine
+from strategies.parameter_sweep import ParameterSweep
+
+# Rejillas por defecto de las estrategias de ParameterSweep
+DEFAULT_GRIDS = {
+    'trend_following': {'short_window': (10, 20, 30), 'long_window': (50, 100, 200)},
+    'breakout': {'window': (20, 50, 100, 200)},
+    'rsi_strategy': {'period': (7, 14, 21), 'overbought': (70, 80), 'oversold': (20, 30)},
+    'adx_strategy': {'adx_period': (14, 28), 'adx_threshold': (20, 25, 30)},
+}
+
+# Métrica de ParameterSweep -> sentido de la optimización (1 maximizar, -1 minimizar)
+METRICAS = {'sharpe': 1, 'total_return': 1, 'mean_return': 1, 'win_rate': 1, 'max_drawdown': -1}
+
+
+def _window_worker(fuente, ventana, strategy, grid, metric, min_trades, exec_lag):
+    """
+    Optimiza una estrategia en la ventana in-sample [i0, i1) y evalúa la mejor
+    combinación en la out-of-sample [i1, i2). fuente es la ruta del OHLCVStore
+    (el worker lo abre en memmap: solo viajan por IPC la ruta, los índices y
+    los resultados) o el propio almacén cuando se ejecuta en el mismo proceso.
+    Los indicadores y la posición de la parte out-of-sample se calculan sobre
+    [i0, i2): arrancan con la historia in-sample, sin ver velas posteriores.
+    """
+    k, i0, i1, i2 = ventana
+    resumen = {'strategy': strategy, 'fold': k, 'elapsed': 0.0, 'error': None, 'params': None}
+    inicio = time.perf_counter()
+    try:
+        store = OHLCVStore.open(fuente) if isinstance(fuente, str) else fuente
+        tabla = ParameterSweep(store.slice(i0, i1), engine=IndicatorEngine(), exec_lag=exec_lag).run(strategy, grid)
+        puntuacion = METRICAS[metric] * tabla[metric].to_numpy(dtype=np.float64)
+        puntuacion[~np.isfinite(puntuacion) | (tabla['trades'].to_numpy() < min_trades)] = -np.inf
+        mejor = tabla.iloc[int(np.argmax(puntuacion))]
+        params = {p: mejor[p].item() if hasattr(mejor[p], 'item') else mejor[p] for p in grid}
+
+        pnl = ParameterSweep(store.slice(i0, i2), engine=IndicatorEngine(), exec_lag=exec_lag) \
+            .pnl(strategy, **params)[i1 - i0:]
+        resumen.update({
+            'params': params,
+            'is_score': mejor[metric],
+            'is_trades': int(mejor['trades']),
+            'pnl': pnl,
+        })
+    except Exception as e:
+        resumen['error'] = f"{type(e).__name__}: {e}"
+    resumen['elapsed'] = time.perf_counter() - inicio
+    return resumen
+
+
+class WalkForwardResult:
+    """
+    Resultado del walk-forward:
+    - windows: una fila por (estrategia, fold) con las fechas, los
+      parámetros elegidos, la métrica in-sample y las métricas out-of-sample.
+    - equity: curva out-of-sample cosida (suma acumulada de retornos, como en
+      ParameterSweep), una columna por estrategia sobre las velas OOS.
+    - errors: {(estrategia, fold): mensaje} de las ventanas que fallaron.
+    """
+
+    def __init__(self, windows, equity, grids, metric='sharpe', errors=None):
+        self.windows = windows
+        self.equity = equity
+        self.grids = grids
+        self.metric = metric
+        self.errors = errors or {}
+
+    def stability(self) -> pd.DataFrame:
+        """
+        Estabilidad de los parámetros entre ventanas, una fila por (estrategia,
+        parámetro): media, desviación, mín/máx, valores distintos, valor más
+        frecuente y fracción de ventanas que lo eligen, y cambios entre
+        ventanas consecutivas.
+        """
+        filas = []
+        if self.windows.empty:
+            return pd.DataFrame(filas)
+        for strategy, grid in self.grids.items():
+            tabla = self.windows[self.windows['strategy'] == strategy]
+            for p in grid:
+                valores = tabla[p].dropna()
+                if valores.empty:
+                    continue
+                frecuencias = valores.value_counts()
+                filas.append({
+                    'strategy': strategy,
+                    'parameter': p,
+                    'windows': len(valores),
+                    'mean': valores.mean(),
+                    'std': valores.std(ddof=0),
+                    'min': valores.min(),
+                    'max': valores.max(),
+                    'unique': len(frecuencias),
+                    'mode': frecuencias.index[0],
+                    'mode_share': frecuencias.iloc[0] / len(valores),
+                    'changes': int((valores.to_numpy()[1:] != valores.to_numpy()[:-1]).sum()),
+                })
+        return pd.DataFrame(filas)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Una fila por estrategia: retorno OOS total, Sharpe y drawdown de la
+        curva cosida, y eficiencia walk-forward cuando la métrica de
+        optimización es sharpe: Sharpe por vela OOS medio / IS medio (el Sharpe
+        de ParameterSweep escala con sqrt(velas) y las ventanas IS son más largas).
+        """
+        filas = []
+        for strategy in self.equity.columns:
+            equity = self.equity[strategy].to_numpy()
+            pnl = np.diff(equity, prepend=0.0)
+            tabla = self.windows[self.windows['strategy'] == strategy]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                sharpe = pnl.mean() / pnl.std(ddof=1) * np.sqrt(len(pnl)) if len(pnl) > 1 else np.nan
+                eficiencia = ((tabla['oos_sharpe'] / np.sqrt(tabla['oos_bars'])).mean() /
+                              (tabla['is_score'] / np.sqrt(tabla['is_bars'])).mean()) \
+                    if self.metric == 'sharpe' else np.nan
+            filas.append({
+                'strategy': strategy,
+                'windows': len(tabla),
+                'bars': len(pnl),
+                'total_return': equity[-1] if len(equity) else 0.0,
+                'sharpe': sharpe,
+                'max_drawdown': (np.maximum.accumulate(equity) - equity).max() if len(equity) else 0.0,
+                'efficiency': eficiencia,
+            })
+        return pd.DataFrame(filas)
+
+
+class WalkForward:
+    """
+    Walk-forward de las estrategias de ParameterSweep sobre un OHLCVStore:
+    optimiza en ventanas in-sample móviles (o ancladas) y evalúa la mejor
+    combinación en la ventana out-of-sample siguiente. Las ventanas OOS son
+    consecutivas y no se solapan, así que sus retornos se cosen en una curva.
+
+    train/test: número de velas (int) o duración ('365D', pd.Timedelta).
+    Con workers > 1 las ventanas se reparten en un ProcessPoolExecutor: cada
+    proceso abre el almacén desde disco en memmap de solo lectura (los precios
+    se comparten a través de la caché de páginas, no se serializan DataFrames).
+    """
+
+    def __init__(self, data, train, test, anchored=False, metric='sharpe', min_trades=1, exec_lag=1):
+        if metric not in METRICAS:
+            raise ValueError(f"Métrica no soportada: {metric}. Opciones: {list(METRICAS)}")
+        if isinstance(data, str):
+            data = OHLCVStore.open(data)
+        elif isinstance(data, pd.DataFrame):
+            data = data.sort_index()
+            data = OHLCVStore(data.index.asi8, {
+                col: data[col].to_numpy(dtype=np.float64) if col in data.columns else np.zeros(len(data))
+                for col in COLUMNAS_OHLCV})
+        self.store = data
+        self.train = train
+        self.test = test
+        self.anchored = anchored
+        self.metric = metric
+        self.min_trades = min_trades
+        self.exec_lag = exec_lag
+
+    def windows(self):
+        """Lista de (fold, i0, i1, i2): in-sample [i0, i1) y out-of-sample [i1, i2)."""
+        n = len(self.store)
+        if isinstance(self.train, (int, np.integer)) and isinstance(self.test, (int, np.integer)):
+            cortes = np.arange(self.train, n, self.test)
+            inicios = np.maximum(cortes - self.train, 0)
+            finales = np.minimum(cortes + self.test, n)
+        else:
+            tiempos = np.asarray(self.store.timestamps)
+            if n == 0:
+                return []
+            train, test = pd.Timedelta(self.train).value, pd.Timedelta(self.test).value
+            limites = np.arange(tiempos[0] + train, tiempos[-1] + 1, test)
+            cortes = np.searchsorted(tiempos, limites, side='left')
+            inicios = np.searchsorted(tiempos, limites - train, side='left')
+            finales = np.searchsorted(tiempos, limites + test, side='left')
+        if self.anchored:
+            inicios = np.zeros_like(cortes)
+        ventanas = [(int(i0), int(i1), int(i2)) for i0, i1, i2 in zip(inicios, cortes, finales) if i1 < i2]
+        return [(k, *v) for k, v in enumerate(ventanas)]
+
+    def run(self, grids=None, workers=1):
+        """
+        grids: {estrategia: {parámetro: valores}} (DEFAULT_GRIDS por defecto).
+        Devuelve un WalkForwardResult.
+        """
+        grids = DEFAULT_GRIDS if grids is None else grids
+        for strategy in grids:
+            if strategy not in ParameterSweep.STRATEGIES:
+                raise ValueError(f"Estrategia no soportada: {strategy}. Opciones: {list(ParameterSweep.STRATEGIES)}")
+        ventanas = self.windows()
+        tareas = [(strategy, grid, v) for strategy, grid in grids.items() for v in ventanas]
+
+        if workers is None or workers <= 1 or len(tareas) <= 1:
+            resumenes = [_window_worker(self.store, v, s, g, self.metric, self.min_trades, self.exec_lag)
+                         for s, g, v in tareas]
+        else:
+            if self.store.path is None:
+                raise ValueError("Con varios procesos los datos deben ser un OHLCVStore en disco (OHLCVStore.write)")
+            resumenes = []
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_window_worker, self.store.path, v, s, g, self.metric,
+                                       self.min_trades, self.exec_lag) for s, g, v in tareas]
+                for future in as_completed(futures):
+                    resumenes.append(future.result())
+        orden = {s: i for i, s in enumerate(grids)}
+        resumenes.sort(key=lambda r: (orden[r['strategy']], r['fold']))
+        return self._result(resumenes, ventanas, grids)
+
+    def _result(self, resumenes, ventanas, grids):
+        tiempos = self.store.index
+        limites = {k: (i0, i1, i2) for k, i0, i1, i2 in ventanas}
+        filas, curvas, errores = [], {}, {}
+        for r in resumenes:
+            if r['error'] is not None:
+                errores[(r['strategy'], r['fold'])] = r['error']
+                continue
+            i0, i1, i2 = limites[r['fold']]
+            pnl = r['pnl']
+            equity = np.cumsum(pnl)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                sharpe = pnl.mean() / pnl.std(ddof=1) * np.sqrt(len(pnl)) if len(pnl) > 1 else np.nan
+            filas.append({
+                'strategy': r['strategy'],
+                'fold': r['fold'],
+                'is_start': tiempos[i0],
+                'oos_start': tiempos[i1],
+                'oos_end': tiempos[i2 - 1],
+                **r['params'],
+                'is_score': r['is_score'],
+                'is_trades': r['is_trades'],
+                'is_bars': i1 - i0,
+                'oos_bars': i2 - i1,
+                'oos_return': equity[-1],
+                'oos_sharpe': sharpe,
+                'oos_max_drawdown': (np.maximum.accumulate(equity) - equity).max(),
+            })
+            curvas.setdefault(r['strategy'], []).append(pd.Series(pnl, index=tiempos[i1:i2]))
+        equity = pd.DataFrame({s: pd.concat(partes).cumsum() for s, partes in curvas.items()})
+        return WalkForwardResult(pd.DataFrame(filas), equity, grids, self.metric, errores)
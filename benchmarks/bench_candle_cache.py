@@ -0,0 +1,94 @@
+# benchmarks/bench_candle_cache.py
+"""
+Coste de llamar en secuencia a todas las estrategias públicas de
+CandleStrategies, con y sin la caché de la instancia:
+- sin caché: una instancia (y un IndicatorEngine) nueva por estrategia, como
+  si cada llamada empezara de cero;
+- con caché: una sola instancia para todas.
+Cuenta los patrones evaluados por el motor y los indicadores calculados, y
+falla si con caché algún patrón o indicador se calcula más de una vez.
+
+Uso: python -m benchmarks.bench_candle_cache [filas]
+"""
+
+import sys
+import time
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+import patterns.candlestickpatterns as candlestickpatterns
+from strategies import CandleStrategies, IndicatorEngine
+
+
+def _velas(filas, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 1e-4, filas))
+    open_ = close + rng.normal(0, 1e-4, filas)
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + rng.random(filas) * 2e-4,
+        'Low': np.minimum(open_, close) - rng.random(filas) * 2e-4,
+        'Close': close,
+        'Volume': rng.random(filas),
+    }, index=pd.date_range('2024-01-01', periods=filas, freq='1min'))
+
+
+def _estrategias():
+    return sorted(nombre for nombre in dir(CandleStrategies)
+                  if callable(getattr(CandleStrategies, nombre)) and not nombre.startswith('_'))
+
+
+def _contar_patrones():
+    """Envuelve detect_patterns para contar cuántas veces se evalúa cada patrón."""
+    contador = Counter()
+    original = candlestickpatterns.detect_patterns
+
+    def detect_patterns(open_, high, low, close, names=None):
+        names, matrix = original(open_, high, low, close, names)
+        contador.update(names)
+        return names, matrix
+
+    candlestickpatterns.detect_patterns = detect_patterns
+    return contador, lambda: setattr(candlestickpatterns, 'detect_patterns', original)
+
+
+def _ejecutar(df, compartida):
+    contador, restaurar = _contar_patrones()
+    indicadores = 0
+    try:
+        inicio = time.perf_counter()
+        instancia = CandleStrategies(df, engine=IndicatorEngine()) if compartida else None
+        for nombre in _estrategias():
+            cs = instancia or CandleStrategies(df, engine=IndicatorEngine())
+            getattr(cs, nombre)()
+            if not compartida:
+                indicadores += cs.engine.misses
+        elapsed = time.perf_counter() - inicio
+    finally:
+        restaurar()
+    if compartida:
+        indicadores = instancia.engine.misses
+    return elapsed, contador, indicadores
+
+
+def main(filas=500_000):
+    df = _velas(filas)
+    print(f"Filas: {filas:,}  |  estrategias: {len(_estrategias())}")
+
+    t_sin, patrones_sin, ind_sin = _ejecutar(df, compartida=False)
+    t_con, patrones_con, ind_con = _ejecutar(df, compartida=True)
+
+    print(f"Sin caché: {t_sin:7.2f} s  |  patrones evaluados {sum(patrones_sin.values()):3d}  |  indicadores {ind_sin}")
+    print(f"Con caché: {t_con:7.2f} s  |  patrones evaluados {sum(patrones_con.values()):3d}  |  indicadores {ind_con}")
+    print(f"Aceleración: {t_sin / t_con:.1f}x")
+
+    repetidos = {name: n for name, n in patrones_con.items() if n > 1}
+    if repetidos:
+        raise AssertionError(f"Patrones evaluados más de una vez con caché: {repetidos}")
+    if ind_con > 3:  # EMA20, EMA50 y ATR14
+        raise AssertionError(f"Indicadores calculados más de una vez con caché: {ind_con}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,74 @@
+# benchmarks/bench_strategy_memory.py
+"""
+Pico de memoria por llamada de cada estrategia de ForexStrategies (tracemalloc,
+que incluye las reservas de NumPy) frente al tamaño de los datos de entrada.
+Falla si alguna llamada supera LIMITE veces el tamaño de la entrada.
+
+Referencia: la salida de cada estrategia ya ocupa ~1.3-1.7x la entrada (8-10
+columnas frente a OHLCV + índice); con las copias completas del DataFrame el
+pico era ~5.5-7.5x. La llamada en frío incluye los indicadores que quedan en
+la caché del IndicatorEngine.
+
+Uso: python -m benchmarks.bench_strategy_memory [filas]
+"""
+
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from strategies import ForexStrategies, IndicatorEngine
+
+# Pico máximo permitido por llamada, en múltiplos del tamaño de la entrada
+LIMITE = 3.0
+
+ESTRATEGIAS = ('trend_following', 'breakout', 'rsi_strategy', 'adx_strategy')
+
+
+def _velas(filas, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 1e-4, filas))
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 5e-5, filas),
+        'High': close + rng.random(filas) * 3e-4,
+        'Low': close - rng.random(filas) * 3e-4,
+        'Close': close,
+        'Volume': rng.random(filas),
+    }, index=pd.date_range('2015-01-01', periods=filas, freq='1min'))
+
+
+def _medir(func):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = func()
+    elapsed = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico, elapsed, resultado
+
+
+def main(filas=1_000_000):
+    df = _velas(filas)
+    entrada = int(df.memory_usage(index=True).sum())
+    print(f"Filas: {filas:,}  |  entrada: {entrada / 1024 ** 2:,.1f} MB  |  límite: {LIMITE:.1f}x")
+
+    fallos = []
+    for nombre in ESTRATEGIAS:
+        # Motor propio: la primera llamada incluye el cálculo de los indicadores
+        fs = ForexStrategies(df, engine=IndicatorEngine())
+        for fase in ('frío', 'caliente'):
+            pico, elapsed, salida = _medir(getattr(fs, nombre))
+            ratio = pico / entrada
+            print(f"{nombre:16s} {fase:8s} pico {pico / 1024 ** 2:9,.1f} MB ({ratio:4.2f}x)  "
+                  f"salida {salida.memory_usage(index=False).sum() / entrada:4.2f}x  {elapsed * 1000:8.1f} ms")
+            if ratio > LIMITE:
+                fallos.append(f"{nombre} ({fase}): {ratio:.2f}x")
+            del salida
+
+    if fallos:
+        raise AssertionError(f"Pico de memoria por encima de {LIMITE}x la entrada: {', '.join(fallos)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
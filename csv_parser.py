@@ -1,5 +1,10 @@
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
+from datastore import parse_dukascopy_timestamps, scan_quality, IncrementalIngestor
+
+COLUMNAS = ['DateTime', 'Open', 'High', 'Low', 'Close', 'Volume']
 
 class DukascopyCSVParser:
     """
@@ -9,53 +14,202 @@ class DukascopyCSVParser:
     """
 
     @staticmethod
-    def parse_file(filepath, output_dir="csv/processed"):
+    def _output_path(filepath, output_dir):
+        """Construye la ruta del CSV procesado a partir del nombre del crudo."""
+        base_name = os.path.basename(filepath)
+        parts = base_name.replace(".csv","").split("_")
+        if len(parts) >= 5:
+            symbol = parts[2]       # Ej: EURUSD
+            timeframe = parts[3]    # Ej: M1
+            year = parts[4]         # Ej: 2024
+            output_file = f"{symbol}_{timeframe}_{year}.csv"
+        else:
+            output_file = f"processed_{base_name}"
+        return os.path.join(output_dir, output_file)
+
+    @staticmethod
+    def parse_file(filepath, output_dir="csv/processed", chunksize=None):
+        # Modo streaming: memoria acotada independientemente del tamaño del fichero
+        if chunksize:
+            return DukascopyCSVParser.parse_file_chunked(filepath, output_dir, chunksize)
+        output_path, _ = DukascopyCSVParser._parse_full(filepath, output_dir)
+        print(f"✅ Archivo procesado y guardado en: {output_path}")
+        return output_path
+
+    @staticmethod
+    def _parse_full(filepath, output_dir):
+        """Convierte el fichero completo en memoria. Devuelve (ruta_salida, filas)."""
         # Leer CSV sin headers y separador ;
         df = pd.read_csv(filepath, header=None, sep=';')
 
         # Asignar nombres de columnas
-        df.columns = ['DateTime', 'Open', 'High', 'Low', 'Close', 'Volume']
+        df.columns = COLUMNAS
 
         # Convertir a datetime
-        df['DateTime'] = pd.to_datetime(df['DateTime'], format='%Y%m%d %H%M%S')
+        df['DateTime'] = parse_dukascopy_timestamps(df['DateTime'].to_numpy())
         df.set_index('DateTime', inplace=True)
 
         # Crear carpeta de salida si no existe
         os.makedirs(output_dir, exist_ok=True)
 
         # Construir nombre de archivo procesado
-        base_name = os.path.basename(filepath)
-        parts = base_name.replace(".csv","").split("_")
-        if len(parts) >= 5:
-            symbol = parts[2]       # Ej: EURUSD
-            timeframe = parts[3]    # Ej: M1
-            year = parts[4]         # Ej: 2024
-            output_file = f"{symbol}_{timeframe}_{year}.csv"
-        else:
-            output_file = f"processed_{base_name}"
+        output_path = DukascopyCSVParser._output_path(filepath, output_dir)
 
-        output_path = os.path.join(output_dir, output_file)
+        # Guardar CSV procesado (temporal + rename para no dejar ficheros a medias)
+        tmp_path = output_path + ".part"
+        try:
+            df.to_csv(tmp_path)
+            os.replace(tmp_path, output_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return output_path, len(df)
 
-        # Guardar CSV procesado
-        df.to_csv(output_path)
-        print(f"✅ Archivo procesado y guardado en: {output_path}")
+    @staticmethod
+    def parse_file_chunked(filepath, output_dir="csv/processed", chunksize=500_000, verbose=True,
+                           validate=False, repair=None):
+        """
+        Versión en streaming de parse_file.
+        Lee el CSV crudo en bloques de `chunksize` filas, convierte las fechas de
+        cada bloque y lo añade al fichero de salida, de modo que el pico de memoria
+        depende de `chunksize` y no del tamaño del fichero. Informa de filas/segundo.
+        Con validate=True cada bloque pasa por scan_quality (repair: None, 'drop'
+        o 'ffill') y al final se muestra el informe acumulado.
+        """
+        output_path, _ = DukascopyCSVParser._parse_chunked(filepath, output_dir, chunksize, verbose,
+                                                           validate, repair)
         return output_path
 
     @staticmethod
-    def batch_parse(input_dir="csv/raw", output_dir="csv/processed"):
+    def _parse_chunked(filepath, output_dir, chunksize, verbose, validate=False, repair=None):
+        """Implementación de parse_file_chunked. Devuelve (ruta_salida, filas)."""
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = DukascopyCSVParser._output_path(filepath, output_dir)
+        # Se escribe en un temporal y se renombra al final: nunca queda un CSV a medias
+        tmp_path = output_path + ".part"
+
+        reader = pd.read_csv(filepath, header=None, sep=';', names=COLUMNAS, chunksize=chunksize)
+        total = 0
+        informe = None
+        ultimo = None
+        inicio = time.perf_counter()
+        try:
+            with open(tmp_path, 'w', newline='') as f:
+                for i, chunk in enumerate(reader):
+                    chunk['DateTime'] = parse_dukascopy_timestamps(chunk['DateTime'].to_numpy())
+                    chunk.set_index('DateTime', inplace=True)
+                    if validate:
+                        chunk, informe_bloque = scan_quality(chunk, repair=repair, prev_timestamp=ultimo)
+                        informe = informe_bloque if informe is None else informe.merge(informe_bloque)
+                        if len(chunk):
+                            ultimo = chunk.index[-1]
+                    # Cabecera solo en el primer bloque
+                    chunk.to_csv(f, header=(i == 0))
+
+                    total += len(chunk)
+                    if verbose:
+                        elapsed = time.perf_counter() - inicio
+                        velocidad = total / elapsed if elapsed > 0 else 0.0
+                        print(f"   ⏳ {os.path.basename(filepath)}: {total:,} filas | {velocidad:,.0f} filas/s")
+            os.replace(tmp_path, output_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if verbose:
+            elapsed = time.perf_counter() - inicio
+            print(f"✅ Archivo procesado y guardado en: {output_path} "
+                  f"({total:,} filas en {elapsed:.1f}s)")
+            if informe is not None:
+                print(f"   🔎 Calidad: {informe}")
+        return output_path, total
+
+    @staticmethod
+    def parse_incremental(filepath, processed_dir="processed"):
+        """
+        Ingesta incremental: solo lee las filas añadidas desde la última llamada
+        y las añade al almacén processed/<SYMBOL>_<TF>.ohlcv (ver IncrementalIngestor).
+        """
+        resumen = IncrementalIngestor(processed_dir).ingest(filepath)
+        print(f"✅ {resumen['key']}: {resumen['rows']:,} filas nuevas "
+              f"(hasta {resumen['last_timestamp']}) en {resumen['store']}")
+        return resumen
+
+    @staticmethod
+    def _parse_worker(filepath, output_dir, chunksize, overwrite):
+        """
+        Procesa un fichero y devuelve su resumen. Nunca lanza excepciones:
+        el error se devuelve en el resumen para no abortar el lote.
+        """
+        resumen = {
+            'file': os.path.basename(filepath),
+            'output': DukascopyCSVParser._output_path(filepath, output_dir),
+            'rows': 0,
+            'elapsed': 0.0,
+            'skipped': False,
+            'error': None,
+        }
+        # Re-ejecuciones: los ficheros ya procesados se saltan
+        if not overwrite and os.path.exists(resumen['output']):
+            resumen['skipped'] = True
+            return resumen
+
+        inicio = time.perf_counter()
+        try:
+            if chunksize:
+                _, rows = DukascopyCSVParser._parse_chunked(filepath, output_dir, chunksize, verbose=False)
+            else:
+                _, rows = DukascopyCSVParser._parse_full(filepath, output_dir)
+            resumen['rows'] = rows
+        except Exception as e:
+            resumen['error'] = f"{type(e).__name__}: {e}"
+        resumen['elapsed'] = time.perf_counter() - inicio
+        return resumen
+
+    @staticmethod
+    def batch_parse(input_dir="csv/raw", output_dir="csv/processed", chunksize=None,
+                    workers=1, overwrite=False):
         """
         Procesa todos los CSV en input_dir y los guarda en output_dir.
+        - chunksize: usa el modo streaming (parse_file_chunked).
+        - workers: número de procesos; con workers > 1 los ficheros se reparten
+          en un ProcessPoolExecutor.
+        - overwrite: si es False se saltan los ficheros cuya salida ya existe,
+          por lo que es seguro relanzar un lote interrumpido.
+        Devuelve una lista de resúmenes por fichero (dict con file, output,
+        rows, elapsed, skipped, error) ordenada por nombre de fichero.
         """
         os.makedirs(output_dir, exist_ok=True)
-        for filename in os.listdir(input_dir):
-            if filename.endswith(".csv"):
-                filepath = os.path.join(input_dir, filename)
-                try:
-                    DukascopyCSVParser.parse_file(filepath, output_dir)
-                except Exception as e:
-                    print(f"⚠️ Error procesando {filename}: {e}")
+        filepaths = [
+            os.path.join(input_dir, filename)
+            for filename in sorted(os.listdir(input_dir))
+            if filename.endswith(".csv")
+        ]
 
+        if workers is None or workers <= 1 or len(filepaths) <= 1:
+            return [DukascopyCSVParser._parse_worker(fp, output_dir, chunksize, overwrite)
+                    for fp in filepaths]
+
+        # Los ficheros grandes primero para repartir mejor la carga entre procesos
+        filepaths_por_tamano = sorted(filepaths, key=os.path.getsize, reverse=True)
+        resultados = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(DukascopyCSVParser._parse_worker, fp, output_dir, chunksize, overwrite)
+                for fp in filepaths_por_tamano
+            ]
+            for future in as_completed(futures):
+                resultados.append(future.result())
+        return sorted(resultados, key=lambda r: r['file'])
 
 if __name__ == "__main__":
     # Procesar todos los CSV crudos automáticamente
-    DukascopyCSVParser.batch_parse()
+    for resumen in DukascopyCSVParser.batch_parse(workers=os.cpu_count()):
+        if resumen['error']:
+            print(f"⚠️ Error procesando {resumen['file']}: {resumen['error']}")
+        elif resumen['skipped']:
+            print(f"⏭️ {resumen['file']}: ya procesado")
+        else:
+            print(f"✅ {resumen['file']}: {resumen['rows']:,} filas en {resumen['elapsed']:.1f}s")
@@ -0,0 +1,13 @@
+# datastore/__init__.py
+from .columnar import ColumnarStore
+from .mmap_store import OHLCVStore
+from .timestamps import parse_dukascopy_timestamps
+from .naming import parse_dukascopy_name
+from .incremental import IncrementalIngestor
+from .resampler import Resampler, resample_ohlcv, TIMEFRAMES
+from .catalog import DataCatalog, CatalogEntry
+from .quality import scan_quality, QualityReport
+
+__all__ = ["ColumnarStore", "OHLCVStore", "parse_dukascopy_timestamps", "parse_dukascopy_name",
+           "IncrementalIngestor", "Resampler", "resample_ohlcv", "TIMEFRAMES",
+           "DataCatalog", "CatalogEntry", "scan_quality", "QualityReport"]
@@ -0,0 +1,175 @@
+# datastore/catalog.py
+
+import os
+import json
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+from .columnar import ColumnarStore
+from .mmap_store import OHLCVStore, META, COLUMNA_TIEMPO
+from .naming import parse_dukascopy_name
+
+FORMATOS = ('.feather', '.ohlcv', '.csv', '.pkl')
+
+
+class CatalogEntry:
+    """Metadatos de un fichero de datos: no contiene las velas."""
+
+    def __init__(self, symbol, timeframe, year, path, fmt, size, rows=None, start=None, end=None):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.year = year
+        self.path = path
+        self.format = fmt
+        self.size = size
+        self.rows = rows
+        self.start = start
+        self.end = end
+
+    @property
+    def key(self):
+        return (self.symbol, self.timeframe, self.year)
+
+    def __repr__(self):
+        rango = f"{self.start} -> {self.end}" if self.start is not None else "rango desconocido"
+        filas = f"{self.rows:,} filas" if self.rows is not None else "filas desconocidas"
+        return f"CatalogEntry({self.symbol} {self.timeframe} {self.year or '*'} | {filas} | {rango} | {self.format})"
+
+
+class DataCatalog:
+    """
+    Catálogo multi-símbolo indexado por (symbol, timeframe, year) a partir de la
+    convención de nombres de DukascopyCSVParser (SYMBOL_TF_AÑO.*, SYMBOL_TF.ohlcv).
+    scan() solo lee metadatos (tamaño, filas y rango de fechas cuando el formato
+    los guarda); los datos se cargan al pedirlos con load() y se mantienen en una
+    caché LRU limitada por max_bytes de memoria residente.
+    Si una clave aparece en varios ficheros se queda la primera: las carpetas
+    en el orden dado y, dentro de cada una, por nombre.
+    """
+
+    def __init__(self, folders, max_bytes=2 * 1024 ** 3):
+        self.folders = [folders] if isinstance(folders, str) else list(folders)
+        self.max_bytes = max_bytes
+        self.entries = {}
+        self._cache = OrderedDict()  # key -> (DataFrame, bytes)
+        self._resident = 0
+        self._lock = threading.Lock()
+
+    # ---------------- Metadatos ----------------
+    def scan(self):
+        """Reconstruye el catálogo a partir de los ficheros (sin cargar datos)."""
+        entries = {}
+        for folder in self.folders:
+            if not os.path.isdir(folder):
+                continue
+            for name in sorted(os.listdir(folder)):
+                fmt = os.path.splitext(name)[1]
+                if fmt not in FORMATOS:
+                    continue
+                nombre = parse_dukascopy_name(name)
+                if nombre is None:
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    entry = self._read_entry(nombre, path, fmt)
+                except (OSError, ValueError, KeyError):
+                    continue  # fichero incompleto o corrupto: no se cataloga
+                entries.setdefault(entry.key, entry)
+        with self._lock:
+            self.entries = entries
+        return self
+
+    @staticmethod
+    def _read_entry(nombre, path, fmt):
+        symbol, timeframe, year = nombre
+        if fmt == '.ohlcv':
+            with open(os.path.join(path, META)) as f:
+                rows = json.load(f)['length']
+            size = sum(os.path.getsize(os.path.join(path, n)) for n in os.listdir(path))
+            start = end = None
+            if rows:
+                # Primer y último timestamp: dos lecturas de 8 bytes
+                tiempos = np.memmap(os.path.join(path, f"{COLUMNA_TIEMPO}.bin"), dtype=np.int64, mode='r', shape=(rows,))
+                start, end = pd.Timestamp(int(tiempos[0])), pd.Timestamp(int(tiempos[-1]))
+            return CatalogEntry(symbol, timeframe, year, path, fmt, size, rows, start, end)
+
+        size = os.path.getsize(path)
+        if fmt == '.feather':
+            meta = ColumnarStore.metadata(path)
+            rows = int(meta['rows']) if meta.get('rows') else None
+            start = pd.Timestamp(meta['start']) if meta.get('start') else None
+            end = pd.Timestamp(meta['end']) if meta.get('end') else None
+            return CatalogEntry(symbol, timeframe, year, path, fmt, size, rows, start, end)
+        # CSV y pickle no guardan metadatos: se completan al cargarlos
+        return CatalogEntry(symbol, timeframe, year, path, fmt, size)
+
+    def list(self, symbol=None, timeframe=None):
+        """Entradas filtradas por símbolo y/o timeframe, ordenadas por clave."""
+        return [e for k, e in sorted(self.entries.items(), key=lambda kv: str(kv[0]))
+                if (symbol is None or e.symbol == symbol) and (timeframe is None or e.timeframe == timeframe)]
+
+    def symbols(self):
+        return sorted({e.symbol for e in self.entries.values()})
+
+    def summary(self) -> pd.DataFrame:
+        """Tabla con los metadatos de todas las entradas."""
+        return pd.DataFrame([{
+            'symbol': e.symbol, 'timeframe': e.timeframe, 'year': e.year, 'format': e.format,
+            'rows': e.rows, 'start': e.start, 'end': e.end, 'size': e.size, 'path': e.path,
+        } for e in self.list()])
+
+    # ---------------- Datos (carga perezosa + LRU) ----------------
+    @property
+    def resident_bytes(self):
+        return self._resident
+
+    def load(self, symbol, timeframe, year=None) -> pd.DataFrame:
+        """Carga (o devuelve de la caché) los datos de una entrada."""
+        key = (symbol, timeframe, None if year is None else str(year))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key][0]
+            entry = self.entries.get(key)
+        if entry is None:
+            raise KeyError(f"No hay datos para {key}")
+
+        df = self.read_data(entry)
+        nbytes = int(df.memory_usage(index=True).sum())
+        with self._lock:
+            entry.rows = len(df)
+            if len(df):
+                entry.start, entry.end = df.index[0], df.index[-1]
+            self._cache[key] = (df, nbytes)
+            self._resident += nbytes
+            # Expulsar las menos usadas recientemente (nunca la recién cargada)
+            while self._resident > self.max_bytes and len(self._cache) > 1:
+                _, (_, liberados) = self._cache.popitem(last=False)
+                self._resident -= liberados
+        return df
+
+    @staticmethod
+    def read_data(entry, columns=None):
+        """
+        Lee los datos de una entrada sin pasar por la caché (p.ej. desde un
+        proceso worker). columns limita las columnas leídas cuando el formato
+        lo permite (.feather, .ohlcv).
+        """
+        if entry.format == '.feather':
+            return ColumnarStore.load(entry.path, columns=columns)
+        if entry.format == '.ohlcv':
+            return OHLCVStore.open(entry.path).to_frame(columns)
+        if entry.format == '.csv':
+            df = pd.read_csv(entry.path, index_col=0, parse_dates=True)
+        else:
+            df = pd.read_pickle(entry.path)
+        return df if columns is None else df[list(columns)]
+
+    def evict(self, symbol=None):
+        """Libera de la caché todas las entradas (o las de un símbolo)."""
+        with self._lock:
+            for key in [k for k in self._cache if symbol is None or k[0] == symbol]:
+                _, liberados = self._cache.pop(key)
+                self._resident -= liberados
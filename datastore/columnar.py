@@ -0,0 +1,78 @@
+# datastore/columnar.py
+
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+COLUMNA_TIEMPO = 'Timestamp'
+COLUMNAS_OHLC = ['Open', 'High', 'Low', 'Close']
+EXTENSION = '.feather'
+
+
+class ColumnarStore:
+    """
+    Almacén columnar (Feather/Arrow IPC sin compresión) para la carpeta processed/.
+    - Índice temporal guardado como int64 (epoch en ns) en la columna 'Timestamp'.
+    - Open/High/Low/Close en float32.
+    - Lectura con memory map: proyección de columnas y rango de fechas sin leer
+      el fichero completo.
+    """
+
+    @staticmethod
+    def save(df: pd.DataFrame, path):
+        """Guarda el DataFrame (índice DatetimeIndex) en formato columnar."""
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+
+        columnas = {COLUMNA_TIEMPO: pa.array(df.index.asi8, type=pa.int64())}
+        for col in df.columns:
+            valores = df[col].to_numpy()
+            if col in COLUMNAS_OHLC:
+                valores = valores.astype(np.float32, copy=False)
+            columnas[str(col)] = pa.array(valores)
+
+        # Metadatos ligeros para poder listar ficheros sin leer los datos
+        metadata = {
+            'rows': str(len(df)),
+            'start': df.index[0].isoformat() if len(df) else '',
+            'end': df.index[-1].isoformat() if len(df) else '',
+        }
+        table = pa.table(columnas).replace_schema_metadata(metadata)
+
+        tmp_path = path + ".part"
+        # Un único bloque para que la lectura con memory map sea zero-copy
+        feather.write_feather(table, tmp_path, compression='uncompressed',
+                              chunksize=max(len(df), 1))
+        os.replace(tmp_path, path)
+        return path
+
+    @staticmethod
+    def load(path, columns=None, start=None, end=None) -> pd.DataFrame:
+        """
+        Carga un fichero columnar.
+        - columns: lista de columnas a leer (None = todas).
+        - start/end: límites (inclusive) del rango de fechas a devolver.
+        """
+        leer = None
+        if columns is not None:
+            leer = [COLUMNA_TIEMPO] + [c for c in columns if c != COLUMNA_TIEMPO]
+        table = feather.read_table(path, columns=leer, memory_map=True)
+
+        if start is not None or end is not None:
+            tiempos = table.column(COLUMNA_TIEMPO).combine_chunks().to_numpy()
+            i0 = 0 if start is None else int(np.searchsorted(tiempos, pd.Timestamp(start).value, side='left'))
+            i1 = len(tiempos) if end is None else int(np.searchsorted(tiempos, pd.Timestamp(end).value, side='right'))
+            table = table.slice(i0, max(i1 - i0, 0))
+
+        df = table.to_pandas()
+        df.index = pd.DatetimeIndex(df.pop(COLUMNA_TIEMPO).to_numpy().view('datetime64[ns]'), name='DateTime')
+        return df
+
+    @staticmethod
+    def metadata(path):
+        """Devuelve los metadatos (rows, start, end) sin leer los datos."""
+        schema = feather.read_table(path, columns=[], memory_map=True).schema
+        raw = schema.metadata or {}
+        return {k.decode(): v.decode() for k, v in raw.items() if k in (b'rows', b'start', b'end')}
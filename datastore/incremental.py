@@ -0,0 +1,148 @@
+# datastore/incremental.py
+
+import io
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from .mmap_store import OHLCVStore, EXTENSION
+from .naming import parse_dukascopy_name
+from .timestamps import parse_dukascopy_timestamps
+
+COLUMNAS = ['DateTime', 'Open', 'High', 'Low', 'Close', 'Volume']
+ESTADO = 'ingest_state.json'
+
+
+class IncrementalIngestor:
+    """
+    Ingesta incremental de CSV crudos de Dukascopy (';', sin cabecera) que crecen
+    con el tiempo. Por cada symbol/timeframe recuerda el último timestamp ingerido
+    y el offset en bytes leído de cada fichero fuente (processed/ingest_state.json),
+    de modo que una actualización diaria solo lee la cola nueva y la añade al
+    almacén processed/<SYMBOL>_<TF>.ohlcv.
+    """
+
+    def __init__(self, processed_dir="processed", block_bytes=32 * 1024 * 1024):
+        self.processed_dir = processed_dir
+        self.block_bytes = block_bytes
+        self.state_path = os.path.join(processed_dir, ESTADO)
+        self.state = self._load_state()
+
+    # ---------------- Estado ----------------
+    def _load_state(self):
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                return json.load(f)
+        return {}
+
+    def _save_state(self):
+        os.makedirs(self.processed_dir, exist_ok=True)
+        tmp = self.state_path + ".part"
+        with open(tmp, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def store_path(self, symbol, timeframe):
+        return os.path.join(self.processed_dir, f"{symbol}_{timeframe}{EXTENSION}")
+
+    # ---------------- Ingesta ----------------
+    def ingest(self, filepath, symbol=None, timeframe=None):
+        """
+        Ingiere las filas nuevas de `filepath` desde el último offset conocido.
+        Devuelve un resumen: {'key', 'rows', 'duplicates', 'offset', 'last_timestamp', 'store'}.
+        Lanza ValueError si el fichero se ha truncado o si alguna vela va hacia
+        atrás en el tiempo (dentro del fichero o respecto al almacén). Las velas
+        cuyo timestamp ya está en el almacén se descartan como duplicadas.
+        """
+        if symbol is None or timeframe is None:
+            nombre = parse_dukascopy_name(filepath)
+            if nombre is None:
+                raise ValueError(f"No se puede deducir symbol/timeframe de {filepath}")
+            symbol, timeframe = symbol or nombre[0], timeframe or nombre[1]
+
+        key = f"{symbol}_{timeframe}"
+        entry = self.state.setdefault(key, {'last_timestamp': None, 'rows': 0, 'offsets': {}})
+        source = os.path.abspath(filepath)
+        offset = entry['offsets'].get(source, 0)
+
+        size = os.path.getsize(filepath)
+        if size < offset:
+            raise ValueError(f"{filepath} es más pequeño que el offset ingerido ({size} < {offset}); "
+                             "el fichero se ha reescrito")
+
+        path = self.store_path(symbol, timeframe)
+        store = OHLCVStore.open(path) if os.path.exists(path) else None
+        # El almacén manda sobre el estado: si una ejecución se interrumpió tras
+        # añadir velas y antes de guardar el estado, esas velas cuentan como duplicadas
+        last = int(store.timestamps[-1]) if store is not None and len(store) else entry['last_timestamp']
+        añadidas = 0
+        duplicadas = 0
+
+        with open(filepath, 'rb') as f:
+            f.seek(offset)
+            resto = b''
+            while True:
+                bloque = f.read(self.block_bytes)
+                if not bloque:
+                    break
+                bloque = resto + bloque
+                # Solo líneas completas: una última línea a medias se lee la próxima vez
+                corte = bloque.rfind(b'\n') + 1
+                resto = bloque[corte:]
+                if corte == 0:
+                    continue
+
+                df = self._parse_block(bloque[:corte])
+                offset += corte
+
+                tiempos = df.index.asi8
+                if (np.diff(tiempos) <= 0).any():
+                    raise ValueError(f"Timestamps no monótonos o duplicados en {filepath}")
+                # Velas ya ingeridas (solapamiento del feed): se descartan y se cuentan.
+                # Solo son duplicadas si su timestamp ya está en el almacén
+                if last is not None:
+                    previas = tiempos <= last
+                    if previas.any():
+                        if not self._stored(store, tiempos[previas]).all():
+                            raise ValueError(f"Velas anteriores a la última ingerida en {filepath}")
+                        duplicadas += int(previas.sum())
+                        df = df[~previas]
+
+                if len(df):
+                    if store is None:
+                        store = OHLCVStore.write(df, path)
+                    else:
+                        store = store.append(df)
+                    last = int(df.index.asi8[-1])
+                    añadidas += len(df)
+
+                # El estado se guarda tras cada bloque: una interrupción no repite trabajo
+                entry['offsets'][source] = offset
+                entry['last_timestamp'] = last
+                entry['rows'] = len(store) if store is not None else 0
+                self._save_state()
+
+        return {
+            'key': key,
+            'rows': añadidas,
+            'duplicates': duplicadas,
+            'offset': offset,
+            'last_timestamp': pd.Timestamp(last) if last is not None else None,
+            'store': path,
+        }
+
+    @staticmethod
+    def _stored(store, tiempos):
+        """Máscara de los timestamps (ordenados) que ya están en el almacén."""
+        if store is None or len(store) == 0:
+            return np.zeros(len(tiempos), dtype=bool)
+        guardados = np.asarray(store.timestamps)
+        pos = np.minimum(np.searchsorted(guardados, tiempos), len(guardados) - 1)
+        return guardados[pos] == tiempos
+
+    @staticmethod
+    def _parse_block(data):
+        df = pd.read_csv(io.BytesIO(data), sep=';', header=None, names=COLUMNAS)
+        df['DateTime'] = parse_dukascopy_timestamps(df['DateTime'].to_numpy())
+        return df.set_index('DateTime')
@@ -0,0 +1,145 @@
+# datastore/mmap_store.py
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+COLUMNA_TIEMPO = 'Timestamp'
+COLUMNAS_OHLCV = ['Open', 'High', 'Low', 'Close', 'Volume']
+EXTENSION = '.ohlcv'
+META = 'meta.json'
+
+
+class OHLCVStore:
+    """
+    Almacén OHLCV en memoria mapeada.
+    En disco es una carpeta `<nombre>.ohlcv/` con un fichero binario contiguo por
+    columna (Timestamp int64 en ns, Open/High/Low/Close/Volume float64) y un
+    meta.json con la longitud. Al abrirlo las columnas son np.memmap de solo
+    lectura: varios procesos que abren el mismo almacén comparten una única
+    copia física a través de la caché de páginas del sistema.
+
+    Una ventana de fechas es una búsqueda binaria sobre Timestamp más una vista
+    (sin copia) de cada columna.
+    """
+
+    def __init__(self, timestamps, columns, path=None):
+        self.timestamps = timestamps
+        self.columns = columns
+        self.path = path
+
+    # ---------------- Creación / apertura ----------------
+    @classmethod
+    def write(cls, df: pd.DataFrame, path):
+        """Escribe el DataFrame (índice DatetimeIndex) como almacén y lo abre."""
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        os.makedirs(path, exist_ok=True)
+
+        arrays = {COLUMNA_TIEMPO: np.ascontiguousarray(df.index.asi8, dtype=np.int64)}
+        for col in COLUMNAS_OHLCV:
+            if col in df.columns:
+                arrays[col] = np.ascontiguousarray(df[col].to_numpy(), dtype=np.float64)
+            else:
+                arrays[col] = np.zeros(len(df), dtype=np.float64)
+
+        for col, arr in arrays.items():
+            arr.tofile(os.path.join(path, f"{col}.bin"))
+        # meta.json se escribe al final: un almacén sin meta no se considera válido
+        cls._write_meta(path, len(df))
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path):
+        """Abre un almacén existente en modo solo lectura (memory map)."""
+        with open(os.path.join(path, META)) as f:
+            meta = json.load(f)
+        length = meta['length']
+
+        def _map(col, dtype):
+            filename = os.path.join(path, f"{col}.bin")
+            if length == 0:
+                return np.empty(0, dtype=dtype)
+            return np.memmap(filename, dtype=dtype, mode='r', shape=(length,))
+
+        timestamps = _map(COLUMNA_TIEMPO, np.int64)
+        columns = {col: _map(col, np.float64) for col in COLUMNAS_OHLCV}
+        return cls(timestamps, columns, path=path)
+
+    @staticmethod
+    def _write_meta(path, length):
+        tmp = os.path.join(path, META + ".part")
+        with open(tmp, 'w') as f:
+            json.dump({'length': int(length), 'columns': [COLUMNA_TIEMPO] + COLUMNAS_OHLCV}, f)
+        os.replace(tmp, os.path.join(path, META))
+
+    def append(self, df: pd.DataFrame):
+        """
+        Añade velas al final del almacén y devuelve el almacén reabierto.
+        Las nuevas velas deben ser estrictamente posteriores a la última guardada.
+        """
+        if self.path is None:
+            raise ValueError("Solo se puede añadir a un almacén abierto desde disco")
+        if len(df) == 0:
+            return self
+        nuevos = df.index.asi8
+        if (np.diff(nuevos) <= 0).any():
+            raise ValueError("Las velas a añadir no están en orden estrictamente creciente")
+        if len(self) and nuevos[0] <= self.timestamps[-1]:
+            raise ValueError("Las velas a añadir no son posteriores a la última del almacén")
+
+        length = len(self)
+        arrays = {COLUMNA_TIEMPO: np.ascontiguousarray(nuevos, dtype=np.int64)}
+        for col in COLUMNAS_OHLCV:
+            if col in df.columns:
+                arrays[col] = np.ascontiguousarray(df[col].to_numpy(), dtype=np.float64)
+            else:
+                arrays[col] = np.zeros(len(df), dtype=np.float64)
+
+        for col, arr in arrays.items():
+            filename = os.path.join(self.path, f"{col}.bin")
+            with open(filename, 'r+b' if os.path.exists(filename) else 'wb') as f:
+                # Descarta restos de un append interrumpido (más allá de meta.json)
+                f.truncate(length * arr.itemsize)
+                f.seek(0, os.SEEK_END)
+                arr.tofile(f)
+        self._write_meta(self.path, length + len(df))
+        return OHLCVStore.open(self.path)
+
+    # ---------------- Acceso ----------------
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, col):
+        if col == COLUMNA_TIEMPO:
+            return self.timestamps
+        return self.columns[col]
+
+    @property
+    def index(self):
+        """DatetimeIndex sobre los timestamps (vista, sin copia)."""
+        return pd.DatetimeIndex(np.asarray(self.timestamps).view('datetime64[ns]'), name='DateTime')
+
+    def slice(self, i0, i1):
+        """Vista posicional [i0, i1) sin copia."""
+        return OHLCVStore(self.timestamps[i0:i1],
+                          {col: arr[i0:i1] for col, arr in self.columns.items()},
+                          path=self.path)
+
+    def window(self, start=None, end=None):
+        """Vista de las velas entre start y end (ambos inclusive), O(log n)."""
+        i0 = 0 if start is None else int(np.searchsorted(self.timestamps, pd.Timestamp(start).value, side='left'))
+        i1 = len(self) if end is None else int(np.searchsorted(self.timestamps, pd.Timestamp(end).value, side='right'))
+        return self.slice(i0, max(i0, i1))
+
+    def to_frame(self, columns=None, with_index=True) -> pd.DataFrame:
+        """
+        DataFrame cuyas columnas son vistas de los arrays mapeados (sin copia).
+        Los datos son de solo lectura: las operaciones que crean columnas nuevas
+        funcionan, pero no se pueden modificar las existentes in-place.
+        """
+        columns = columns or COLUMNAS_OHLCV
+        data = {col: np.asarray(self.columns[col]) for col in columns}
+        index = self.index if with_index else None
+        return pd.DataFrame(data, index=index, copy=False)
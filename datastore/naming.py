@@ -0,0 +1,30 @@
+# datastore/naming.py
+
+import os
+
+from .resampler import TIMEFRAMES
+
+
+def parse_dukascopy_name(filename):
+    """
+    Extrae (symbol, timeframe, year) de los nombres usados por los CSV de Dukascopy
+    y sus derivados:
+    - DAT_ASCII_EURUSD_M1_2024.csv -> ('EURUSD', 'M1', '2024')
+    - EURUSD_M1_2024.feather       -> ('EURUSD', 'M1', '2024')
+    - EURUSD_M1.ohlcv              -> ('EURUSD', 'M1', None)
+    Fuera del formato DAT_ASCII el timeframe debe ser uno de TIMEFRAMES (M1, H1,
+    D1...), para no catalogar nombres como processed_data.feather.
+    Devuelve None si el nombre no sigue la convención.
+    """
+    base = os.path.basename(os.path.normpath(filename))
+    stem = base.split('.')[0]
+    parts = stem.split('_')
+    if len(parts) >= 5 and parts[0] == 'DAT':
+        return parts[2], parts[3], parts[4]
+    if len(parts) in (2, 3) and parts[1] not in TIMEFRAMES:
+        return None
+    if len(parts) == 3 and parts[2].isdigit():
+        return parts[0], parts[1], parts[2]
+    if len(parts) == 2:
+        return parts[0], parts[1], None
+    return None
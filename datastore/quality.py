@@ -0,0 +1,145 @@
+# datastore/quality.py
+
+import numpy as np
+import pandas as pd
+
+_NS_MINUTO = 60 * 1_000_000_000
+_NS_DIA = 86_400 * 1_000_000_000
+REPARACIONES = (None, 'drop', 'ffill')
+
+
+class QualityReport:
+    """
+    Informe compacto de calidad de un bloque de velas.
+    - gaps: DataFrame (start, end, missing, weekend) con los huecos mayores que la frecuencia.
+    - duplicates: número de timestamps repetidos (y no crecientes).
+    - ohlc_violations: filas con High<Low, Open/Close fuera de [Low, High], precios <= 0 o NaN.
+    - zero_volume_spikes: velas con Volume == 0 y rango anómalo.
+    """
+
+    def __init__(self, rows=0, gaps=None, duplicates=0, ohlc_violations=0, zero_volume_spikes=0, repaired=0):
+        self.rows = rows
+        self.gaps = gaps if gaps is not None else pd.DataFrame(columns=['start', 'end', 'missing', 'weekend'])
+        self.duplicates = duplicates
+        self.ohlc_violations = ohlc_violations
+        self.zero_volume_spikes = zero_volume_spikes
+        self.repaired = repaired
+
+    @property
+    def unexpected_gaps(self):
+        """Huecos que no corresponden al cierre de fin de semana."""
+        return self.gaps[~self.gaps['weekend'].astype(bool)]
+
+    def is_clean(self):
+        return (self.duplicates == 0 and self.ohlc_violations == 0
+                and self.zero_volume_spikes == 0 and self.unexpected_gaps.empty)
+
+    def merge(self, other):
+        """Acumula el informe de otro bloque (ingesta por bloques)."""
+        gaps = other.gaps if self.gaps.empty else (
+            self.gaps if other.gaps.empty else pd.concat([self.gaps, other.gaps], ignore_index=True))
+        return QualityReport(
+            rows=self.rows + other.rows,
+            gaps=gaps,
+            duplicates=self.duplicates + other.duplicates,
+            ohlc_violations=self.ohlc_violations + other.ohlc_violations,
+            zero_volume_spikes=self.zero_volume_spikes + other.zero_volume_spikes,
+            repaired=self.repaired + other.repaired,
+        )
+
+    def __str__(self):
+        return (f"Filas: {self.rows:,} | Huecos: {len(self.gaps)} "
+                f"({len(self.unexpected_gaps)} fuera de fin de semana) | "
+                f"Duplicados: {self.duplicates} | Violaciones OHLC: {self.ohlc_violations} | "
+                f"Picos sin volumen: {self.zero_volume_spikes} | Reparadas: {self.repaired}")
+
+
+def scan_quality(df: pd.DataFrame, freq='1min', spike_factor=10.0, repair=None, prev_timestamp=None):
+    """
+    Validación vectorizada de un bloque de velas (índice DatetimeIndex).
+    repair: None (solo informa), 'drop' (elimina duplicados y filas inválidas) o
+    'ffill' (elimina duplicados, sustituye filas inválidas por la vela anterior y
+    rellena los huecos que no son de fin de semana con velas planas).
+    prev_timestamp: último timestamp del bloque anterior, para detectar huecos y
+    duplicados en la frontera entre bloques.
+    Devuelve (df, QualityReport); df solo cambia si se pide reparar.
+    """
+    if repair not in REPARACIONES:
+        raise ValueError(f"repair debe ser uno de {REPARACIONES}")
+    n = len(df)
+    if n == 0:
+        return df, QualityReport()
+
+    paso = pd.Timedelta(freq).value
+    tiempos = df.index.asi8
+    anteriores = np.empty(n, dtype=np.int64)
+    anteriores[0] = tiempos[0] - paso if prev_timestamp is None else pd.Timestamp(prev_timestamp).value
+    anteriores[1:] = tiempos[:-1]
+    delta = tiempos - anteriores
+
+    # Duplicados / retrocesos
+    no_crecientes = delta <= 0
+    duplicates = int(no_crecientes.sum())
+
+    # Huecos
+    idx_gap = np.flatnonzero(delta > paso)
+    inicio = anteriores[idx_gap] + paso
+    fin = tiempos[idx_gap] - paso
+    d0 = inicio // _NS_DIA
+    d1 = fin // _NS_DIA
+    # 1970-01-01 fue jueves: (dia + 3) % 7 == 5 es sábado
+    primer_sabado = d0 + (5 - (d0 + 3) % 7) % 7
+    gaps = pd.DataFrame({
+        'start': pd.to_datetime(inicio),
+        'end': pd.to_datetime(fin),
+        'missing': (delta[idx_gap] // paso - 1).astype(np.int64),
+        'weekend': primer_sabado <= d1,
+    })
+
+    # Violaciones OHLC
+    o = df['Open'].to_numpy(dtype=np.float64)
+    h = df['High'].to_numpy(dtype=np.float64)
+    l = df['Low'].to_numpy(dtype=np.float64)
+    c = df['Close'].to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        invalidas = ~((h >= l) & (o >= l) & (o <= h) & (c >= l) & (c <= h) & (l > 0))
+
+        # Picos sin volumen: rango muy superior a la mediana del bloque
+        picos = np.zeros(n, dtype=bool)
+        if 'Volume' in df.columns:
+            rango = h - l
+            mediana = np.nanmedian(rango[~invalidas]) if (~invalidas).any() else np.nan
+            if mediana > 0:
+                picos = (df['Volume'].to_numpy() == 0) & (rango > spike_factor * mediana) & ~invalidas
+
+    report = QualityReport(rows=n, gaps=gaps, duplicates=duplicates,
+                           ohlc_violations=int(invalidas.sum()), zero_volume_spikes=int(picos.sum()))
+    if repair is None:
+        return df, report
+
+    malas = invalidas | picos
+    if repair == 'drop':
+        quitar = malas | no_crecientes
+        report.repaired = int(quitar.sum())
+        return df[~quitar], report
+
+    # ffill: duplicados fuera, filas inválidas -> vela anterior, huecos -> velas planas
+    out = df[~no_crecientes].copy()
+    malas = malas[~no_crecientes]
+    cols = [col for col in ['Open', 'High', 'Low', 'Close'] if col in out.columns]
+    out.loc[malas, cols] = np.nan
+    rellenar = gaps[~gaps['weekend']]
+    if len(rellenar):
+        nuevos = pd.DatetimeIndex(np.concatenate([
+            np.arange(s, e + paso, paso, dtype=np.int64)
+            for s, e in zip(rellenar['start'].to_numpy().view(np.int64), rellenar['end'].to_numpy().view(np.int64))
+        ]).view('datetime64[ns]'))
+        out = out.reindex(out.index.append(nuevos).sort_values())
+        if 'Volume' in out.columns:
+            out['Volume'] = out['Volume'].fillna(0)
+    # Vela plana = cierre anterior en O/H/L/C
+    cierre_previo = out['Close'].ffill()
+    for col in cols:
+        out[col] = out[col].fillna(cierre_previo)
+    report.repaired = int(malas.sum() + duplicates + rellenar['missing'].sum())
+    return out, report
@@ -0,0 +1,128 @@
+# datastore/resampler.py
+
+import hashlib
+import numpy as np
+import pandas as pd
+
+from .mmap_store import OHLCVStore
+
+# Timeframes estándar -> regla de pandas
+TIMEFRAMES = {
+    'M1': '1min',
+    'M5': '5min',
+    'M15': '15min',
+    'M30': '30min',
+    'H1': '1h',
+    'H4': '4h',
+    'D1': '1D',
+}
+
+_AGREGACION = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe) -> pd.DataFrame:
+    """
+    Agrega velas a un timeframe superior (etiqueta = inicio del intervalo).
+    Los intervalos sin datos (fines de semana, huecos) se eliminan.
+    """
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"Timeframe desconocido: {timeframe}. Opciones: {list(TIMEFRAMES)}")
+    agregacion = {col: func for col, func in _AGREGACION.items() if col in df.columns}
+    out = df[list(agregacion)].resample(TIMEFRAMES[timeframe], label='left', closed='left').agg(agregacion)
+    return out.dropna(subset=['Open'])
+
+
+class Resampler:
+    """
+    Vistas M5/M15/H1/H4/D1 sobre datos M1 (DataFrame u OHLCVStore) con caché.
+    Cuando los datos M1 crecen (update con más velas al final) solo se
+    re-agrega desde el último intervalo cacheado, que podía estar incompleto.
+    Tras un update la caché solo se reutiliza si las velas ya agregadas son
+    idénticas en el nuevo origen (huella de timestamps + OHLC del prefijo).
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._generacion = 0
+        # timeframe -> (agregado, n_filas_origen, ultimo_timestamp_origen, generación, huella)
+        self._cache = {}
+
+    def update(self, source):
+        """Sustituye el origen (p.ej. tras añadir velas); la caché se valida en el siguiente get."""
+        if source is not self.source:
+            self.source = source
+            self._generacion += 1
+
+    def _timestamps(self):
+        if isinstance(self.source, OHLCVStore):
+            return self.source.timestamps
+        return self.source.index.asi8
+
+    def _frame(self, i0=0):
+        if isinstance(self.source, OHLCVStore):
+            return self.source.slice(i0, len(self.source)).to_frame()
+        return self.source.iloc[i0:]
+
+    def _columna(self, col):
+        if col == 'Timestamp':
+            return self._timestamps()
+        if isinstance(self.source, OHLCVStore):
+            return self.source[col] if col in self.source.columns else None
+        return self.source[col].to_numpy() if col in self.source.columns else None
+
+    def _huella(self, i0, i1, base=None):
+        """
+        SHA-1 por columna (timestamps + OHLC) de las velas [i0, i1) del origen,
+        continuando los hashes de base: al crecer el origen solo se procesan
+        las velas nuevas.
+        """
+        hashes = {}
+        for col in ('Timestamp', 'Open', 'High', 'Low', 'Close'):
+            values = self._columna(col)
+            if values is None:
+                continue
+            h = base[col].copy() if base is not None and col in base else hashlib.sha1()
+            h.update(np.ascontiguousarray(values[i0:i1]).data)
+            hashes[col] = h
+        return hashes
+
+    @staticmethod
+    def _digest(hashes):
+        return {col: h.hexdigest() for col, h in hashes.items()}
+
+    def _guardar(self, timeframe, agregado, n, tiempos, huella):
+        if n:
+            self._cache[timeframe] = (agregado, n, tiempos[n - 1], self._generacion, huella)
+
+    def get(self, timeframe) -> pd.DataFrame:
+        """Devuelve las velas agregadas del timeframe indicado ('M1' devuelve el origen)."""
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Timeframe desconocido: {timeframe}. Opciones: {list(TIMEFRAMES)}")
+        if timeframe == 'M1':
+            return self._frame()
+
+        tiempos = self._timestamps()
+        n = len(tiempos)
+        cached = self._cache.get(timeframe)
+
+        if cached is not None:
+            agregado, n_cache, ultimo, generacion, huella = cached
+            # Válida solo si el origen es el mismo con velas añadidas al final:
+            # el mismo objeto (sin update) o un origen nuevo con idéntico prefijo
+            if n >= n_cache and n_cache > 0 and tiempos[n_cache - 1] == ultimo and (
+                    generacion == self._generacion
+                    or self._digest(self._huella(0, n_cache)) == self._digest(huella)):
+                if n == n_cache:
+                    self._guardar(timeframe, agregado, n, tiempos, huella)
+                    return agregado
+                # Re-agregar desde el inicio del último intervalo cacheado
+                inicio_ultimo = agregado.index[-1].value
+                i0 = int(np.searchsorted(tiempos, inicio_ultimo, side='left'))
+                cola = resample_ohlcv(self._frame(i0), timeframe)
+                agregado = pd.concat([agregado.iloc[:-1], cola])
+                self._guardar(timeframe, agregado, n, tiempos, self._huella(n_cache, n, huella))
+                return agregado
+
+        agregado = resample_ohlcv(self._frame(), timeframe)
+        self._guardar(timeframe, agregado, n, tiempos, self._huella(0, n))
+        return agregado
@@ -0,0 +1,67 @@
+# datastore/timestamps.py
+
+import numpy as np
+import pandas as pd
+
+FORMATO_DUKASCOPY = '%Y%m%d %H%M%S'
+ANCHO = 15  # 'YYYYMMDD HHMMSS'
+
+# Días por mes (año no bisiesto), indexado por mes 1..12
+_DIAS_MES = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int32)
+# Posiciones de los 14 dígitos (la posición 8 es el espacio)
+_COLUMNAS_DIGITOS = [0, 1, 2, 3, 4, 5, 6, 7, 9, 10, 11, 12, 13, 14]
+
+
+def parse_dukascopy_timestamps(values) -> np.ndarray:
+    """
+    Parser vectorizado para el formato fijo 'YYYYMMDD HHMMSS' de Dukascopy.
+    Interpreta el buffer de bytes como una matriz (n, 15) de dígitos, extrae los
+    campos como enteros y construye datetime64[ns] directamente (algoritmo
+    days-from-civil), sin pasar por strptime.
+    Si algún valor no cumple el formato se delega en pd.to_datetime, que lanza
+    el error habitual.
+    """
+    values = np.asarray(values)
+    if len(values) == 0:
+        return np.empty(0, dtype='datetime64[ns]')
+
+    raw = values if values.dtype.kind == 'S' else values.astype('S')
+    if raw.dtype.itemsize != ANCHO:
+        return _fallback(values)
+
+    u = raw.view(np.uint8).reshape(-1, ANCHO)
+    # En uint8 los caracteres menores que '0' dan la vuelta y quedan > 9
+    digitos = u[:, _COLUMNAS_DIGITOS] - np.uint8(48)
+    if (u[:, 8] != ord(' ')).any() or (digitos > 9).any():
+        return _fallback(values)
+    d = digitos.astype(np.int32)
+
+    year = d[:, 0] * 1000 + d[:, 1] * 100 + d[:, 2] * 10 + d[:, 3]
+    month = d[:, 4] * 10 + d[:, 5]
+    day = d[:, 6] * 10 + d[:, 7]
+    hour = d[:, 8] * 10 + d[:, 9]
+    minute = d[:, 10] * 10 + d[:, 11]
+    second = d[:, 12] * 10 + d[:, 13]
+
+    # Validación de rangos (incluye días del mes y años bisiestos)
+    if ((month < 1) | (month > 12)).any():
+        return _fallback(values)
+    bisiesto = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+    max_dia = _DIAS_MES[month] + ((month == 2) & bisiesto)
+    if ((day < 1) | (day > max_dia) | (hour > 23) | (minute > 59) | (second > 59)).any():
+        return _fallback(values)
+
+    # days-from-civil (H. Hinnant): días desde 1970-01-01
+    y = year - (month <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    days = era * 146097 + doe - 719468
+
+    seconds = days.astype(np.int64) * 86400 + (hour * 3600 + minute * 60 + second)
+    return (seconds * 1_000_000_000).view('datetime64[ns]')
+
+
+def _fallback(values):
+    return pd.to_datetime(values, format=FORMATO_DUKASCOPY).to_numpy(dtype='datetime64[ns]')
@@ -1,4 +1,13 @@
 # patterns/__init__.py
 from .candlestickpatterns import CandlestickPatterns
+from .pattern_result import PatternResult
+from .occurrence_index import OccurrenceIndex
+from .streaming import StreamingPatternDetector
+from .registry import REGISTRY, PatternDefinition, PatternRegistry, register_pattern
+from .pattern_stats import pattern_return_stats, forward_returns, HORIZONS, SESSIONS
 
-__all__ = ["CandlestickPatterns"]
\ No newline at end of file
+__all__ = [
+    "CandlestickPatterns", "PatternResult", "OccurrenceIndex", "StreamingPatternDetector",
+    "REGISTRY", "PatternDefinition", "PatternRegistry", "register_pattern",
+    "pattern_return_stats", "forward_returns", "HORIZONS", "SESSIONS",
+]
\ No newline at end of file
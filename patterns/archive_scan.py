@@ -0,0 +1,136 @@
+# patterns/archive_scan.py
+
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+
+from datastore import DataCatalog
+from .pattern_engine import detect_patterns
+from .registry import REGISTRY
+
+COLUMNAS_OHLC = ['Open', 'High', 'Low', 'Close']
+
+
+def _scan_worker(entry, names):
+    """
+    Detecta los patrones de una entrada del catálogo. El worker lee el fichero
+    por su cuenta (memmap en .feather/.ohlcv): solo viajan por IPC la entrada
+    (metadatos) y las posiciones encontradas.
+    """
+    resumen = {'key': entry.key, 'path': entry.path, 'rows': 0, 'elapsed': 0.0, 'error': None,
+               'positions': None, 'timestamps': None}
+    inicio = time.perf_counter()
+    try:
+        df = DataCatalog.read_data(entry, columns=COLUMNAS_OHLC)
+        _, matrix = detect_patterns(df['Open'], df['High'], df['Low'], df['Close'], names)
+        tiempos = df.index.asi8
+        resumen['rows'] = len(df)
+        resumen['positions'] = [np.flatnonzero(fila).astype(np.int32) for fila in matrix]
+        resumen['timestamps'] = [tiempos[pos] for pos in resumen['positions']]
+    except Exception as e:
+        resumen['error'] = f"{type(e).__name__}: {e}"
+    resumen['elapsed'] = time.perf_counter() - inicio
+    return resumen
+
+
+def _save_results(output, names, resumenes):
+    """
+    Guarda los resultados en un .npz comprimido. Las ocurrencias de todas las
+    entradas y patrones van concatenadas en positions/timestamps; la entrada e
+    y el patrón p ocupan [offsets[e*P + p], offsets[e*P + p + 1]).
+    Ambos arrays se guardan como diferencias (np.diff): al estar ordenados los
+    valores son pequeños y repetidos, y comprimen ~3 veces mejor y más rápido.
+    """
+    validos = [r for r in resumenes if r['error'] is None]
+    posiciones = [pos for r in validos for pos in r['positions']]
+    tiempos = [ts for r in validos for ts in r['timestamps']]
+    counts = np.array([[len(pos) for pos in r['positions']] for r in validos], dtype=np.int64).reshape(len(validos), len(names))
+    offsets = np.zeros(counts.size + 1, dtype=np.int64)
+    np.cumsum(counts.ravel(), out=offsets[1:])
+    np.savez_compressed(
+        output,
+        names=np.array(names),
+        keys=np.array([[s, tf, y or ''] for s, tf, y in (r['key'] for r in validos)], dtype=str).reshape(len(validos), 3),
+        paths=np.array([r['path'] for r in validos], dtype=str),
+        rows=np.array([r['rows'] for r in validos], dtype=np.int64),
+        counts=counts,
+        offsets=offsets,
+        position_deltas=np.diff(np.concatenate(posiciones), prepend=0).astype(np.int32) if posiciones else np.zeros(0, dtype=np.int32),
+        timestamp_deltas=np.diff(np.concatenate(tiempos), prepend=0) if tiempos else np.zeros(0, dtype=np.int64),
+    )
+
+
+def scan_archive(folders="processed", output="pattern_scan.npz", names=None, workers=1,
+                 symbol=None, timeframe=None):
+    """
+    Detecta patrones en todo el archivo procesado (todas las entradas del
+    DataCatalog, filtrables por símbolo/timeframe) repartiendo los ficheros en
+    un ProcessPoolExecutor, y guarda conteos y ocurrencias en output (.npz).
+    Devuelve los resúmenes por entrada (key, path, rows, elapsed, error).
+    """
+    names = REGISTRY.names() if names is None else list(names)
+    entries = DataCatalog(folders).scan().list(symbol, timeframe)
+
+    if workers is None or workers <= 1 or len(entries) <= 1:
+        resumenes = [_scan_worker(entry, names) for entry in entries]
+    else:
+        # Los ficheros grandes primero para repartir mejor la carga entre procesos
+        resumenes = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_scan_worker, entry, names)
+                       for entry in sorted(entries, key=lambda e: e.size, reverse=True)]
+            for future in as_completed(futures):
+                resumenes.append(future.result())
+        resumenes.sort(key=lambda r: str(r['key']))
+
+    _save_results(output, names, resumenes)
+    return [{k: v for k, v in r.items() if k not in ('positions', 'timestamps')} for r in resumenes]
+
+
+class PatternScanResults:
+    """Lectura del fichero generado por scan_archive."""
+
+    def __init__(self, path):
+        with np.load(path) as data:
+            self._data = {k: data[k] for k in data.files}
+        self.positions = np.cumsum(self._data.pop('position_deltas'), dtype=np.int64).astype(np.int32)
+        self.timestamps = np.cumsum(self._data.pop('timestamp_deltas'))
+        self.names = self._data['names'].tolist()
+        self.keys = [(s, tf, y or None) for s, tf, y in self._data['keys'].tolist()]
+
+    def counts(self) -> pd.DataFrame:
+        """Tabla de conteos: una fila por entrada, una columna por patrón."""
+        df = pd.DataFrame(self._data['counts'], columns=self.names)
+        df.insert(0, 'rows', self._data['rows'])
+        df.index = pd.MultiIndex.from_tuples(self.keys, names=['symbol', 'timeframe', 'year'])
+        return df
+
+    def occurrences(self, symbol, timeframe, year, pattern):
+        """(posiciones int32, timestamps int64) de un patrón en una entrada."""
+        e = self.keys.index((symbol, timeframe, None if year is None else str(year)))
+        i = e * len(self.names) + self.names.index(pattern)
+        a, b = self._data['offsets'][i], self._data['offsets'][i + 1]
+        return self.positions[a:b], self.timestamps[a:b]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Escaneo de patrones sobre el archivo procesado")
+    parser.add_argument("folders", nargs="*", default=["processed"], help="Carpetas de datos procesados")
+    parser.add_argument("--output", default="pattern_scan.npz", help="Fichero de resultados (.npz)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Número de procesos")
+    parser.add_argument("--patterns", default=None, help="Patrones separados por comas (todos por defecto)")
+    parser.add_argument("--symbol", default=None)
+    parser.add_argument("--timeframe", default=None)
+    args = parser.parse_args()
+
+    nombres = args.patterns.split(",") if args.patterns else None
+    for resumen in scan_archive(args.folders, args.output, nombres, args.workers, args.symbol, args.timeframe):
+        symbol, tf, year = resumen['key']
+        if resumen['error']:
+            print(f"⚠️ Error en {symbol} {tf} {year or '*'}: {resumen['error']}")
+        else:
+            print(f"✅ {symbol} {tf} {year or '*'}: {resumen['rows']:,} velas en {resumen['elapsed']:.1f}s")
+    print(f"Resultados guardados en {args.output}")
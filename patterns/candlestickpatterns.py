@@ -2,6 +2,9 @@
 
 import pandas as pd
 import numpy as np
+from .pattern_engine import detect_patterns
+from .pattern_result import PatternResult
+from .registry import REGISTRY
 
 class CandlestickPatterns:
     def __init__(self, data):
@@ -9,205 +12,119 @@ class CandlestickPatterns:
         data: DataFrame con columnas ['Open', 'High', 'Low', 'Close']
         """
         self.data = data.copy()
+        self._preloaded = {}  # patrón -> fila int8 precalculada con preload()
+
+    # ---------------- Patrón individual ----------------
+    def pattern(self, name):
+        """Señal de un patrón del registro con el formato [Open, High, Low, Close, Signal]."""
+        names, matrix = self.detect_patterns_matrix([name])
+        df = self.data[['Open','High','Low','Close']].copy()
+        df['Signal'] = matrix[0].astype(np.int64)
+        return df
 
     # ---------------- Single Candles ----------------
     def doji(self):
-        df = self.data.copy()
-        df['Signal'] = np.where(abs(df['Close'] - df['Open']) <= (df['High'] - df['Low'])*0.1, 0, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('doji')
 
     def hammer(self):
-        df = self.data.copy()
-        df['Signal'] = 0
-        body = abs(df['Close'] - df['Open'])
-        lower_shadow = df[['Open','Close']].min(axis=1) - df['Low']
-        upper_shadow = df['High'] - df[['Open','Close']].max(axis=1)
-        df['Signal'] = np.where((lower_shadow >= 2*body) & (upper_shadow <= body), 1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('hammer')
 
     def hanging_man(self):
-        df = self.hammer()
-        df['Signal'] = np.where(df['Signal'] == 1, -1, 0)
-        return df
+        return self.pattern('hanging_man')
 
     def shooting_star(self):
-        df = self.data.copy()
-        df['Signal'] = 0
-        body = abs(df['Close'] - df['Open'])
-        upper_shadow = df['High'] - df[['Open','Close']].max(axis=1)
-        lower_shadow = df[['Open','Close']].min(axis=1) - df['Low']
-        df['Signal'] = np.where((upper_shadow >= 2*body) & (lower_shadow <= body), -1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('shooting_star')
 
     def spinning_top(self):
-        df = self.data.copy()
-        df['Signal'] = np.where(abs(df['Close'] - df['Open']) <= (df['High'] - df['Low'])*0.3, 0, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('spinning_top')
 
     def inverted_hammer(self):
-        df = self.data.copy()
-        df['Signal'] = 0
-        body = abs(df['Close'] - df['Open'])
-        upper_shadow = df['High'] - df[['Open','Close']].max(axis=1)
-        lower_shadow = df[['Open','Close']].min(axis=1) - df['Low']
-        df['Signal'] = np.where((upper_shadow >= 2*body) & (lower_shadow <= body), 1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('inverted_hammer')
 
     # ---------------- Double Candles ----------------
     def bullish_engulfing(self):
-        df = self.data.copy()
-        df['Signal'] = np.where(
-            (df['Close'] > df['Open']) &
-            (df['Close'].shift(1) < df['Open'].shift(1)) &
-            (df['Open'] < df['Close'].shift(1)) &
-            (df['Close'] > df['Open'].shift(1)), 1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('bullish_engulfing')
 
     def bearish_engulfing(self):
-        df = self.data.copy()
-        df['Signal'] = np.where(
-            (df['Close'] < df['Open']) &
-            (df['Close'].shift(1) > df['Open'].shift(1)) &
-            (df['Open'] > df['Close'].shift(1)) &
-            (df['Close'] < df['Open'].shift(1)), -1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('bearish_engulfing')
 
     def piercing_line(self):
-        df = self.data.copy()
-        df['Signal'] = np.where(
-            (df['Close'].shift(1) < df['Open'].shift(1)) &
-            (df['Close'] > (df['Open'].shift(1) + df['Close'].shift(1))/2) &
-            (df['Open'] < df['Close'].shift(1)), 1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('piercing_line')
 
     def dark_cloud_cover(self):
-        df = self.data.copy()
-        df['Signal'] = np.where(
-            (df['Close'].shift(1) > df['Open'].shift(1)) &
-            (df['Close'] < (df['Open'].shift(1) + df['Close'].shift(1))/2) &
-            (df['Open'] > df['Close'].shift(1)), -1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('dark_cloud_cover')
 
     def tweezer_top(self):
-        df = self.data.copy()
-        df['Signal'] = np.where(
-            (df['High'].shift(1).round(5) == df['High'].round(5)), -1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('tweezer_top')
 
     def tweezer_bottom(self):
-        df = self.data.copy()
-        df['Signal'] = np.where(
-            (df['Low'].shift(1).round(5) == df['Low'].round(5)), 1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('tweezer_bottom')
 
     # ---------------- Triple Candles ----------------
     def morning_star(self):
-        df = self.data.copy()
-        df['Signal'] = np.where(
-            (df['Close'].shift(2) < df['Open'].shift(2)) &
-            (abs(df['Close'].shift(1) - df['Open'].shift(1)) < abs(df['Close'].shift(2) - df['Open'].shift(2))/2) &
-            (df['Close'] > df['Open'].shift(1)), 1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('morning_star')
 
     def evening_star(self):
-        df = self.data.copy()
-        df['Signal'] = np.where(
-            (df['Close'].shift(2) > df['Open'].shift(2)) &
-            (abs(df['Close'].shift(1) - df['Open'].shift(1)) < abs(df['Close'].shift(2) - df['Open'].shift(2))/2) &
-            (df['Close'] < df['Open'].shift(1)), -1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('evening_star')
 
     def three_white_soldiers(self):
-        df = self.data.copy()
-        cond = (
-            (df['Close'].shift(2) < df['Open'].shift(2)) &
-            (df['Close'].shift(1) > df['Open'].shift(1)) &
-            (df['Close'] > df['Open']) &
-            (df['Close'] > df['Close'].shift(1)) &
-            (df['Close'].shift(1) > df['Close'].shift(2))
-        )
-        df['Signal'] = np.where(cond, 1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('three_white_soldiers')
 
     def three_black_crows(self):
-        df = self.data.copy()
-        cond = (
-            (df['Close'].shift(2) > df['Open'].shift(2)) &
-            (df['Close'].shift(1) < df['Open'].shift(1)) &
-            (df['Close'] < df['Open']) &
-            (df['Close'] < df['Close'].shift(1)) &
-            (df['Close'].shift(1) < df['Close'].shift(2))
-        )
-        df['Signal'] = np.where(cond, -1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('three_black_crows')
 
     def three_inside_up(self):
-        df = self.data.copy()
-        cond = (
-            (df['Close'].shift(2) < df['Open'].shift(2)) &
-            (df['Close'].shift(1) > df['Open'].shift(1)) &
-            (df['Close'] > df['Open'].shift(2))
-        )
-        df['Signal'] = np.where(cond, 1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('three_inside_up')
 
     def three_inside_down(self):
-        df = self.data.copy()
-        cond = (
-            (df['Close'].shift(2) > df['Open'].shift(2)) &
-            (df['Close'].shift(1) < df['Open'].shift(1)) &
-            (df['Close'] < df['Open'].shift(2))
-        )
-        df['Signal'] = np.where(cond, -1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('three_inside_down')
 
     def rising_three_methods(self):
-        df = self.data.copy()
-        cond = (
-            (df['Close'].shift(4) < df['Open'].shift(4)) &
-            (df['Close'].shift(3) < df['Open'].shift(3)) &
-            (df['Close'].shift(2) < df['Open'].shift(2)) &
-            (df['Close'].shift(1) < df['Open'].shift(1)) &
-            (df['Close'] > df['Open'].shift(4))
-        )
-        df['Signal'] = np.where(cond, 1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('rising_three_methods')
 
     def falling_three_methods(self):
-        df = self.data.copy()
-        cond = (
-            (df['Close'].shift(4) > df['Open'].shift(4)) &
-            (df['Close'].shift(3) > df['Open'].shift(3)) &
-            (df['Close'].shift(2) > df['Open'].shift(2)) &
-            (df['Close'].shift(1) > df['Open'].shift(1)) &
-            (df['Close'] < df['Open'].shift(4))
-        )
-        df['Signal'] = np.where(cond, -1, 0)
-        return df[['Open','High','Low','Close','Signal']]
+        return self.pattern('falling_three_methods')
 
     # ---------------- Detect all patterns ----------------
+    def detect_patterns_matrix(self, names=None):
+        """
+        Evalúa los patrones con el motor fusionado (primitivas calculadas una vez).
+        Devuelve (names, matriz int8 de forma (patrones, velas)).
+        Si todos los patrones pedidos están precargados no se recalcula nada.
+        """
+        if self._preloaded:
+            names = REGISTRY.names() if names is None else list(names)
+            if all(name in self._preloaded for name in names):
+                return names, np.stack([self._preloaded[name] for name in names])
+        return detect_patterns(self.data['Open'], self.data['High'], self.data['Low'], self.data['Close'], names)
+
+    def preload(self, names=None):
+        """
+        Detecta varios patrones en una sola pasada del motor y los guarda para
+        que pattern(), detect() y combined_signal_optimized() los reutilicen
+        (p.ej. varias estrategias de velas que comparten patrones).
+        """
+        names = REGISTRY.names() if names is None else list(names)
+        pendientes = [name for name in names if name not in self._preloaded]
+        if pendientes:
+            pendientes, matrix = detect_patterns(self.data['Open'], self.data['High'], self.data['Low'],
+                                                 self.data['Close'], pendientes)
+            self._preloaded.update(zip(pendientes, matrix))
+        return self
+
+    def detect(self, names=None):
+        """Detección compacta: PatternResult (int8) que comparte el índice de los datos."""
+        names, matrix = self.detect_patterns_matrix(names)
+        return PatternResult(names, matrix, self.data.index)
+
     def detect_all_patterns(self):
-        df = self.data.copy()
-        pattern_functions = [
-            'doji', 'hammer', 'hanging_man', 'shooting_star', 'spinning_top', 'inverted_hammer',
-            'bullish_engulfing', 'bearish_engulfing', 'piercing_line', 'dark_cloud_cover',
-            'tweezer_top', 'tweezer_bottom',
-            'morning_star', 'evening_star', 'three_white_soldiers', 'three_black_crows',
-            'three_inside_up', 'three_inside_down', 'rising_three_methods', 'falling_three_methods'
-        ]
-        for func_name in pattern_functions:
-            func = getattr(self, func_name)
-            df[func_name] = func()['Signal']
-        return df
+        """Todos los patrones registrados como columnas int64 sobre una copia de los datos."""
+        return self.detect().to_frame(self.data)
 
     # ---------------- Combined signal optimized ----------------
     def combined_signal_optimized(self):
-        df = self.detect_all_patterns().copy()
-        pattern_cols = df.columns.difference(['Open','High','Low','Close'])
-        has_bull = (df[pattern_cols] == 1).any(axis=1)
-        has_bear = (df[pattern_cols] == -1).any(axis=1)
-        df['Final_Signal'] = 0
-        df.loc[has_bull & ~has_bear, 'Final_Signal'] = 1
-        df.loc[has_bear & ~has_bull, 'Final_Signal'] = -1
+        result = self.detect()
+        df = result.to_frame(self.data)
+        df['Final_Signal'] = result.final_signal().astype(np.int64)
         return df
 
@@ -0,0 +1,67 @@
+# patterns/occurrence_index.py
+
+import numpy as np
+import pandas as pd
+
+
+class OccurrenceIndex:
+    """
+    Índice de apariciones por patrón: posiciones de vela ordenadas (np.flatnonzero)
+    y sus timestamps, para búsquedas por tiempo en O(log n) con searchsorted.
+    Con un índice no temporal los "tiempos" son las propias posiciones.
+    """
+
+    def __init__(self, names, signals, index):
+        self.index = index
+        self._temporal = isinstance(index, pd.DatetimeIndex)
+        claves = index.asi8 if self._temporal else np.arange(len(index), dtype=np.int64)
+        self._positions = {}
+        self._keys = {}
+        for i, name in enumerate(names):
+            pos = np.flatnonzero(signals[i])
+            self._positions[name] = pos
+            self._keys[name] = claves[pos]
+
+    @classmethod
+    def from_result(cls, result):
+        return cls(result.names, result.signals, result.index)
+
+    @property
+    def names(self):
+        return list(self._positions)
+
+    def __contains__(self, name):
+        return name in self._positions
+
+    def count(self, name):
+        return len(self._positions[name])
+
+    def positions(self, name):
+        """Posiciones (enteros, orden creciente) de las velas con el patrón."""
+        return self._positions[name]
+
+    def timestamps(self, name):
+        """Etiquetas del índice de las velas con el patrón."""
+        return self.index[self._positions[name]]
+
+    def _key(self, t):
+        return pd.Timestamp(t).value if self._temporal else int(t)
+
+    def next(self, name, t, inclusive=False):
+        """Posición de la primera aparición posterior a t (o None)."""
+        keys = self._keys[name]
+        i = np.searchsorted(keys, self._key(t), side='left' if inclusive else 'right')
+        return int(self._positions[name][i]) if i < len(keys) else None
+
+    def previous(self, name, t, inclusive=False):
+        """Posición de la última aparición anterior a t (o None)."""
+        keys = self._keys[name]
+        i = np.searchsorted(keys, self._key(t), side='right' if inclusive else 'left') - 1
+        return int(self._positions[name][i]) if i >= 0 else None
+
+    def in_window(self, name, start=None, end=None):
+        """Posiciones de las apariciones con start <= t <= end (límites opcionales)."""
+        keys = self._keys[name]
+        i0 = 0 if start is None else np.searchsorted(keys, self._key(start), side='left')
+        i1 = len(keys) if end is None else np.searchsorted(keys, self._key(end), side='right')
+        return self._positions[name][i0:i1]
@@ -0,0 +1,81 @@
+# patterns/pattern_engine.py
+
+import numpy as np
+from .registry import REGISTRY
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    return values if values.dtype.kind == 'f' else values.astype(np.float64)
+
+
+def _shift(values, k):
+    """Equivalente a Series.shift(k) sobre un array float (NaN en las k primeras)."""
+    if k == 0:
+        return values
+    out = np.empty_like(values)
+    out[:k] = np.nan
+    out[k:] = values[:-k]
+    return out
+
+
+class Primitives:
+    """
+    Primitivas compartidas por todos los patrones, calculadas una sola vez y de
+    forma perezosa: precios desplazados (o(k), c(k), ...), cuerpo y sombras.
+    """
+
+    def __init__(self, open_, high, low, close):
+        self._base = {'o': _as_float(open_), 'h': _as_float(high),
+                      'l': _as_float(low), 'c': _as_float(close)}
+        self._cache = {}
+
+    def _get(self, key, func):
+        if key not in self._cache:
+            self._cache[key] = func()
+        return self._cache[key]
+
+    def o(self, k=0):
+        return self._get(('o', k), lambda: _shift(self._base['o'], k))
+
+    def h(self, k=0):
+        return self._get(('h', k), lambda: _shift(self._base['h'], k))
+
+    def l(self, k=0):
+        return self._get(('l', k), lambda: _shift(self._base['l'], k))
+
+    def c(self, k=0):
+        return self._get(('c', k), lambda: _shift(self._base['c'], k))
+
+    def body(self, k=0):
+        return self._get(('body', k), lambda: np.abs(self.c(k) - self.o(k)))
+
+    def upper_shadow(self):
+        # fmax/fmin ignoran NaN igual que df[['Open','Close']].max(axis=1)
+        return self._get('upper', lambda: self.h() - np.fmax(self.o(), self.c()))
+
+    def lower_shadow(self):
+        return self._get('lower', lambda: np.fmin(self.o(), self.c()) - self.l())
+
+    def bull(self, k=0):
+        return self._get(('bull', k), lambda: self.c(k) > self.o(k))
+
+    def bear(self, k=0):
+        return self._get(('bear', k), lambda: self.c(k) < self.o(k))
+
+
+def detect_patterns(open_, high, low, close, names=None, registry=REGISTRY):
+    """
+    Motor fusionado: evalúa los patrones pedidos (todos los registrados por
+    defecto) en una sola pasada. Las primitivas son perezosas, así que solo se
+    calculan las que usan los predicados seleccionados.
+    Devuelve (names, matriz int8 de forma (patrones, velas)) con 1 / -1 / 0.
+    """
+    names = registry.names() if names is None else list(names)
+    definitions = [registry.get(name) for name in names]
+    primitives = Primitives(open_, high, low, close)
+    out = np.zeros((len(names), len(primitives.c())), dtype=np.int8)
+    for i, definition in enumerate(definitions):
+        if definition.direction != 0:
+            out[i][definition.predicate(primitives)] = definition.direction
+    return names, out
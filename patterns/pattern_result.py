@@ -0,0 +1,91 @@
+# patterns/pattern_result.py
+
+import numpy as np
+import pandas as pd
+
+from .occurrence_index import OccurrenceIndex
+
+
+class PatternResult:
+    """
+    Resultado compacto de la detección de patrones.
+    - signals: matriz int8 (patrones, velas) con 1 / -1 / 0.
+    - index: índice temporal compartido (no se copia el OHLC).
+    La conversión a DataFrame es perezosa (to_frame) y solo se hace cuando la
+    GUI la necesita.
+    """
+
+    def __init__(self, names, signals, index):
+        self.names = list(names)
+        self.signals = signals
+        self.index = index
+        self._pos = {name: i for i, name in enumerate(self.names)}
+        self._frame = None
+        self._bits = None
+        self._occurrences = None
+
+    def __len__(self):
+        return self.signals.shape[1]
+
+    def __contains__(self, name):
+        return name in self._pos
+
+    def __getitem__(self, name):
+        """Señales int8 de un patrón (vista de la matriz)."""
+        return self.signals[self._pos[name]]
+
+    @property
+    def nbytes(self):
+        return self.signals.nbytes
+
+    # ---------------- Reducciones ----------------
+    def any_bull(self):
+        """True en las velas con algún patrón alcista."""
+        return (self.signals == 1).any(axis=0)
+
+    def any_bear(self):
+        """True en las velas con algún patrón bajista."""
+        return (self.signals == -1).any(axis=0)
+
+    def final_signal(self):
+        """1 si solo hay patrones alcistas, -1 si solo bajistas, 0 en otro caso."""
+        bull = self.any_bull()
+        bear = self.any_bear()
+        out = np.zeros(len(self), dtype=np.int8)
+        out[bull & ~bear] = 1
+        out[bear & ~bull] = -1
+        return out
+
+    def counts(self):
+        """Número de apariciones (señal != 0) por patrón."""
+        return dict(zip(self.names, np.count_nonzero(self.signals, axis=1).tolist()))
+
+    def packed(self):
+        """
+        Bitsets empaquetados (np.packbits) de apariciones alcistas y bajistas,
+        de forma (patrones, ceil(velas / 8)): 1 bit por vela y patrón.
+        """
+        if self._bits is None:
+            self._bits = (np.packbits(self.signals == 1, axis=1),
+                          np.packbits(self.signals == -1, axis=1))
+        return self._bits
+
+    def occurrences(self):
+        """OccurrenceIndex (posiciones y timestamps por patrón), construido una sola vez."""
+        if self._occurrences is None:
+            self._occurrences = OccurrenceIndex.from_result(self)
+        return self._occurrences
+
+    # ---------------- Conversión ----------------
+    def to_frame(self, data=None):
+        """
+        DataFrame con una columna int64 por patrón (formato de detect_all_patterns).
+        Si se pasa data, las columnas de patrones se añaden a una copia de data.
+        """
+        if data is None:
+            if self._frame is None:
+                self._frame = pd.DataFrame(self.signals.T.astype(np.int64), index=self.index, columns=self.names)
+            return self._frame
+        df = data.copy()
+        df[self.names] = self.signals.T.astype(np.int64)
+        return df
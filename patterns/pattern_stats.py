@@ -0,0 +1,117 @@
+# patterns/pattern_stats.py
+
+import numpy as np
+import pandas as pd
+
+from datastore import OHLCVStore
+from .pattern_engine import Primitives
+from .registry import REGISTRY
+
+# Horizontes por defecto, en velas
+HORIZONS = (1, 5, 15, 60)
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Sesiones por hora del índice [inicio, fin). Con HistData el índice está en EST
+# sin horario de verano; ajustar si los datos vienen en otra zona horaria.
+# Sin solapes: Londres/Nueva York (8-12 EST) cuenta como new_york.
+SESSIONS = {
+    'asia': (19, 3),
+    'london': (3, 8),
+    'new_york': (8, 17),
+}
+SIN_SESION = 'off'
+
+_NS_HORA = 3_600_000_000_000
+
+
+def forward_returns(close, horizons=HORIZONS):
+    """
+    Retornos simples a futuro por aritmética de índices: out[j, i] = close[i+h]/close[i] - 1
+    con h = horizons[j]. Las últimas h velas quedan a NaN. Forma (horizontes, velas).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    out = np.full((len(horizons), n), np.nan)
+    for j, h in enumerate(horizons):
+        if h < n:
+            out[j, :n - h] = close[h:] / close[:n - h] - 1.0
+    return out
+
+
+def session_codes(index, sessions=SESSIONS):
+    """
+    Código de sesión por vela según la hora del índice (vectorizado sobre asi8).
+    Devuelve (códigos int8, nombres); el último nombre es SIN_SESION.
+    Si las sesiones se solapan, gana la que aparece primero.
+    """
+    horas = (np.asarray(index.asi8) // _NS_HORA) % 24
+    nombres = list(sessions) + [SIN_SESION]
+    codes = np.full(len(horas), len(sessions), dtype=np.int8)
+    for code, (inicio, fin) in reversed(list(enumerate(sessions.values()))):
+        if inicio <= fin:
+            mask = (horas >= inicio) & (horas < fin)
+        else:  # la sesión cruza la medianoche
+            mask = (horas >= inicio) | (horas < fin)
+        codes[mask] = code
+    return codes, nombres
+
+
+def _describe(values, quantiles):
+    """Estadísticos de un vector de retornos (se ignoran los NaN)."""
+    values = values[~np.isnan(values)]
+    count = len(values)
+    if count == 0:
+        return 0, np.nan, np.nan, np.nan, np.nan, np.full(len(quantiles), np.nan)
+    mean = values.mean()
+    std = values.std(ddof=1) if count > 1 else np.nan
+    hit = np.count_nonzero(values > 0) / count
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t_stat = mean / (std / np.sqrt(count))
+    return count, hit, mean, std, t_stat, np.quantile(values, quantiles)
+
+
+def pattern_return_stats(data, horizons=HORIZONS, names=None, by_session=True,
+                         quantiles=QUANTILES, sessions=SESSIONS, registry=REGISTRY):
+    """
+    Distribución de retornos a futuro tras cada aparición de patrón.
+    - Los retornos se firman con la dirección del patrón (un patrón bajista
+      acierta si el precio baja); los neutros (doji, spinning_top) usan el
+      retorno sin firmar y se evalúan con su predicado.
+    - hit_rate: fracción de retornos firmados > 0; t_stat: media / error estándar.
+    Devuelve una tabla con una fila por (patrón, sesión, horizonte); la sesión
+    'all' agrupa todas las velas.
+    """
+    if isinstance(data, OHLCVStore):
+        data = data.to_frame()
+    names = registry.names() if names is None else list(names)
+    horizons = tuple(horizons)
+    primitives = Primitives(data['Open'], data['High'], data['Low'], data['Close'])
+    fwd = forward_returns(primitives.c(), horizons)
+
+    if by_session:
+        codes, nombres_sesion = session_codes(data.index, sessions)
+    q_cols = [f"q{int(round(q * 100)):02d}" for q in quantiles]
+
+    filas = []
+    for name in names:
+        definition = registry.get(name)
+        posiciones = np.flatnonzero(definition.predicate(primitives))
+        signo = definition.direction if definition.direction != 0 else 1
+        valores = fwd[:, posiciones] * signo
+
+        grupos = [('all', valores)]
+        if by_session:
+            codes_pat = codes[posiciones]
+            grupos += [(sesion, valores[:, codes_pat == code]) for code, sesion in enumerate(nombres_sesion)]
+
+        for sesion, vals in grupos:
+            for j, h in enumerate(horizons):
+                count, hit, mean, std, t_stat, qs = _describe(vals[j], quantiles)
+                fila = {
+                    'pattern': name, 'direction': definition.direction, 'session': sesion,
+                    'horizon': h, 'count': count, 'hit_rate': hit,
+                    'mean': mean, 'std': std, 't_stat': t_stat,
+                }
+                fila.update(zip(q_cols, qs))
+                filas.append(fila)
+    return pd.DataFrame(filas)
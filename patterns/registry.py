@@ -0,0 +1,112 @@
+# patterns/registry.py
+
+import numpy as np
+
+# Secciones de la GUI, en orden de aparición
+GROUPS = {
+    'one': "Patrones de una vela",
+    'two': "Patrones de dos velas",
+    'three': "Patrones de tres velas",
+    'other': "Otros patrones",
+}
+
+
+class PatternDefinition:
+    """
+    Definición declarativa de un patrón de velas.
+    - lookback: velas anteriores que usa el predicado (o(k) con k <= lookback).
+    - direction: 1 alcista, -1 bajista, 0 neutro (la señal es siempre 0).
+    - predicate: función vectorizada sobre Primitives que devuelve un array bool.
+    """
+
+    def __init__(self, name, group, lookback, direction, predicate):
+        if group not in GROUPS:
+            raise ValueError(f"Grupo de patrones desconocido: {group}")
+        self.name = name
+        self.group = group
+        self.lookback = lookback
+        self.direction = direction
+        self.predicate = predicate
+
+    @property
+    def title(self):
+        return self.name.replace("_", " ").title()
+
+    def __repr__(self):
+        return f"PatternDefinition({self.name} | {self.group} | lookback={self.lookback} | dir={self.direction})"
+
+
+class PatternRegistry:
+    """Registro ordenado de patrones: motor por lotes, streaming y GUI se construyen desde aquí."""
+
+    def __init__(self):
+        self._definitions = {}
+
+    def register(self, name, group, lookback, direction, predicate, replace=False):
+        if name in self._definitions and not replace:
+            raise ValueError(f"El patrón {name} ya está registrado")
+        self._definitions[name] = PatternDefinition(name, group, lookback, direction, predicate)
+        return self._definitions[name]
+
+    def unregister(self, name):
+        self._definitions.pop(name, None)
+
+    def get(self, name):
+        try:
+            return self._definitions[name]
+        except KeyError:
+            raise KeyError(f"Patrón no registrado: {name}") from None
+
+    def __contains__(self, name):
+        return name in self._definitions
+
+    def __iter__(self):
+        return iter(self._definitions.values())
+
+    def __len__(self):
+        return len(self._definitions)
+
+    def names(self, group=None):
+        return [d.name for d in self if group is None or d.group == group]
+
+    def groups(self):
+        """{grupo: [nombres]} en el orden de GROUPS (incluye grupos vacíos)."""
+        return {group: self.names(group) for group in GROUPS}
+
+    def max_lookback(self, names=None):
+        names = self.names() if names is None else names
+        return max((self.get(name).lookback for name in names), default=0)
+
+
+REGISTRY = PatternRegistry()
+
+
+def register_pattern(name, group, lookback, direction, predicate, replace=False):
+    """Registra un patrón en el registro global."""
+    return REGISTRY.register(name, group, lookback, direction, predicate, replace=replace)
+
+
+# ---------------- Patrones incluidos ----------------
+# Una vela
+register_pattern('doji', 'one', 0, 0, lambda p: p.body() <= (p.h() - p.l()) * 0.1)
+register_pattern('hammer', 'one', 0, 1, lambda p: (p.lower_shadow() >= 2 * p.body()) & (p.upper_shadow() <= p.body()))
+register_pattern('hanging_man', 'one', 0, -1, lambda p: (p.lower_shadow() >= 2 * p.body()) & (p.upper_shadow() <= p.body()))
+register_pattern('shooting_star', 'one', 0, -1, lambda p: (p.upper_shadow() >= 2 * p.body()) & (p.lower_shadow() <= p.body()))
+register_pattern('spinning_top', 'one', 0, 0, lambda p: p.body() <= (p.h() - p.l()) * 0.3)
+register_pattern('inverted_hammer', 'one', 0, 1, lambda p: (p.upper_shadow() >= 2 * p.body()) & (p.lower_shadow() <= p.body()))
+# Dos velas
+register_pattern('bullish_engulfing', 'two', 1, 1, lambda p: p.bull() & p.bear(1) & (p.o() < p.c(1)) & (p.c() > p.o(1)))
+register_pattern('bearish_engulfing', 'two', 1, -1, lambda p: p.bear() & p.bull(1) & (p.o() > p.c(1)) & (p.c() < p.o(1)))
+register_pattern('piercing_line', 'two', 1, 1, lambda p: p.bear(1) & (p.c() > (p.o(1) + p.c(1)) / 2) & (p.o() < p.c(1)))
+register_pattern('dark_cloud_cover', 'two', 1, -1, lambda p: p.bull(1) & (p.c() < (p.o(1) + p.c(1)) / 2) & (p.o() > p.c(1)))
+register_pattern('tweezer_top', 'two', 1, -1, lambda p: np.round(p.h(1), 5) == np.round(p.h(), 5))
+register_pattern('tweezer_bottom', 'two', 1, 1, lambda p: np.round(p.l(1), 5) == np.round(p.l(), 5))
+# Tres velas (la GUI agrupa aquí también los de cinco velas)
+register_pattern('morning_star', 'three', 2, 1, lambda p: p.bear(2) & (p.body(1) < p.body(2) / 2) & (p.c() > p.o(1)))
+register_pattern('evening_star', 'three', 2, -1, lambda p: p.bull(2) & (p.body(1) < p.body(2) / 2) & (p.c() < p.o(1)))
+register_pattern('three_white_soldiers', 'three', 2, 1, lambda p: p.bear(2) & p.bull(1) & p.bull() & (p.c() > p.c(1)) & (p.c(1) > p.c(2)))
+register_pattern('three_black_crows', 'three', 2, -1, lambda p: p.bull(2) & p.bear(1) & p.bear() & (p.c() < p.c(1)) & (p.c(1) < p.c(2)))
+register_pattern('three_inside_up', 'three', 2, 1, lambda p: p.bear(2) & p.bull(1) & (p.c() > p.o(2)))
+register_pattern('three_inside_down', 'three', 2, -1, lambda p: p.bull(2) & p.bear(1) & (p.c() < p.o(2)))
+register_pattern('rising_three_methods', 'three', 4, 1, lambda p: p.bear(4) & p.bear(3) & p.bear(2) & p.bear(1) & (p.c() > p.o(4)))
+register_pattern('falling_three_methods', 'three', 4, -1, lambda p: p.bull(4) & p.bull(3) & p.bull(2) & p.bull(1) & (p.c() < p.o(4)))
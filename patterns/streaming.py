@@ -0,0 +1,94 @@
+# patterns/streaming.py
+
+import numpy as np
+from .pattern_engine import Primitives
+from .registry import REGISTRY
+
+
+class _BarWindow(Primitives):
+    """
+    Primitivas sobre el buffer circular: o(k) es la vela de hace k barras.
+    Devuelve arrays de un elemento para que la aritmética (y el dtype) sea la
+    misma que la del motor por lotes; las velas aún no recibidas son NaN.
+    """
+
+    def __init__(self, buffers, pos):
+        self._buffers = buffers
+        self._pos = pos
+        self._size = len(buffers['c'])
+        self._cache = {}
+
+    def _bar(self, key, k):
+        i = (self._pos - k) % self._size
+        return self._buffers[key][i:i + 1]
+
+    def o(self, k=0):
+        return self._bar('o', k)
+
+    def h(self, k=0):
+        return self._bar('h', k)
+
+    def l(self, k=0):
+        return self._bar('l', k)
+
+    def c(self, k=0):
+        return self._bar('c', k)
+
+
+class StreamingPatternDetector:
+    """
+    Detector incremental para velas en vivo: mantiene las últimas velas en un
+    buffer circular (lookback máximo + 1, 5 con los patrones incluidos) y, en
+    cada push, evalúa los patrones que terminan en la vela recibida con las
+    mismas definiciones del registro que CandlestickPatterns.
+    """
+
+    def __init__(self, names=None, dtype=np.float64, registry=REGISTRY):
+        self.names = registry.names() if names is None else list(names)
+        self.dtype = np.dtype(dtype)
+        self.window = registry.max_lookback(self.names) + 1
+        definitions = [registry.get(name) for name in self.names]
+        self._activos = [(i, d.name, d.direction, d.predicate) for i, d in enumerate(definitions)
+                         if d.direction != 0]
+        self.reset()
+
+    def reset(self):
+        self._buffers = {key: np.full(self.window, np.nan, dtype=self.dtype) for key in 'ohlc'}
+        self._pos = -1
+        self.bars = 0
+        self.signals = np.zeros(len(self.names), dtype=np.int8)
+
+    @staticmethod
+    def _ohlc(bar):
+        # Acepta dict/Series con Open/High/Low/Close o una tupla (o, h, l, c)
+        if hasattr(bar, 'keys'):
+            return bar['Open'], bar['High'], bar['Low'], bar['Close']
+        return bar[0], bar[1], bar[2], bar[3]
+
+    def push(self, bar):
+        """
+        Añade una vela cerrada y devuelve {patrón: señal} con los patrones
+        completados en ella. self.signals guarda la señal int8 de todos.
+        """
+        self._pos = (self._pos + 1) % self.window
+        for key, value in zip('ohlc', self._ohlc(bar)):
+            self._buffers[key][self._pos] = value
+        self.bars += 1
+
+        window = _BarWindow(self._buffers, self._pos)
+        self.signals[:] = 0
+        detectados = {}
+        for i, name, direction, predicate in self._activos:
+            if predicate(window)[0]:
+                self.signals[i] = direction
+                detectados[name] = direction
+        return detectados
+
+    def replay(self, df):
+        """Reproduce un histórico vela a vela; devuelve la matriz int8 (patrones, velas)."""
+        ohlc = df[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=self.dtype)
+        out = np.zeros((len(self.names), len(ohlc)), dtype=np.int8)
+        for j, bar in enumerate(ohlc):
+            self.push(bar)
+            out[:, j] = self.signals
+        return out
@@ -1,7 +1,9 @@
+from typing import Union
 import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
 import pandas as pd
+from datastore import OHLCVStore
 
 
 class TradingEnv(gym.Env):
@@ -13,11 +15,14 @@ class TradingEnv(gym.Env):
 
     metadata = {"render.modes": ["human"]}
 
-    def __init__(self, df: pd.DataFrame, initial_balance: float = 10000):
+    def __init__(self, df: Union[pd.DataFrame, OHLCVStore], initial_balance: float = 10000):
         super(TradingEnv, self).__init__()
 
-        # Guardar dataset
-        self.df = df.reset_index(drop=True).copy()
+        # Guardar dataset (un OHLCVStore se usa sin copiar: vistas del fichero mapeado)
+        if isinstance(df, OHLCVStore):
+            self.df = df.to_frame(with_index=False)
+        else:
+            self.df = df.reset_index(drop=True).copy()
         self.n_steps = len(self.df)
         self.current_step = 0
 
@@ -13,7 +13,7 @@ setup(
     
     # Incluir archivos de datos importantes
     package_data={
-        '': ['*.csv', '*.pkl', '*.png'],
+        '': ['*.csv', '*.pkl', '*.feather', '*.png'],
     },
     include_package_data=True,
     
@@ -24,6 +24,7 @@ setup(
         "matplotlib==3.8.0",       # Gráficos básicos
         "mplfinance==0.12.10b0",   # Gráficos de velas
         "scikit-learn==1.3.0",     # Para análisis técnico futuro
+        "pyarrow==15.0.2",         # Almacén columnar de processed/
     ],
     
     # Scripts de consola
@@ -3,5 +3,15 @@
 from .strategies import ForexStrategies
 from .candle_strategies import CandleStrategies  # Si existe
 from .risk_manager import RiskManager, RiskManagerIntegration, Operacion
+from .indicators import IndicatorEngine, INDICATORS, data_version
+from .parameter_sweep import ParameterSweep
+from .ensemble import EnsembleRunner, EnsembleResult
+from .online_indicators import (OnlineEMA, OnlineRSI, OnlineRollingMax, OnlineRollingMin, OnlineADX,
+                                OnlineTrendFollowing, OnlineBreakout, OnlineRSIStrategy, OnlineADXStrategy)
+from .multi_timeframe import HTFInput, MultiTimeframe, MultiTimeframeStrategy, align_closed
 
-__all__ = ['ForexStrategies', 'CandleStrategies', 'RiskManager', 'RiskManagerIntegration', 'Operacion']
\ No newline at end of file
+__all__ = ['ForexStrategies', 'CandleStrategies', 'RiskManager', 'RiskManagerIntegration', 'Operacion',
+           'IndicatorEngine', 'INDICATORS', 'data_version', 'ParameterSweep', 'EnsembleRunner', 'EnsembleResult',
+           'OnlineEMA', 'OnlineRSI', 'OnlineRollingMax', 'OnlineRollingMin', 'OnlineADX',
+           'OnlineTrendFollowing', 'OnlineBreakout', 'OnlineRSIStrategy', 'OnlineADXStrategy',
+           'HTFInput', 'MultiTimeframe', 'MultiTimeframeStrategy', 'align_closed']
\ No newline at end of file
@@ -3,77 +3,192 @@
 import pandas as pd
 import numpy as np
 from patterns.candlestickpatterns import CandlestickPatterns
+from patterns.pattern_result import PatternResult
+from patterns.registry import REGISTRY
+from datastore import Resampler
+from .indicators import INDICATORS, data_version
+
+# Patrones que usa cada estrategia (None = todos, vía combined_signal_optimized).
+# EnsembleRunner los detecta todos en una sola pasada antes de ejecutarlas.
+PATTERN_DEPENDENCIES = {
+    'hammer_reversal': ['hammer'],
+    'bullish_engulfing_reversal': ['bullish_engulfing'],
+    'morning_star_swing': ['morning_star'],
+    'hanging_man_reversal': ['hanging_man'],
+    'bearish_engulfing_reversal': ['bearish_engulfing'],
+    'evening_star_swing': ['evening_star'],
+    'doji_indecision': ['doji'],
+    'add_indicators': [],
+    'marubozu_trend': [],
+    'three_white_soldiers': ['three_white_soldiers'],
+    'three_black_crows': ['three_black_crows'],
+    'scalping_reversal': ['hammer', 'bullish_engulfing'],
+    'swing_trading': ['morning_star', 'evening_star'],
+    'filter_with_trend': None,
+    'stop_loss_take_profit': None,
+}
 
 class CandleStrategies:
-    def __init__(self, data):
+    """
+    Estrategias basadas en patrones de velas.
+    Los patrones, las EMAs/ATR y las señales intermedias se memorizan en la
+    instancia: las estrategias compuestas (scalping_reversal, swing_trading,
+    filter_with_trend, stop_loss_take_profit) reutilizan lo ya calculado y
+    cada patrón se detecta una sola vez. La caché se invalida al asignar
+    self.data; si se modifican los datos in-place hay que reasignarlos.
+    """
+
+    def __init__(self, data, timeframe=None, resampler=None, engine=None):
         """
         data: DataFrame con columnas ['Open','High','Low','Close']
+        timeframe: opcional ('M5', 'H1', ...) para trabajar sobre velas agregadas
+        resampler: Resampler compartido para reutilizar las agregaciones cacheadas
+        engine: IndicatorEngine (por defecto el compartido INDICATORS)
         """
+        if timeframe is not None:
+            if resampler is None:
+                resampler = Resampler(data)
+            elif resampler.source is not data:
+                # Un Resampler compartido debe agregar estos datos, no los que tenía
+                resampler.update(data)
+            data = resampler.get(timeframe)
+        self.engine = engine if engine is not None else INDICATORS
         self.data = data.copy()
-        self.patterns = CandlestickPatterns(self.data)
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        # Datos nuevos: detector de patrones, versión y caché de la instancia desde cero
+        self._data = data
+        self.patterns = CandlestickPatterns(data)
+        self._version = None
+        self._cache = {}
+
+    def _data_version(self):
+        """Versión de self.data para la caché de indicadores (se calcula una vez)."""
+        if self._version is None:
+            self._version = data_version(self.data)
+        return self._version
+
+    def _cached(self, key, compute):
+        """
+        Resultado memoizado en la instancia. Entre hilos, en el peor caso, dos
+        hilos calculan la misma clave (el resultado es el mismo).
+        Los valores se comparten: no modificarlos in-place.
+        """
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _ema(self, span):
+        return self._cached(('ema', span), lambda: self.engine.ema(self.data, span, version=self._data_version()))
+
+    def _atr(self, period=14):
+        return self._cached(('atr', period), lambda: self.engine.atr(self.data, period, version=self._data_version()))
+
+    # ---------------- Patrones memoizados ----------------
+    def _pattern_rows(self, names):
+        """Filas int8 de los patrones; los que faltan se detectan juntos en una pasada."""
+        faltan = [name for name in names if ('pattern', name) not in self._cache]
+        if faltan:
+            faltan, matrix = self.patterns.detect_patterns_matrix(faltan)
+            for name, row in zip(faltan, matrix):
+                self._cache[('pattern', name)] = row
+        return [self._cache[('pattern', name)] for name in names]
+
+    def _pattern_frame(self, name):
+        """[Open, High, Low, Close, Signal] de un patrón, como CandlestickPatterns.<name>()."""
+        df = self.data[['Open','High','Low','Close']].copy()
+        df['Signal'] = self._pattern_rows([name])[0].astype(np.int64)
+        return df
+
+    def _pattern_result(self):
+        """PatternResult con todos los patrones del registro (reutiliza los ya detectados)."""
+        def calcular():
+            names = REGISTRY.names()
+            return PatternResult(names, np.stack(self._pattern_rows(names)), self.data.index)
+        return self._cached('pattern_result', calcular)
+
+    def _combined_signal(self):
+        """Final_Signal de combined_signal_optimized() (int64)."""
+        return self._cached('final_signal', lambda: self._pattern_result().final_signal().astype(np.int64))
+
+    def _combined_frame(self):
+        """Equivalente a self.patterns.combined_signal_optimized() sin volver a detectar."""
+        df = self._pattern_result().to_frame(self.data)
+        df['Final_Signal'] = self._combined_signal()
+        return df
+
+    def _filtered_signal(self, pattern, direction, span, below):
+        """
+        Señal del patrón en la dirección indicada solo si el cierre está por
+        debajo (below) o por encima de la EMA(span).
+        """
+        def calcular():
+            close = self.data['Close'].to_numpy()
+            ema = self._ema(span).to_numpy()
+            tendencia = close < ema if below else close > ema
+            return np.where((self._pattern_rows([pattern])[0] == direction) & tendencia, direction, 0)
+        return self._cached(('signal', pattern, direction, span, below), calcular)
 
     # ---------------- Utils ----------------
     def add_indicators(self):
         """Agrega indicadores de tendencia y volatilidad básicos"""
         df = self.data.copy()
-        df['EMA20'] = df['Close'].ewm(span=20).mean()
-        df['EMA50'] = df['Close'].ewm(span=50).mean()
-        df['ATR'] = (df['High'] - df['Low']).rolling(14).mean()
+        df['EMA20'] = self._ema(20)
+        df['EMA50'] = self._ema(50)
+        df['ATR'] = self._atr(14)
         return df
 
     # ---------------- Estrategias de reversión alcista ----------------
     def hammer_reversal(self):
         """Martillo en tendencia bajista"""
-        df = self.patterns.hammer()
-        df['EMA20'] = self.data['Close'].ewm(span=20).mean()
-        df['Signal'] = np.where((df['Signal'] == 1) & 
-                                (self.data['Close'] < df['EMA20']), 1, 0)
+        df = self._pattern_frame('hammer')
+        df['EMA20'] = self._ema(20)
+        df['Signal'] = self._filtered_signal('hammer', 1, 20, below=True)
         return df
 
     def bullish_engulfing_reversal(self):
         """Envolvente alcista en tendencia bajista"""
-        df = self.patterns.bullish_engulfing()
-        df['EMA20'] = self.data['Close'].ewm(span=20).mean()
-        df['Signal'] = np.where((df['Signal'] == 1) & 
-                                (self.data['Close'] < df['EMA20']), 1, 0)
+        df = self._pattern_frame('bullish_engulfing')
+        df['EMA20'] = self._ema(20)
+        df['Signal'] = self._filtered_signal('bullish_engulfing', 1, 20, below=True)
         return df
 
     def morning_star_swing(self):
         """Estrella de la mañana como señal swing (confirmada con 2 velas)"""
-        df = self.patterns.morning_star()
-        df['EMA50'] = self.data['Close'].ewm(span=50).mean()
-        df['Signal'] = np.where((df['Signal'] == 1) & 
-                                (self.data['Close'] > df['EMA50']), 1, 0)
+        df = self._pattern_frame('morning_star')
+        df['EMA50'] = self._ema(50)
+        df['Signal'] = self._filtered_signal('morning_star', 1, 50, below=False)
         return df
 
     # ---------------- Estrategias de reversión bajista ----------------
     def hanging_man_reversal(self):
-        df = self.patterns.hanging_man()
-        df['EMA20'] = self.data['Close'].ewm(span=20).mean()
-        df['Signal'] = np.where((df['Signal'] == -1) & 
-                                (self.data['Close'] > df['EMA20']), -1, 0)
+        df = self._pattern_frame('hanging_man')
+        df['EMA20'] = self._ema(20)
+        df['Signal'] = self._filtered_signal('hanging_man', -1, 20, below=False)
         return df
 
     def bearish_engulfing_reversal(self):
-        df = self.patterns.bearish_engulfing()
-        df['EMA20'] = self.data['Close'].ewm(span=20).mean()
-        df['Signal'] = np.where((df['Signal'] == -1) & 
-                                (self.data['Close'] > df['EMA20']), -1, 0)
+        df = self._pattern_frame('bearish_engulfing')
+        df['EMA20'] = self._ema(20)
+        df['Signal'] = self._filtered_signal('bearish_engulfing', -1, 20, below=False)
         return df
 
     def evening_star_swing(self):
-        df = self.patterns.evening_star()
-        df['EMA50'] = self.data['Close'].ewm(span=50).mean()
-        df['Signal'] = np.where((df['Signal'] == -1) & 
-                                (self.data['Close'] < df['EMA50']), -1, 0)
+        df = self._pattern_frame('evening_star')
+        df['EMA50'] = self._ema(50)
+        df['Signal'] = self._filtered_signal('evening_star', -1, 50, below=True)
         return df
 
     # ---------------- Estrategias de indecisión / continuación ----------------
     def doji_indecision(self):
-        df = self.patterns.doji()
+        df = self._pattern_frame('doji')
         df['Signal'] = np.where(df['Signal'] == 0, 0, 0)  # neutro
         return df
-
     def marubozu_trend(self):
         df = self.data.copy()
         df['Body'] = abs(df['Close'] - df['Open'])
@@ -86,35 +201,33 @@ class CandleStrategies:
 
     # ---------------- Estrategias de múltiples velas ----------------
     def three_white_soldiers(self):
-        df = self.patterns.three_white_soldiers()
-        return df
+        return self._pattern_frame('three_white_soldiers')
 
     def three_black_crows(self):
-        df = self.patterns.three_black_crows()
-        return df
+        return self._pattern_frame('three_black_crows')
 
     # ---------------- Estrategias de trading ----------------
     def scalping_reversal(self):
         """Scalping con hammer + engulfing en soportes"""
-        df_h = self.hammer_reversal()
-        df_e = self.bullish_engulfing_reversal()
+        hammer = self._filtered_signal('hammer', 1, 20, below=True)
+        engulfing = self._filtered_signal('bullish_engulfing', 1, 20, below=True)
         df = self.data.copy()
-        df['Signal'] = np.where((df_h['Signal'] == 1) | (df_e['Signal'] == 1), 1, 0)
+        df['Signal'] = np.where((hammer == 1) | (engulfing == 1), 1, 0)
         return df
 
     def swing_trading(self):
         """Swing con morning/evening star"""
-        df_m = self.morning_star_swing()
-        df_e = self.evening_star_swing()
+        morning = self._filtered_signal('morning_star', 1, 50, below=False)
+        evening = self._filtered_signal('evening_star', -1, 50, below=True)
         df = self.data.copy()
-        df['Signal'] = np.where(df_m['Signal'] == 1, 1, 
-                         np.where(df_e['Signal'] == -1, -1, 0))
+        df['Signal'] = np.where(morning == 1, 1, 
+                         np.where(evening == -1, -1, 0))
         return df
 
     def filter_with_trend(self):
         """Filtro combinado con EMA50"""
-        df = self.patterns.combined_signal_optimized()
-        df['EMA50'] = self.data['Close'].ewm(span=50).mean()
+        df = self._combined_frame()
+        df['EMA50'] = self._ema(50)
         df['Final_Signal'] = np.where((df['Final_Signal'] == 1) & (df['Close'] > df['EMA50']), 1,
                                np.where((df['Final_Signal'] == -1) & (df['Close'] < df['EMA50']), -1, 0))
         return df
@@ -122,7 +235,7 @@ class CandleStrategies:
     def stop_loss_take_profit(self, rr_ratio=2):
         """Calcula niveles SL y TP con ATR"""
         df = self.add_indicators()
-        df['Signal'] = self.patterns.combined_signal_optimized()['Final_Signal']
+        df['Signal'] = self._combined_signal()
         df['StopLoss'] = np.where(df['Signal'] == 1, df['Close'] - df['ATR'], 
                            np.where(df['Signal'] == -1, df['Close'] + df['ATR'], np.nan))
         df['TakeProfit'] = np.where(df['Signal'] == 1, df['Close'] + df['ATR']*rr_ratio,
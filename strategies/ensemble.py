@@ -0,0 +1,129 @@
+# strategies/ensemble.py
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+from .strategies import ForexStrategies
+from .candle_strategies import CandleStrategies, PATTERN_DEPENDENCIES
+from .indicators import INDICATORS
+from patterns.registry import REGISTRY
+
+TIPOS = ('forex', 'candle')
+
+
+class EnsembleResult:
+    """
+    Señales de varias estrategias sobre las mismas velas: matriz int8
+    (estrategias, velas) con 1/-1/0, más los DataFrames completos de cada
+    estrategia y los errores de las que no se pudieron ejecutar.
+    """
+
+    def __init__(self, names, signals, index, frames=None, errors=None):
+        self.names = list(names)
+        self.signals = signals
+        self.index = index
+        self.frames = frames or {}
+        self.errors = errors or {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, name):
+        return self.signals[self.names.index(name)]
+
+    def limit(self, max_signals):
+        """Copia con solo las max_signals primeras señales no nulas de cada estrategia."""
+        signals = self.signals.copy()
+        no_nulas = signals != 0
+        # Número de señales no nulas hasta cada vela (incluida) por estrategia
+        orden = np.cumsum(no_nulas, axis=1)
+        signals[no_nulas & (orden > max_signals)] = 0
+        return EnsembleResult(self.names, signals, self.index, self.frames, self.errors)
+
+    def to_frame(self, suffix='_Signal'):
+        """Columnas int64 '<estrategia><suffix>' sobre el índice de las velas."""
+        return pd.DataFrame({f"{name}{suffix}": row.astype(np.int64) for name, row in zip(self.names, self.signals)},
+                            index=self.index)
+
+
+class EnsembleRunner:
+    """
+    Ejecuta juntas varias estrategias de ForexStrategies y CandleStrategies:
+    - Una sola instancia de cada clase sobre los mismos datos, con un
+      IndicatorEngine compartido: cada EMA/ATR/RSI/ADX se calcula una vez
+      aunque lo pidan varias estrategias (o varios hilos a la vez).
+    - Los patrones de todas las estrategias de velas se detectan en una sola
+      pasada del motor de patrones (CandlestickPatterns.preload).
+    - Las estrategias independientes se ejecutan en un ThreadPoolExecutor
+      (NumPy/pandas liberan el GIL en los cálculos pesados).
+    """
+
+    def __init__(self, data, engine=None, max_workers=None):
+        self.engine = engine if engine is not None else INDICATORS
+        self.max_workers = max_workers
+        self.fx = ForexStrategies(data, engine=self.engine)
+        self.candle = CandleStrategies(data, engine=self.engine)
+
+    def _instancia(self, tipo):
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo de estrategia desconocido: {tipo}. Opciones: {list(TIPOS)}")
+        return self.fx if tipo == 'forex' else self.candle
+
+    def plan(self, strategies):
+        """
+        Normaliza la selección [(nombre, tipo, kwargs), ...] y calcula los
+        patrones que necesitan las estrategias de velas.
+        Devuelve (tareas válidas, patrones, errores {nombre: mensaje}).
+        """
+        tareas, errores, patrones = [], {}, {}
+        for nombre, tipo, kwargs in strategies:
+            try:
+                metodo = getattr(self._instancia(tipo), nombre, None)
+            except ValueError as e:
+                errores[nombre] = str(e)
+                continue
+            if nombre.startswith('_') or not callable(metodo):
+                errores[nombre] = f"Estrategia {'Forex' if tipo == 'forex' else 'Candle'} no encontrada: {nombre}"
+                continue
+            tareas.append((nombre, metodo, dict(kwargs or {})))
+            if tipo == 'candle':
+                dependencias = PATTERN_DEPENDENCIES.get(nombre)
+                patrones.update(dict.fromkeys(REGISTRY.names() if dependencias is None else dependencias))
+        return tareas, list(patrones), errores
+
+    def run(self, strategies):
+        """
+        strategies: [(nombre, tipo, kwargs), ...] con tipo 'forex' o 'candle'.
+        Devuelve un EnsembleResult con una fila por estrategia que produjo
+        columna Signal, en el orden de la selección.
+        """
+        tareas, patrones, errores = self.plan(strategies)
+
+        # Intermedios compartidos antes de lanzar los hilos
+        if patrones:
+            self.candle.patterns.preload(patrones)
+        self.fx._data_version()
+        self.candle._data_version()
+
+        def ejecutar(tarea):
+            nombre, metodo, kwargs = tarea
+            return metodo(**kwargs)
+
+        frames = {}
+        workers = self.max_workers or min(len(tareas), os.cpu_count() or 1) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [(tarea[0], pool.submit(ejecutar, tarea)) for tarea in tareas]
+            for nombre, future in futures:
+                try:
+                    frames[nombre] = future.result()
+                except Exception as e:
+                    errores[nombre] = f"{type(e).__name__}: {e}"
+
+        index = self.fx.data.index
+        names = [nombre for nombre, _, _ in tareas if nombre in frames and 'Signal' in frames[nombre].columns]
+        signals = np.zeros((len(names), len(index)), dtype=np.int8)
+        for i, nombre in enumerate(names):
+            signals[i] = frames[nombre]['Signal'].reindex(index, fill_value=0).to_numpy()
+        return EnsembleResult(names, signals, index, frames, errores)
@@ -0,0 +1,157 @@
+# strategies/indicators.py
+
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+COLUMNAS_VERSION = ('Open', 'High', 'Low', 'Close')
+
+
+def data_version(data: pd.DataFrame):
+    """
+    Huella del contenido de los datos (índice + OHLC): dos DataFrames con las
+    mismas velas comparten versión aunque sean copias distintas, así que
+    ForexStrategies, CandleStrategies y ForexBacktester reutilizan los mismos
+    indicadores. Cuesta ~10 ms por columna y millón de velas: se calcula una vez
+    por instancia.
+    """
+    h = hashlib.sha1()
+    h.update(np.ascontiguousarray(data.index.asi8 if isinstance(data.index, pd.DatetimeIndex)
+                                  else np.arange(len(data))).data)
+    for col in COLUMNAS_VERSION:
+        if col in data.columns:
+            values = np.ascontiguousarray(data[col].to_numpy())
+            h.update(col.encode())
+            h.update(values.dtype.str.encode())
+            h.update(values.data)
+    return (len(data), h.hexdigest())
+
+
+class IndicatorEngine:
+    """
+    Indicadores memoizados por (indicador, parámetros, versión de datos) en una
+    caché LRU limitada por max_bytes. Es seguro entre hilos y cada clave se
+    calcula una sola vez aunque la pidan varios hilos a la vez.
+    Los resultados se comparten: no modificarlos in-place.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()  # clave -> (resultado, bytes)
+        self._pending = {}           # clave -> Lock del cálculo en curso
+        self._resident = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def resident_bytes(self):
+        return self._resident
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._resident = 0
+
+    def get(self, name, params, version, compute):
+        """Devuelve el indicador memoizado o lo calcula con compute()."""
+        key = (name, params, version)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key][0]
+            key_lock = self._pending.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._cache:  # lo calculó otro hilo mientras esperábamos
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return self._cache[key][0]
+            try:
+                value = compute()
+                nbytes = int(value.memory_usage(index=False).sum()) if isinstance(value, pd.DataFrame) \
+                    else int(value.memory_usage(index=False))
+                with self._lock:
+                    self.misses += 1
+                    self._cache[key] = (value, nbytes)
+                    self._resident += nbytes
+                    # Expulsar las menos usadas recientemente (nunca la recién calculada)
+                    while self._resident > self.max_bytes and len(self._cache) > 1:
+                        _, (_, liberados) = self._cache.popitem(last=False)
+                        self._resident -= liberados
+            finally:
+                # Aunque compute() falle, el lock de la clave no debe quedarse en _pending
+                with self._lock:
+                    self._pending.pop(key, None)
+        return value
+
+    # ---------------- Indicadores ----------------
+    def ema(self, data, span, adjust=True, column='Close', version=None):
+        """Media exponencial: data[column].ewm(span, adjust).mean()."""
+        version = version or data_version(data)
+        return self.get('ema', (column, span, adjust), version,
+                        lambda: data[column].ewm(span=span, adjust=adjust).mean())
+
+    def atr(self, data, period=14, version=None):
+        """ATR simplificado del proyecto: media móvil de (High - Low)."""
+        version = version or data_version(data)
+        return self.get('atr', (period,), version,
+                        lambda: (data['High'] - data['Low']).rolling(period).mean())
+
+    def rolling_max(self, data, window, column='High', version=None):
+        version = version or data_version(data)
+        return self.get('rolling_max', (column, window), version,
+                        lambda: data[column].rolling(window).max())
+
+    def rolling_min(self, data, window, column='Low', version=None):
+        version = version or data_version(data)
+        return self.get('rolling_min', (column, window), version,
+                        lambda: data[column].rolling(window).min())
+
+    def rsi(self, data, period=14, column='Close', version=None):
+        """RSI de Wilder (medias exponenciales con alpha = 1/period)."""
+        version = version or data_version(data)
+
+        def calcular():
+            delta = data[column].diff()
+            gain = delta.where(delta > 0, 0.0)
+            loss = -delta.where(delta < 0, 0.0)
+            avg_gain = gain.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
+            avg_loss = loss.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
+            rs = avg_gain / avg_loss.replace(0, np.nan)
+            return 100 - (100 / (1 + rs))
+
+        return self.get('rsi', (column, period), version, calcular)
+
+    def adx(self, data, period=14, version=None):
+        """DataFrame con DIplus, DIminus y ADX (suavizado con medias móviles simples)."""
+        version = version or data_version(data)
+
+        def calcular():
+            high, low, close = data['High'], data['Low'], data['Close']
+            prev_close = close.shift(1)
+            up = high - high.shift(1)
+            down = low.shift(1) - low
+            tr = np.maximum(high - low, np.maximum(abs(high - prev_close), abs(low - prev_close)))
+            dm_plus = pd.Series(np.where(up > down, np.maximum(up, 0), 0), index=data.index)
+            dm_minus = pd.Series(np.where(down > up, np.maximum(down, 0), 0), index=data.index)
+            tr_smooth = tr.rolling(period).mean()
+            out = pd.DataFrame(index=data.index)
+            out['DIplus'] = (dm_plus.rolling(period).mean() / tr_smooth) * 100
+            out['DIminus'] = (dm_minus.rolling(period).mean() / tr_smooth) * 100
+            dx = (abs(out['DIplus'] - out['DIminus']) / (out['DIplus'] + out['DIminus'])) * 100
+            out['ADX'] = dx.rolling(period).mean()
+            return out
+
+        return self.get('adx', (period,), version, calcular)
+
+
+# Motor compartido por defecto por todas las estrategias y el backtester
+INDICATORS = IndicatorEngine()
@@ -0,0 +1,165 @@
+# strategies/multi_timeframe.py
+
+import numpy as np
+import pandas as pd
+
+from datastore import OHLCVStore, Resampler, TIMEFRAMES
+from .indicators import INDICATORS, data_version
+from .strategies import ForexStrategies
+
+# Indicador -> método de IndicatorEngine ('close' es el cierre de la vela superior)
+INDICADORES_HTF = ('close', 'ema', 'atr', 'rsi', 'rolling_max', 'rolling_min', 'adx')
+
+
+class HTFInput:
+    """
+    Declaración de una entrada de timeframe superior: indicador del
+    IndicatorEngine calculado sobre las velas agregadas a timeframe.
+    Ejemplos: HTFInput('H1', 'ema', span=50), HTFInput('H4', 'adx', period=14, output='ADX').
+    """
+
+    def __init__(self, timeframe, indicator='close', name=None, **params):
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Timeframe desconocido: {timeframe}. Opciones: {list(TIMEFRAMES)}")
+        if indicator not in INDICADORES_HTF:
+            raise ValueError(f"Indicador no soportado: {indicator}. Opciones: {list(INDICADORES_HTF)}")
+        self.timeframe = timeframe
+        self.indicator = indicator
+        self.params = params
+        sufijo = ''.join(str(v) for v in params.values())
+        self.name = name or f"{timeframe}_{indicator.upper()}{sufijo}"
+
+    @property
+    def key(self):
+        return (self.timeframe, self.indicator, tuple(sorted(self.params.items())))
+
+    def __repr__(self):
+        params = ', '.join(f"{k}={v!r}" for k, v in self.params.items())
+        return f"HTFInput({self.timeframe!r}, {self.indicator!r}{', ' + params if params else ''})"
+
+
+def align_closed(values, htf_index, htf_timeframe, base_index, base_timeframe='M1'):
+    """
+    Alinea valores de velas superiores con las velas base sin lookahead
+    (as-of hacia atrás sobre horas de cierre): la vela superior etiquetada T
+    cierra en T + duración y la vela base t en t + duración base; la vela base
+    solo ve el último valor cuya vela superior cerró en o antes de su cierre.
+    Las velas base anteriores al primer cierre quedan a NaN.
+    """
+    cierre_htf = htf_index.asi8 + pd.Timedelta(TIMEFRAMES[htf_timeframe]).value
+    cierre_base = base_index.asi8 + pd.Timedelta(TIMEFRAMES[base_timeframe]).value
+    pos = np.searchsorted(cierre_htf, cierre_base, side='right') - 1
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(base_index), np.nan)
+    validas = pos >= 0
+    out[validas] = values[pos[validas]]
+    return out
+
+
+class MultiTimeframe:
+    """
+    Contexto de timeframes superiores para estrategias sobre velas base:
+    agrega con un Resampler (caché por timeframe), calcula los indicadores con
+    el IndicatorEngine y alinea cada entrada con align_closed. Cada entrada se
+    calcula una sola vez por contexto: varias estrategias que comparten el
+    mismo contexto H1/H4 (o el mismo Resampler y engine) no repiten trabajo.
+    """
+
+    def __init__(self, data, base_timeframe='M1', resampler=None, engine=None):
+        if base_timeframe not in TIMEFRAMES:
+            raise ValueError(f"Timeframe desconocido: {base_timeframe}. Opciones: {list(TIMEFRAMES)}")
+        self.base_timeframe = base_timeframe
+        self.engine = engine if engine is not None else INDICATORS
+        if resampler is None:
+            resampler = Resampler(data)
+        elif resampler.source is not data:
+            resampler.update(data)
+        self.resampler = resampler
+        self.index = data.index if isinstance(data, OHLCVStore) else data.sort_index().index
+        self._aligned = {}   # HTFInput.key -> array alineado (float64, velas base)
+        self._versions = {}  # timeframe -> (velas agregadas, versión)
+
+    def _htf(self, timeframe):
+        if timeframe not in self._versions:
+            htf = self.resampler.get(timeframe)
+            self._versions[timeframe] = (htf, data_version(htf))
+        return self._versions[timeframe]
+
+    def _compute(self, inp):
+        htf, version = self._htf(inp.timeframe)
+        if inp.indicator == 'close':
+            values = htf['Close']
+        elif inp.indicator == 'adx':
+            params = dict(inp.params)
+            output = params.pop('output', 'ADX')
+            values = self.engine.adx(htf, version=version, **params)[output]
+        else:
+            values = getattr(self.engine, inp.indicator)(htf, version=version, **inp.params)
+        return align_closed(values.to_numpy(), htf.index, inp.timeframe, self.index, self.base_timeframe)
+
+    def get(self, inp) -> np.ndarray:
+        """Valores de la entrada alineados con las velas base (compartidos: no modificar)."""
+        if inp.key not in self._aligned:
+            self._aligned[inp.key] = self._compute(inp)
+        return self._aligned[inp.key]
+
+    def frame(self, inputs) -> pd.DataFrame:
+        """DataFrame con una columna por entrada (HTFInput.name) sobre el índice base."""
+        return pd.DataFrame({inp.name: self.get(inp) for inp in inputs}, index=self.index)
+
+
+def trend_rule(df, inputs):
+    """
+    Filtro de tendencia superior: mantiene las compras solo con el cierre por
+    encima de todas las entradas y las ventas solo por debajo.
+    """
+    close = df['Close'].to_numpy()
+    signal = df['Signal'].to_numpy()
+    alcista = np.ones(len(df), dtype=bool)
+    bajista = np.ones(len(df), dtype=bool)
+    for inp in inputs:
+        nivel = df[inp.name].to_numpy()
+        alcista &= close > nivel
+        bajista &= close < nivel
+    return np.where((signal > 0) & alcista, signal, np.where((signal < 0) & bajista, signal, 0))
+
+
+class MultiTimeframeStrategy:
+    """
+    Estrategia base (p.ej. ForexStrategies(...).trend_following) con entradas
+    de timeframe superior declaradas y una regla que filtra su Signal:
+        mtf = MultiTimeframe(df_m1)
+        estrategia = MultiTimeframeStrategy(fs.trend_following, [HTFInput('H1', 'ema', span=50)], mtf)
+        df = estrategia(short_window=20)
+    El resultado incluye una columna por entrada y la señal sin filtrar en
+    Raw_Signal. rule(df, inputs) devuelve la nueva señal (trend_rule por defecto).
+    En las salidas de ForexStrategies las señales anuladas pierden StopLoss,
+    TakeProfit y PositionSize, y ExecSignal/Position se recalculan.
+    """
+
+    def __init__(self, strategy, inputs, context, rule=trend_rule):
+        self.strategy = strategy
+        self.inputs = list(inputs)
+        self.context = context
+        self.rule = rule
+
+    def __call__(self, **kwargs):
+        df = self.strategy(**kwargs)
+        if 'Signal' not in df.columns:
+            raise ValueError("La estrategia no devuelve columna Signal")
+        if not df.index.equals(self.context.index):
+            raise ValueError("La estrategia y el contexto MultiTimeframe deben usar las mismas velas base")
+        for inp in self.inputs:
+            df[inp.name] = self.context.get(inp)
+        raw = df['Signal'].to_numpy()
+        signal = self.rule(df, self.inputs).astype(raw.dtype)
+        df['Raw_Signal'] = raw
+        df['Signal'] = signal
+
+        anuladas = (raw != 0) & (signal == 0)
+        for col, vacio in (('StopLoss', np.nan), ('TakeProfit', np.nan), ('PositionSize', 0)):
+            if col in df.columns:
+                df.loc[anuladas, col] = vacio
+        if 'ExecSignal' in df.columns:
+            ForexStrategies._attach_execution(df, kwargs.get('exec_lag', 1))
+        return df
@@ -0,0 +1,387 @@
+# strategies/online_indicators.py
+
+import math
+from collections import deque
+import numpy as np
+
+
+class OnlineEWM:
+    """
+    Media exponencial incremental con la misma recurrencia que
+    Series.ewm(...).mean() (ignore_na=False): O(1) por valor.
+    Se indica com, span o alpha como en pandas.
+    """
+
+    def __init__(self, com=None, span=None, alpha=None, adjust=True, min_periods=0):
+        if span is not None:
+            com = (span - 1) / 2.0
+        elif alpha is not None:
+            com = 1.0 / alpha - 1.0
+        if com is None:
+            raise ValueError("Hay que indicar com, span o alpha")
+        # alpha se deriva de com igual que en pandas (puede diferir en el último bit de 1/period)
+        self.alpha = 1.0 / (1.0 + com)
+        self.adjust = adjust
+        self.min_periods = max(int(min_periods), 1)
+        self.reset()
+
+    def reset(self):
+        self.value = math.nan
+        self._weighted = math.nan
+        self._old_wt = 1.0
+        self._nobs = 0
+
+    def push(self, x):
+        x = float(x)
+        observado = x == x
+        self._nobs += observado
+        if self._weighted == self._weighted:
+            self._old_wt *= 1.0 - self.alpha
+            if observado:
+                new_wt = 1.0 if self.adjust else self.alpha
+                if self._weighted != x:
+                    self._weighted = (self._old_wt * self._weighted + new_wt * x) / (self._old_wt + new_wt)
+                self._old_wt = self._old_wt + new_wt if self.adjust else 1.0
+        elif observado:
+            self._weighted = x
+        self.value = self._weighted if self._nobs >= self.min_periods else math.nan
+        return self.value
+
+
+class OnlineEMA(OnlineEWM):
+    """EMA incremental: equivale a Series.ewm(span=span, adjust=adjust).mean()."""
+
+    def __init__(self, span, adjust=True):
+        super().__init__(span=span, adjust=adjust)
+        self.span = span
+
+
+class OnlineRollingMean:
+    """
+    Media móvil incremental de ventana fija (Series.rolling(window).mean()):
+    suma con compensación de Kahan (una para las entradas y otra para las
+    salidas, como pandas) al entrar y salir cada valor, ignorando
+    NaN; devuelve NaN mientras haya menos de min_periods valores en la ventana.
+    """
+
+    def __init__(self, window, min_periods=None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.reset()
+
+    def reset(self):
+        self.value = math.nan
+        self._values = deque()
+        self._sum = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._nobs = 0
+        self._neg = 0
+        self._prev = math.nan
+        self._iguales = 0
+
+    def _add(self, x):
+        if x == x:
+            self._nobs += 1
+            y = x - self._comp_add
+            t = self._sum + y
+            self._comp_add = t - self._sum - y
+            self._sum = t
+            self._neg += math.copysign(1.0, x) < 0
+            self._iguales = self._iguales + 1 if x == self._prev else 1
+            self._prev = x
+
+    def _remove(self, x):
+        if x == x:
+            self._nobs -= 1
+            y = -x - self._comp_remove
+            t = self._sum + y
+            self._comp_remove = t - self._sum - y
+            self._sum = t
+            self._neg -= math.copysign(1.0, x) < 0
+
+    def push(self, x):
+        x = float(x)
+        if len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(x)
+        self._add(x)
+        if self._nobs >= self.min_periods and self._nobs > 0:
+            mean = self._sum / self._nobs
+            # Mismas correcciones que pandas para ventanas constantes o de un solo signo
+            if self._iguales >= self._nobs:
+                mean = self._prev
+            elif self._neg == 0 and mean < 0:
+                mean = 0.0
+            elif self._neg == self._nobs and mean > 0:
+                mean = 0.0
+            self.value = mean
+        else:
+            self.value = math.nan
+        return self.value
+
+
+class _OnlineRollingExtreme:
+    """Máximo/mínimo móvil con una deque monótona: O(1) amortizado por valor."""
+
+    def __init__(self, window, min_periods=None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.reset()
+
+    def reset(self):
+        self.value = math.nan
+        self._deque = deque()    # (posición, valor) con valores monótonos
+        self._validos = deque()  # posiciones de los valores no NaN de la ventana
+        self._i = -1
+
+    def _domina(self, a, b):
+        raise NotImplementedError
+
+    def push(self, x):
+        x = float(x)
+        self._i += 1
+        inicio = self._i - self.window + 1
+        while self._deque and self._deque[0][0] < inicio:
+            self._deque.popleft()
+        while self._validos and self._validos[0] < inicio:
+            self._validos.popleft()
+        if x == x:
+            while self._deque and not self._domina(self._deque[-1][1], x):
+                self._deque.pop()
+            self._deque.append((self._i, x))
+            self._validos.append(self._i)
+        ok = len(self._validos) >= self.min_periods and self._validos
+        self.value = self._deque[0][1] if ok else math.nan
+        return self.value
+
+
+class OnlineRollingMax(_OnlineRollingExtreme):
+    """Máximo móvil incremental (Series.rolling(window).max())."""
+
+    def _domina(self, a, b):
+        return a > b
+
+
+class OnlineRollingMin(_OnlineRollingExtreme):
+    """Mínimo móvil incremental (Series.rolling(window).min())."""
+
+    def _domina(self, a, b):
+        return a < b
+
+
+class OnlineRSI:
+    """RSI de Wilder incremental, igual que IndicatorEngine.rsi."""
+
+    def __init__(self, period=14):
+        self.period = period
+        self._gain = OnlineEWM(alpha=1 / period, min_periods=period, adjust=False)
+        self._loss = OnlineEWM(alpha=1 / period, min_periods=period, adjust=False)
+        self.reset()
+
+    def reset(self):
+        self.value = math.nan
+        self._prev = math.nan
+        self._gain.reset()
+        self._loss.reset()
+
+    def push(self, close):
+        close = float(close)
+        delta = close - self._prev
+        self._prev = close
+        # where(delta > 0, 0.0): el delta NaN de la primera vela cuenta como 0
+        avg_gain = self._gain.push(delta if delta > 0 else 0.0)
+        avg_loss = self._loss.push(-delta if delta < 0 else 0.0)
+        if avg_loss == 0 or avg_loss != avg_loss or avg_gain != avg_gain:
+            self.value = math.nan
+        else:
+            self.value = 100 - (100 / (1 + avg_gain / avg_loss))
+        return self.value
+
+
+class OnlineADX:
+    """
+    DI+, DI- y ADX incrementales con el mismo cálculo que IndicatorEngine.adx
+    (True Range y movimientos direccionales suavizados con medias simples).
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self._tr = OnlineRollingMean(period)
+        self._dm_plus = OnlineRollingMean(period)
+        self._dm_minus = OnlineRollingMean(period)
+        self._dx = OnlineRollingMean(period)
+        self.reset()
+
+    def reset(self):
+        self.di_plus = self.di_minus = self.value = math.nan
+        self._prev = None
+        for media in (self._tr, self._dm_plus, self._dm_minus, self._dx):
+            media.reset()
+
+    def push(self, high, low, close):
+        high, low, close = float(high), float(low), float(close)
+        if self._prev is None:
+            prev_high = prev_low = prev_close = math.nan
+        else:
+            prev_high, prev_low, prev_close = self._prev
+        self._prev = (high, low, close)
+
+        up = high - prev_high
+        down = prev_low - low
+        # np.maximum propaga NaN: la primera vela no tiene True Range
+        tr = _nanmax(high - low, _nanmax(abs(high - prev_close), abs(low - prev_close)))
+        dm_plus = _nanmax(up, 0.0) if up > down else 0.0
+        dm_minus = _nanmax(down, 0.0) if down > up else 0.0
+
+        tr_smooth = self._tr.push(tr)
+        self.di_plus = _div(self._dm_plus.push(dm_plus), tr_smooth) * 100
+        self.di_minus = _div(self._dm_minus.push(dm_minus), tr_smooth) * 100
+        dx = _div(abs(self.di_plus - self.di_minus), self.di_plus + self.di_minus) * 100
+        self.value = self._dx.push(dx)
+        return self.di_plus, self.di_minus, self.value
+
+
+def _nanmax(a, b):
+    """np.maximum para escalares: NaN si alguno es NaN."""
+    if a != a or b != b:
+        return math.nan
+    return a if a >= b else b
+
+
+def _div(a, b):
+    """División con la semántica de NumPy (x/0 = ±inf, 0/0 = NaN) en lugar de ZeroDivisionError."""
+    if b == 0:
+        if a != a or a == 0:
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+# ---------------- Estrategias incrementales ----------------
+class _OnlineStrategy:
+    """
+    Base de las versiones incrementales de ForexStrategies: push(bar) recibe una
+    vela cerrada (dict/Series con Open/High/Low/Close o tupla (o, h, l, c)) y
+    devuelve la señal (1, -1, 0) de esa vela con la misma lógica que la columna
+    Signal del método por lotes. self.values guarda los indicadores de la vela.
+    """
+
+    def reset(self):
+        raise NotImplementedError
+
+    @staticmethod
+    def _ohlc(bar):
+        if hasattr(bar, 'keys'):
+            return bar['Open'], bar['High'], bar['Low'], bar['Close']
+        return bar[0], bar[1], bar[2], bar[3]
+
+    def push(self, bar):
+        raise NotImplementedError
+
+    def replay(self, df):
+        """Reproduce un histórico vela a vela; devuelve las señales (int64, una por vela)."""
+        ohlc = df[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float64)
+        out = np.zeros(len(ohlc), dtype=np.int64)
+        for j, bar in enumerate(ohlc):
+            out[j] = self.push(bar)
+        return out
+
+
+class OnlineTrendFollowing(_OnlineStrategy):
+    """Cruce de EMAs (adjust=False): 1 al cruzar al alza, -1 a la baja."""
+
+    def __init__(self, short_window=20, long_window=50):
+        self._short = OnlineEMA(short_window, adjust=False)
+        self._long = OnlineEMA(long_window, adjust=False)
+        self.reset()
+
+    def reset(self):
+        self._short.reset()
+        self._long.reset()
+        self._cond = False
+        self.signal = 0
+        self.values = {}
+
+    def push(self, bar):
+        close = self._ohlc(bar)[3]
+        ema_short, ema_long = self._short.push(close), self._long.push(close)
+        cond = ema_short > ema_long
+        self.signal = 1 if cond and not self._cond else -1 if self._cond and not cond else 0
+        self._cond = cond
+        self.values = {'EMA_short': ema_short, 'EMA_long': ema_long}
+        return self.signal
+
+
+class OnlineBreakout(_OnlineStrategy):
+    """Ruptura del máximo/mínimo de las window velas anteriores."""
+
+    def __init__(self, window=20):
+        self._max = OnlineRollingMax(window)
+        self._min = OnlineRollingMin(window)
+        self.reset()
+
+    def reset(self):
+        self._max.reset()
+        self._min.reset()
+        self.signal = 0
+        self.values = {}
+
+    def push(self, bar):
+        _, high, low, close = self._ohlc(bar)
+        # Niveles de la vela anterior (shift(1)), antes de incluir la actual
+        high_max, low_min = self._max.value, self._min.value
+        self._max.push(high)
+        self._min.push(low)
+        self.signal = -1 if close < low_min else 1 if close > high_max else 0
+        self.values = {'High_Max': high_max, 'Low_Min': low_min}
+        return self.signal
+
+
+class OnlineRSIStrategy(_OnlineStrategy):
+    """RSI que cruza hacia sobreventa (1) o sobrecompra (-1)."""
+
+    def __init__(self, period=14, overbought=70, oversold=30):
+        self.overbought = overbought
+        self.oversold = oversold
+        self._rsi = OnlineRSI(period)
+        self.reset()
+
+    def reset(self):
+        self._rsi.reset()
+        self.signal = 0
+        self.values = {}
+
+    def push(self, bar):
+        prev = self._rsi.value
+        rsi = self._rsi.push(self._ohlc(bar)[3])
+        if rsi > self.overbought and prev <= self.overbought:
+            self.signal = -1
+        elif rsi < self.oversold and prev >= self.oversold:
+            self.signal = 1
+        else:
+            self.signal = 0
+        self.values = {'RSI': rsi}
+        return self.signal
+
+
+class OnlineADXStrategy(_OnlineStrategy):
+    """DI+ / DI- con ADX por encima del umbral."""
+
+    def __init__(self, adx_period=14, adx_threshold=25):
+        self.adx_threshold = adx_threshold
+        self._adx = OnlineADX(adx_period)
+        self.reset()
+
+    def reset(self):
+        self._adx.reset()
+        self.signal = 0
+        self.values = {}
+
+    def push(self, bar):
+        _, high, low, close = self._ohlc(bar)
+        di_plus, di_minus, adx = self._adx.push(high, low, close)
+        tendencia = adx > self.adx_threshold
+        self.signal = -1 if di_minus > di_plus and tendencia else 1 if di_plus > di_minus and tendencia else 0
+        self.values = {'DIplus': di_plus, 'DIminus': di_minus, 'ADX': adx}
+        return self.signal
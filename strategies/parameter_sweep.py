@@ -0,0 +1,192 @@
+# strategies/parameter_sweep.py
+
+import itertools
+import numpy as np
+import pandas as pd
+
+from datastore import OHLCVStore
+from .indicators import INDICATORS, data_version
+
+
+def _shift_bars(matrix, k, fill):
+    """Desplaza k velas hacia delante una matriz (combinaciones, velas)."""
+    out = np.empty_like(matrix)
+    out[:, :k] = fill
+    out[:, k:] = matrix[:, :-k]
+    return out
+
+
+def _hold_position(signals):
+    """
+    Posición mantenida por fila: último valor no nulo de la señal hasta la vela
+    actual (equivale a replace(0, nan).ffill().fillna(0) por combinación).
+    """
+    n = signals.shape[1]
+    ultimo = np.where(signals != 0, np.arange(n, dtype=np.int32), np.int32(0))
+    np.maximum.accumulate(ultimo, axis=1, out=ultimo)
+    # Antes de la primera señal el índice es 0 y signals[:, 0] es 0 o la propia señal
+    return np.take_along_axis(signals, ultimo, axis=1)
+
+
+class ParameterSweep:
+    """
+    Barrido vectorizado de parámetros de ForexStrategies: cada combinación es
+    una serie de una matriz 2-D y las señales se calculan con operaciones de
+    NumPy por bloques de combinaciones (cada matriz float64 del bloque ocupa como
+    máximo block_bytes). Internamente la matriz es (combinaciones, velas) para
+    que cumsum/accumulate recorran memoria contigua. Los indicadores de cada
+    valor único de parámetro se piden una sola vez al IndicatorEngine compartido.
+
+    Métricas por combinación (retorno de la vela t con la posición de t-1):
+    buys, sells, trades, exposure, total_return, mean_return, sharpe,
+    win_rate y max_drawdown (sobre la suma acumulada de retornos).
+    """
+
+    STRATEGIES = ('trend_following', 'breakout', 'rsi_strategy', 'adx_strategy')
+
+    def __init__(self, data, engine=None, exec_lag=1, block_bytes=256 * 1024 ** 2):
+        self.data = data.to_frame() if isinstance(data, OHLCVStore) else data.sort_index()
+        self.engine = engine if engine is not None else INDICATORS
+        self.exec_lag = exec_lag
+        self.block_bytes = block_bytes
+        self._version = data_version(self.data)
+        close = self.data['Close'].to_numpy(dtype=np.float64)
+        self._close = close
+        self._returns = np.zeros(len(close))
+        self._returns[1:] = close[1:] / close[:-1] - 1.0
+
+    # ---------------- API ----------------
+    def run(self, strategy, grid):
+        """
+        Evalúa todas las combinaciones de grid ({parámetro: valores}) para una
+        estrategia y devuelve una tabla con una fila por combinación.
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Estrategia no soportada: {strategy}. Opciones: {list(self.STRATEGIES)}")
+        nombres = list(grid)
+        combos = list(itertools.product(*(list(grid[p]) for p in nombres)))
+        filas = []
+        for bloque in self._blocks(combos):
+            params = [dict(zip(nombres, c)) for c in bloque]
+            signals = getattr(self, f"_signals_{strategy}")(params)
+            metricas = self._metrics(signals)
+            for j, p in enumerate(params):
+                fila = {'strategy': strategy, **p}
+                fila.update({k: v[j] for k, v in metricas.items()})
+                filas.append(fila)
+        return pd.DataFrame(filas)
+
+    def trend_following(self, short_window=(20,), long_window=(50,)):
+        return self.run('trend_following', {'short_window': short_window, 'long_window': long_window})
+
+    def breakout(self, window=(20,)):
+        return self.run('breakout', {'window': window})
+
+    def rsi_strategy(self, period=(14,), overbought=(70,), oversold=(30,)):
+        return self.run('rsi_strategy', {'period': period, 'overbought': overbought, 'oversold': oversold})
+
+    def adx_strategy(self, adx_period=(14,), adx_threshold=(25,)):
+        return self.run('adx_strategy', {'adx_period': adx_period, 'adx_threshold': adx_threshold})
+
+    def signals(self, strategy, **params):
+        """Señal (velas,) de una sola combinación, por el mismo camino que run()."""
+        return getattr(self, f"_signals_{strategy}")([params])[0]
+
+    def pnl(self, strategy, **params):
+        """
+        Retorno por vela (velas,) de una sola combinación: el de la vela t con
+        la posición mantenida al cierre de t-1, como en las métricas de run().
+        """
+        _, previa = self._positions(getattr(self, f"_signals_{strategy}")([params]))
+        return (previa * self._returns)[0]
+
+    # ---------------- Señales 2-D ----------------
+    def _blocks(self, combos):
+        # Matrices float64 (bloque, velas) dentro del presupuesto de memoria
+        tam = max(1, self.block_bytes // (8 * max(len(self._close), 1)))
+        for i in range(0, len(combos), tam):
+            yield combos[i:i + tam]
+
+    def _columns(self, compute, valores):
+        """Matriz (combinaciones, velas) con el indicador de cada valor (uno por valor único)."""
+        unicos = {v: compute(v) for v in dict.fromkeys(valores)}
+        return np.stack([unicos[v] for v in valores])
+
+    def _signals_trend_following(self, params):
+        ema = lambda span: self.engine.ema(self.data, span, adjust=False, version=self._version).to_numpy()
+        cond = self._columns(ema, [p['short_window'] for p in params]) > \
+            self._columns(ema, [p['long_window'] for p in params])
+        prev = _shift_bars(cond, 1, False)
+        signals = np.zeros(cond.shape, dtype=np.int8)
+        signals[cond & ~prev] = 1
+        signals[~cond & prev] = -1
+        return signals
+
+    def _signals_breakout(self, params):
+        ventanas = [p['window'] for p in params]
+        hmax = self._columns(lambda w: self.engine.rolling_max(self.data, w, version=self._version).to_numpy(), ventanas)
+        lmin = self._columns(lambda w: self.engine.rolling_min(self.data, w, version=self._version).to_numpy(), ventanas)
+        close = self._close[None, :]
+        signals = np.zeros(hmax.shape, dtype=np.int8)
+        signals[close > _shift_bars(hmax, 1, np.nan)] = 1
+        signals[close < _shift_bars(lmin, 1, np.nan)] = -1
+        return signals
+
+    def _signals_rsi_strategy(self, params):
+        rsi = self._columns(lambda p: self.engine.rsi(self.data, p, version=self._version).to_numpy(),
+                            [p['period'] for p in params])
+        prev = _shift_bars(rsi, 1, np.nan)
+        oversold = np.array([p['oversold'] for p in params])[:, None]
+        overbought = np.array([p['overbought'] for p in params])[:, None]
+        signals = np.zeros(rsi.shape, dtype=np.int8)
+        signals[(rsi < oversold) & (prev >= oversold)] = 1
+        signals[(rsi > overbought) & (prev <= overbought)] = -1
+        return signals
+
+    def _signals_adx_strategy(self, params):
+        periodos = [p['adx_period'] for p in params]
+        adx = lambda col: self._columns(
+            lambda p: self.engine.adx(self.data, p, version=self._version)[col].to_numpy(), periodos)
+        di_plus, di_minus, fuerza = adx('DIplus'), adx('DIminus'), adx('ADX')
+        tendencia = fuerza > np.array([p['adx_threshold'] for p in params])[:, None]
+        signals = np.zeros(fuerza.shape, dtype=np.int8)
+        signals[(di_plus > di_minus) & tendencia] = 1
+        signals[(di_minus > di_plus) & tendencia] = -1
+        return signals
+
+    # ---------------- Métricas ----------------
+    def _positions(self, signals):
+        """(posición mantenida, posición al cierre de la vela anterior) por combinación."""
+        ejecucion = _shift_bars(signals, self.exec_lag, 0) if self.exec_lag else signals
+        posicion = _hold_position(ejecucion)
+        return posicion, _shift_bars(posicion, 1, 0)
+
+    def _metrics(self, signals):
+        """Métricas por combinación de un bloque de señales int8 (combinaciones, velas)."""
+        b, n = signals.shape
+        posicion, previa = self._positions(signals)
+        # Retorno de la vela t con la posición mantenida al cierre de t-1
+        pnl = previa * self._returns          # float64 (combinaciones, velas)
+
+        total = pnl.sum(axis=1)
+        en_mercado = np.count_nonzero(previa, axis=1)
+        # La posición es -1/0/1: sum(pnl^2) = |posición| · r^2 (producto matriz-vector)
+        cuadrados = np.abs(previa).astype(np.float64) @ (self._returns ** 2)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / n
+            std = np.sqrt((cuadrados - n * mean ** 2) / (n - 1))
+            sharpe = mean / std * np.sqrt(n)
+            win_rate = np.count_nonzero(pnl > 0, axis=1) / en_mercado
+        equity = np.cumsum(pnl, axis=1, out=pnl)
+        max_drawdown = (np.maximum.accumulate(equity, axis=1) - equity).max(axis=1)
+        return {
+            'buys': np.count_nonzero(signals == 1, axis=1),
+            'sells': np.count_nonzero(signals == -1, axis=1),
+            'trades': np.count_nonzero(posicion[:, 1:] != posicion[:, :-1], axis=1),
+            'exposure': en_mercado / n,
+            'total_return': total,
+            'mean_return': mean,
+            'sharpe': sharpe,
+            'win_rate': win_rate,
+            'max_drawdown': max_drawdown,
+        }
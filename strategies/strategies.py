@@ -2,100 +2,135 @@
 
 import pandas as pd
 import numpy as np
+from datastore import OHLCVStore, Resampler
+from .indicators import INDICATORS, data_version
 
 class ForexStrategies:
     """
     Estrategias de trading con gestión de riesgo integrada.
-    Requiere DataFrame con columnas: ['Open','High','Low','Close'].
+    Requiere DataFrame con columnas: ['Open','High','Low','Close'] o un OHLCVStore.
+    timeframe: opcional ('M5', 'H1', ...) para trabajar sobre velas agregadas;
+    resampler: Resampler compartido para reutilizar las agregaciones cacheadas.
+    engine: IndicatorEngine (por defecto el compartido INDICATORS).
     """
 
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data, timeframe=None, resampler=None, engine=None):
+        self.engine = engine if engine is not None else INDICATORS
+        self._version = None
+        if timeframe is not None:
+            if resampler is None:
+                resampler = Resampler(data)
+            elif resampler.source is not data:
+                # Un Resampler compartido debe agregar estos datos, no los que tenía
+                resampler.update(data)
+            data = resampler.get(timeframe)
+        if isinstance(data, OHLCVStore):
+            # El almacén ya está ordenado: vistas de solo lectura, sin copia
+            self.data = data.to_frame()
+            return
         required = {'Open', 'High', 'Low', 'Close'}
         if not required.issubset(data.columns):
             raise ValueError(f"Faltan columnas: {sorted(required - set(data.columns))}")
-        self.data = data.sort_index().copy()
+        # sort_index ya devuelve un DataFrame nuevo: no hace falta otra copia
+        self.data = data.sort_index()
 
     # ------- helpers -------
+    def _data_version(self):
+        """Versión de self.data para la caché de indicadores (se calcula una vez)."""
+        if self._version is None:
+            self._version = data_version(self.data)
+        return self._version
+
+    @staticmethod
+    def _position_from_signal(signal) -> np.ndarray:
+        """
+        Convierte señales discretas (1, -1, 0) en posición mantenida: último
+        valor no nulo hasta cada vela (replace(0, nan).ffill().fillna(0) sin
+        Series intermedias).
+        """
+        signal = np.asarray(signal, dtype=np.float64)
+        ultimo = np.where(signal != 0, np.arange(len(signal)), 0)
+        np.maximum.accumulate(ultimo, out=ultimo)
+        return signal[ultimo]
+
     @staticmethod
-    def _position_from_signal(signal: pd.Series) -> pd.Series:
-        """Convierte señales discretas (1, -1, 0) en posición mantenida."""
-        return signal.replace(0, np.nan).ffill().fillna(0)
-
-    def _attach_execution(self, df: pd.DataFrame, exec_lag: int = 1) -> pd.DataFrame:
-        """Agrega ExecSignal y Position (posición mantenida)."""
-        out = df.copy()
-        out['ExecSignal'] = out['Signal'].shift(exec_lag).fillna(0)
-        out['Position'] = self._position_from_signal(out['ExecSignal'])
+    def _shift(values, k=1):
+        """Equivalente a Series.shift(k) sobre un array float (NaN en las k primeras)."""
+        out = np.full(len(values), np.nan, dtype=values.dtype if values.dtype.kind == 'f' else np.float64)
+        if k < len(values):
+            out[k:] = values[:len(values) - k]
+        return out
+
+    @staticmethod
+    def _signal(buy, sell):
+        """Columna Signal int64: 1 en buy, -1 en sell (sell prevalece si coinciden)."""
+        signal = np.zeros(len(buy), dtype=np.int64)
+        signal[buy] = 1
+        signal[sell] = -1
+        return signal
+
+    def _output(self, columns: dict) -> pd.DataFrame:
+        """
+        DataFrame de salida con solo las columnas indicadas sobre el índice de
+        self.data. La asignación por columna copia cada array una vez (los
+        indicadores del motor son compartidos y no deben quedar enlazados al
+        resultado) y no consolida bloques.
+        """
+        out = pd.DataFrame(index=self.data.index)
+        for name, values in columns.items():
+            out[name] = values
         return out
 
+    @staticmethod
+    def _attach_execution(df: pd.DataFrame, exec_lag: int = 1) -> pd.DataFrame:
+        """Agrega ExecSignal y Position (posición mantenida) a df, sin copiarlo."""
+        signal = df['Signal'].to_numpy()
+        if exec_lag == 0:
+            exec_signal = signal.copy()
+        else:
+            exec_signal = np.zeros(len(signal))
+            if 0 < exec_lag < len(signal):
+                exec_signal[exec_lag:] = signal[:-exec_lag]
+            elif -len(signal) < exec_lag < 0:
+                exec_signal[:exec_lag] = signal[-exec_lag:]
+        df['ExecSignal'] = exec_signal
+        df['Position'] = ForexStrategies._position_from_signal(exec_signal)
+        return df
+
     def _apply_risk_management(self, df: pd.DataFrame, 
                                account_size=10000, risk_per_trade=0.01,
                                atr_period=14, atr_mult=2, rr_ratio=2):
         """
         Calcula StopLoss, TakeProfit y PositionSize según ATR y % de riesgo.
+        Las columnas se añaden a df sin copiarlo; el ATR no forma parte de la salida.
         """
-        df = df.copy()
-        df['ATR'] = (df['High'] - df['Low']).rolling(atr_period).mean()
+        atr = self.engine.atr(self.data, atr_period, version=self._data_version()).to_numpy()
+        close = df['Close'].to_numpy()
+        signal = df['Signal'].to_numpy()
+        sin_senal = signal == 0
+        distancia = atr * atr_mult
+        # ±1 en el dtype de los precios: multiplicar por la dirección es exacto
+        direccion = signal.astype(distancia.dtype)
 
         # StopLoss y TakeProfit según dirección
-        df['StopLoss'] = np.where(df['Signal'] == 1,
-                                  df['Close'] - df['ATR']*atr_mult,
-                                  np.where(df['Signal'] == -1,
-                                           df['Close'] + df['ATR']*atr_mult, np.nan))
-
-        df['TakeProfit'] = np.where(df['Signal'] == 1,
-                                    df['Close'] + df['ATR']*atr_mult*rr_ratio,
-                                    np.where(df['Signal'] == -1,
-                                             df['Close'] - df['ATR']*atr_mult*rr_ratio, np.nan))
+        stop_loss = close - direccion * distancia
+        stop_loss[sin_senal] = np.nan
+        df['StopLoss'] = stop_loss
+        take_profit = close + direccion * (distancia * rr_ratio)
+        take_profit[sin_senal] = np.nan
+        df['TakeProfit'] = take_profit
+        del stop_loss, take_profit
 
         # Tamaño de posición
         risk_amount = account_size * risk_per_trade
-        df['PositionSize'] = np.where(df['Signal'] != 0,
-                                      risk_amount / (df['ATR']*atr_mult),
-                                      0)
+        with np.errstate(divide='ignore', invalid='ignore'):  # ATR 0 en tramos planos (como en pandas)
+            df['PositionSize'] = np.where(sin_senal, 0, risk_amount / distancia)
         return df
 
     # ------- ADX Helper -------
     def _calculate_adx(self, period=14):
-        """Calcula ADX, DI+ y DI-"""
-        df = self.data.copy()
-        
-        # Calcular True Range
-        df['TR'] = np.maximum(
-            df['High'] - df['Low'],
-            np.maximum(
-                abs(df['High'] - df['Close'].shift(1)),
-                abs(df['Low'] - df['Close'].shift(1))
-            )
-        )
-        
-        # Calcular Directional Movement
-        df['DMplus'] = np.where(
-            (df['High'] - df['High'].shift(1)) > (df['Low'].shift(1) - df['Low']),
-            np.maximum(df['High'] - df['High'].shift(1), 0),
-            0
-        )
-        
-        df['DMminus'] = np.where(
-            (df['Low'].shift(1) - df['Low']) > (df['High'] - df['High'].shift(1)),
-            np.maximum(df['Low'].shift(1) - df['Low'], 0),
-            0
-        )
-        
-        # Suavizar con media móvil
-        df['TR_smooth'] = df['TR'].rolling(period).mean()
-        df['DMplus_smooth'] = df['DMplus'].rolling(period).mean()
-        df['DMminus_smooth'] = df['DMminus'].rolling(period).mean()
-        
-        # Calcular DI+ y DI-
-        df['DIplus'] = (df['DMplus_smooth'] / df['TR_smooth']) * 100
-        df['DIminus'] = (df['DMminus_smooth'] / df['TR_smooth']) * 100
-        
-        # Calcular DX y ADX
-        df['DX'] = (abs(df['DIplus'] - df['DIminus']) / (df['DIplus'] + df['DIminus'])) * 100
-        df['ADX'] = df['DX'].rolling(period).mean()
-        
-        return df[['DIplus', 'DIminus', 'ADX']]
+        """Calcula ADX, DI+ y DI- (memoizado en el motor de indicadores; no modificar)"""
+        return self.engine.adx(self.data, period, version=self._data_version())
 
     # ---------------- ADX Strategy ----------------
     def adx_strategy(self, adx_period=14, adx_threshold=25, exec_lag=1, **risk_kwargs):
@@ -106,86 +141,55 @@ class ForexStrategies:
         - COMPRA: DI+ > DI- y ADX > threshold (tendencia alcista fuerte)
         - VENTA: DI- > DI+ y ADX > threshold (tendencia bajista fuerte)
         """
-        df = self.data.copy()
-        
-        # Calcular indicadores ADX
         adx_data = self._calculate_adx(adx_period)
-        df = pd.concat([df, adx_data], axis=1)
-        
-        # Generar señales
-        df['Signal'] = 0
-        
-        # Señal de compra: DI+ cruza por encima de DI- con ADX fuerte
-        buy_condition = (df['DIplus'] > df['DIminus']) & (df['ADX'] > adx_threshold)
-        df.loc[buy_condition, 'Signal'] = 1
-        
-        # Señal de venta: DI- cruza por encima de DI+ con ADX fuerte
-        sell_condition = (df['DIminus'] > df['DIplus']) & (df['ADX'] > adx_threshold)
-        df.loc[sell_condition, 'Signal'] = -1
-        
-        # Aplicar gestión de riesgo
+        di_plus = adx_data['DIplus'].to_numpy()
+        di_minus = adx_data['DIminus'].to_numpy()
+        adx = adx_data['ADX'].to_numpy()
+
+        tendencia = adx > adx_threshold
+        signal = self._signal((di_plus > di_minus) & tendencia, (di_minus > di_plus) & tendencia)
+
+        df = self._output({'Close': self.data['Close'].to_numpy(), 'DIplus': di_plus, 'DIminus': di_minus,
+                           'ADX': adx, 'Signal': signal})
         df = self._apply_risk_management(df, **risk_kwargs)
-        
-        return self._attach_execution(df[['Close', 'DIplus', 'DIminus', 'ADX',
-                                         'Signal', 'StopLoss', 'TakeProfit', 'PositionSize']], exec_lag)
+        return self._attach_execution(df, exec_lag)
 
     # ---------------- Trend Following ----------------
     def trend_following(self, short_window=20, long_window=50, exec_lag=1, **risk_kwargs):
-        df = self.data.copy()
-        df['EMA_short'] = df['Close'].ewm(span=short_window, adjust=False).mean()
-        df['EMA_long']  = df['Close'].ewm(span=long_window, adjust=False).mean()
-
-        cond = df['EMA_short'] > df['EMA_long']
-        
-        # Usar numpy para manejar los NaN de manera más eficiente
-        cond_shifted = cond.shift(1)
-        cond_shifted_filled = cond_shifted.where(cond_shifted.notna(), False)
-        
-        cross_up = cond & (~cond_shifted_filled)
-        cross_dn = (~cond) & cond_shifted_filled
+        ema_short = self.engine.ema(self.data, short_window, adjust=False, version=self._data_version()).to_numpy()
+        ema_long = self.engine.ema(self.data, long_window, adjust=False, version=self._data_version()).to_numpy()
 
-        df['Signal'] = 0
-        df.loc[cross_up, 'Signal'] = 1
-        df.loc[cross_dn, 'Signal'] = -1
+        # Cruce: la condición cambia respecto a la vela anterior (False antes de la primera)
+        cond = ema_short > ema_long
+        cond_prev = np.zeros_like(cond)
+        cond_prev[1:] = cond[:-1]
+        signal = self._signal(cond & ~cond_prev, ~cond & cond_prev)
 
+        df = self._output({'Close': self.data['Close'].to_numpy(), 'EMA_short': ema_short,
+                           'EMA_long': ema_long, 'Signal': signal})
         df = self._apply_risk_management(df, **risk_kwargs)
-        return self._attach_execution(df[['Close','EMA_short','EMA_long',
-                                        'Signal','StopLoss','TakeProfit','PositionSize']], exec_lag)   
+        return self._attach_execution(df, exec_lag)
 
     # ---------------- Breakout ----------------
     def breakout(self, window=20, exec_lag=1, **risk_kwargs):
-        df = self.data.copy()
-        df['High_Max'] = df['High'].rolling(window).max().shift(1)
-        df['Low_Min']  = df['Low'].rolling(window).min().shift(1)
+        high_max = self._shift(self.engine.rolling_max(self.data, window, version=self._data_version()).to_numpy())
+        low_min = self._shift(self.engine.rolling_min(self.data, window, version=self._data_version()).to_numpy())
+        close = self.data['Close'].to_numpy()
 
-        df['Signal'] = 0
-        df.loc[df['Close'] > df['High_Max'], 'Signal'] = 1
-        df.loc[df['Close'] < df['Low_Min'],  'Signal'] = -1
+        signal = self._signal(close > high_max, close < low_min)
 
+        df = self._output({'Close': close, 'High_Max': high_max, 'Low_Min': low_min, 'Signal': signal})
         df = self._apply_risk_management(df, **risk_kwargs)
-        return self._attach_execution(df[['Close','High_Max','Low_Min',
-                                          'Signal','StopLoss','TakeProfit','PositionSize']], exec_lag)
+        return self._attach_execution(df, exec_lag)
 
     # ---------------- RSI ----------------
     def rsi_strategy(self, period=14, overbought=70, oversold=30, exec_lag=1, **risk_kwargs):
-        df = self.data.copy()
-        delta = df['Close'].diff()
-        gain = delta.where(delta > 0, 0.0)
-        loss = -delta.where(delta < 0, 0.0)
-
-        avg_gain = gain.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
-        avg_loss = loss.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
-
-        rs = avg_gain / avg_loss.replace(0, np.nan)
-        df['RSI'] = 100 - (100 / (1 + rs))
-
-        buy  = (df['RSI'] < oversold)  & (df['RSI'].shift(1) >= oversold)
-        sell = (df['RSI'] > overbought) & (df['RSI'].shift(1) <= overbought)
+        rsi = self.engine.rsi(self.data, period, version=self._data_version()).to_numpy()
+        rsi_prev = self._shift(rsi)
 
-        df['Signal'] = 0
-        df.loc[buy, 'Signal']  = 1
-        df.loc[sell, 'Signal'] = -1
+        signal = self._signal((rsi < oversold) & (rsi_prev >= oversold),
+                              (rsi > overbought) & (rsi_prev <= overbought))
 
+        df = self._output({'Close': self.data['Close'].to_numpy(), 'RSI': rsi, 'Signal': signal})
         df = self._apply_risk_management(df, **risk_kwargs)
-        return self._attach_execution(df[['Close','RSI',
-                                          'Signal','StopLoss','TakeProfit','PositionSize']], exec_lag)
\ No newline at end of file
+        return self._attach_execution(df, exec_lag)
@@ -0,0 +1,76 @@
+# tests/test_catalog.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from datastore import ColumnarStore, DataCatalog, OHLCVStore, parse_dukascopy_name
+
+
+def _velas(n, inicio='2024-01-01'):
+    close = 1.10 + np.arange(n) * 1e-5
+    return pd.DataFrame({'Open': close, 'High': close + 1e-4, 'Low': close - 1e-4, 'Close': close,
+                         'Volume': 1.0}, index=pd.date_range(inicio, periods=n, freq='min', name='DateTime'))
+
+
+def test_nombres():
+    assert parse_dukascopy_name('DAT_ASCII_EURUSD_M1_2024.csv') == ('EURUSD', 'M1', '2024')
+    assert parse_dukascopy_name('csv/processed/EURUSD_M1_2024.csv') == ('EURUSD', 'M1', '2024')
+    assert parse_dukascopy_name('processed/GBPUSD_H1.ohlcv/') == ('GBPUSD', 'H1', None)
+    for nombre in ('processed_data.feather', 'ingest_state.json', 'processed_foo.csv',
+                   'processed_data_20240101_20240131.feather', 'EURUSD_X9_2024.feather'):
+        assert parse_dukascopy_name(nombre) is None
+
+
+@pytest.fixture
+def carpetas(tmp_path):
+    processed, csv = tmp_path / "processed", tmp_path / "csv_processed"
+    processed.mkdir()
+    csv.mkdir()
+    ColumnarStore.save(_velas(100), str(processed / "EURUSD_M1_2024.feather"))
+    OHLCVStore.write(_velas(200, '2023-06-01'), str(processed / "GBPUSD_M1.ohlcv"))
+    ColumnarStore.save(_velas(10), str(processed / "processed_data.feather"))
+    _velas(50).to_csv(csv / "USDJPY_H1_2024.csv")
+    _velas(30).to_csv(csv / "EURUSD_M1_2024.csv")  # misma clave que el .feather de processed/
+    return [str(processed), str(csv)]
+
+
+def test_scan_solo_metadatos(carpetas, monkeypatch):
+    def sin_datos(*args, **kwargs):
+        raise AssertionError("scan() no debe leer las velas")
+    monkeypatch.setattr(DataCatalog, 'read_data', staticmethod(sin_datos))
+    monkeypatch.setattr(ColumnarStore, 'load', staticmethod(sin_datos))
+    monkeypatch.setattr(pd, 'read_csv', sin_datos)
+
+    catalogo = DataCatalog(carpetas).scan()
+    assert catalogo.resident_bytes == 0
+    assert set(catalogo.entries) == {('EURUSD', 'M1', '2024'), ('GBPUSD', 'M1', None), ('USDJPY', 'H1', '2024')}
+
+    eurusd = catalogo.entries[('EURUSD', 'M1', '2024')]
+    assert eurusd.format == '.feather' and eurusd.rows == 100  # gana la primera carpeta
+    assert eurusd.start == pd.Timestamp('2024-01-01 00:00') and eurusd.end == pd.Timestamp('2024-01-01 01:39')
+    gbpusd = catalogo.entries[('GBPUSD', 'M1', None)]
+    assert gbpusd.rows == 200 and gbpusd.end == pd.Timestamp('2023-06-01 03:19')
+    # CSV no guarda metadatos: se completan al cargar
+    assert catalogo.entries[('USDJPY', 'H1', '2024')].rows is None
+
+
+def test_carga_perezosa_y_lru(carpetas):
+    catalogo = DataCatalog(carpetas).scan()
+    usdjpy = catalogo.load('USDJPY', 'H1', 2024)
+    assert len(usdjpy) == 50 and catalogo.entries[('USDJPY', 'H1', '2024')].rows == 50
+    assert catalogo.load('USDJPY', 'H1', '2024') is usdjpy
+
+    # Límite para dos entradas: la tercera expulsa la menos usada recientemente
+    tam = lambda df: int(df.memory_usage(index=True).sum())
+    catalogo.max_bytes = tam(usdjpy) + tam(DataCatalog.read_data(catalogo.entries[('GBPUSD', 'M1', None)]))
+    catalogo.load('EURUSD', 'M1', 2024)
+    catalogo.load('USDJPY', 'H1', 2024)
+    catalogo.load('GBPUSD', 'M1')
+    assert list(catalogo._cache) == [('USDJPY', 'H1', '2024'), ('GBPUSD', 'M1', None)]
+    assert catalogo.resident_bytes == sum(n for _, n in catalogo._cache.values())
+
+    catalogo.evict('USDJPY')
+    assert list(catalogo._cache) == [('GBPUSD', 'M1', None)]
+    with pytest.raises(KeyError):
+        catalogo.load('AUDUSD', 'M1')
@@ -0,0 +1,54 @@
+# tests/test_ensemble.py
+
+import numpy as np
+import pandas as pd
+
+from strategies import ForexStrategies, CandleStrategies, EnsembleRunner, IndicatorEngine
+from strategies.candle_strategies import PATTERN_DEPENDENCIES
+
+
+def _velas(n=5000, seed=2):
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 1e-4, n))
+    open_ = close + rng.normal(0, 1e-4, n)
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + rng.random(n) * 2e-4,
+        'Low': np.minimum(open_, close) - rng.random(n) * 2e-4,
+        'Close': close,
+    }, index=pd.date_range('2024-01-01', periods=n, freq='min'))
+
+
+def test_senales_igual_que_cada_estrategia():
+    df = _velas()
+    seleccion = [(m, 'forex', {'rr_ratio': 3.0}) for m in ('trend_following', 'breakout', 'rsi_strategy', 'adx_strategy')]
+    seleccion += [(m, 'candle', {}) for m in PATTERN_DEPENDENCIES]
+    seleccion += [('no_existe', 'forex', {})]
+
+    resultado = EnsembleRunner(df, engine=IndicatorEngine(), max_workers=4).run(seleccion)
+
+    fx, candle = ForexStrategies(df, engine=IndicatorEngine()), CandleStrategies(df, engine=IndicatorEngine())
+    esperados = {}
+    for nombre, tipo, kwargs in seleccion[:-1]:
+        frame = getattr(fx if tipo == 'forex' else candle, nombre)(**kwargs)
+        if 'Signal' in frame.columns:
+            esperados[nombre] = frame['Signal'].to_numpy()
+
+    assert resultado.names == list(esperados)
+    assert resultado.signals.shape == (len(esperados), len(df))
+    for nombre, senal in esperados.items():
+        np.testing.assert_array_equal(resultado[nombre], senal)
+    assert list(resultado.errors) == ['no_existe']
+
+
+def test_limit_y_to_frame():
+    df = _velas()
+    resultado = EnsembleRunner(df, engine=IndicatorEngine()).run([('breakout', 'forex', {})])
+    limitado = resultado.limit(3)
+    posiciones = np.flatnonzero(resultado['breakout'])
+    np.testing.assert_array_equal(np.flatnonzero(limitado['breakout']), posiciones[:3])
+
+    frame = limitado.to_frame()
+    assert list(frame.columns) == ['breakout_Signal']
+    assert frame['breakout_Signal'].dtype == np.int64
+    assert frame.index.equals(df.index)
@@ -0,0 +1,96 @@
+# tests/test_incremental.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from datastore import IncrementalIngestor, OHLCVStore
+
+
+def _lineas(inicio, n):
+    """Velas M1 en formato Dukascopy (';', sin cabecera) desde el minuto inicio."""
+    tiempos = pd.date_range('2024-01-01', periods=inicio + n, freq='min')[inicio:]
+    return ''.join(f"{t:%Y%m%d %H%M%S};1.1;1.2;1.0;1.15;{i}\n" for i, t in enumerate(tiempos, inicio))
+
+
+def _escribir(path, texto, modo='a'):
+    with open(path, modo) as f:
+        f.write(texto)
+
+
+def test_reanuda_entre_ejecuciones(tmp_path):
+    fuente = tmp_path / "DAT_ASCII_EURUSD_M1_2024.csv"
+    _escribir(fuente, _lineas(0, 100) + "20240101 014000;1.1", 'w')  # última línea a medias
+    ingestor = IncrementalIngestor(str(tmp_path / "processed"), block_bytes=512)
+    resumen = ingestor.ingest(str(fuente))
+    assert resumen['key'] == 'EURUSD_M1' and resumen['rows'] == 100
+
+    # El feed crece: completa la línea y añade más velas
+    _escribir(fuente, ";1.2;1.0;1.15;100\n" + _lineas(101, 49))
+    resumen = IncrementalIngestor(str(tmp_path / "processed"), block_bytes=512).ingest(str(fuente))
+    assert resumen['rows'] == 50 and resumen['duplicates'] == 0
+
+    store = OHLCVStore.open(resumen['store'])
+    np.testing.assert_array_equal(store.index, pd.date_range('2024-01-01', periods=150, freq='min'))
+    np.testing.assert_array_equal(store['Volume'], np.arange(150))
+    assert ingestor.ingest(str(fuente))['rows'] == 0
+
+
+def test_solapamiento_cuenta_duplicados(tmp_path):
+    ingestor = IncrementalIngestor(str(tmp_path / "processed"))
+    primero, segundo = tmp_path / "EURUSD_M1_2024.csv", tmp_path / "EURUSD_M1_2025.csv"
+    _escribir(primero, _lineas(0, 60), 'w')
+    _escribir(segundo, _lineas(40, 40), 'w')
+    ingestor.ingest(str(primero))
+    resumen = ingestor.ingest(str(segundo))
+    assert resumen['rows'] == 20 and resumen['duplicates'] == 20
+    assert len(OHLCVStore.open(resumen['store'])) == 80
+
+
+def test_retroceso_en_el_tiempo(tmp_path):
+    carpeta = str(tmp_path / "processed")
+    primero, segundo = tmp_path / "EURUSD_M1_2024.csv", tmp_path / "EURUSD_M1_2025.csv"
+    _escribir(primero, _lineas(0, 30), 'w')
+    IncrementalIngestor(carpeta).ingest(str(primero))
+
+    # Entre ejecuciones: una vela anterior a la última que no está en el almacén
+    _escribir(segundo, "20240101 001030;1.1;1.2;1.0;1.15;0\n" + _lineas(30, 5), 'w')
+    with pytest.raises(ValueError, match="anteriores"):
+        IncrementalIngestor(carpeta).ingest(str(segundo))
+
+    # En la frontera entre bloques: el segundo bloque empieza antes del final del primero
+    _escribir(segundo, _lineas(30, 10) + "20240101 003530;1.1;1.2;1.0;1.15;0\n", 'w')
+    with pytest.raises(ValueError, match="anteriores"):
+        IncrementalIngestor(carpeta, block_bytes=64).ingest(str(segundo))
+
+
+def test_interrupcion_tras_append(tmp_path, monkeypatch):
+    fuente = tmp_path / "EURUSD_M1_2024.csv"
+    _escribir(fuente, _lineas(0, 50), 'w')
+    carpeta = str(tmp_path / "processed")
+    IncrementalIngestor(carpeta).ingest(str(fuente))
+    _escribir(fuente, _lineas(50, 30))
+
+    # Se corta entre store.append y _save_state: el estado no registra el append
+    def fallo(self):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(IncrementalIngestor, '_save_state', fallo)
+    with pytest.raises(KeyboardInterrupt):
+        IncrementalIngestor(carpeta).ingest(str(fuente))
+    monkeypatch.undo()
+
+    resumen = IncrementalIngestor(carpeta).ingest(str(fuente))
+    assert resumen['rows'] == 0 and resumen['duplicates'] == 30
+    store = OHLCVStore.open(resumen['store'])
+    np.testing.assert_array_equal(store['Volume'], np.arange(80))
+    assert IncrementalIngestor(carpeta).state['EURUSD_M1']['rows'] == 80
+
+
+def test_fichero_truncado(tmp_path):
+    fuente = tmp_path / "EURUSD_M1_2024.csv"
+    _escribir(fuente, _lineas(0, 50), 'w')
+    ingestor = IncrementalIngestor(str(tmp_path / "processed"))
+    ingestor.ingest(str(fuente))
+    _escribir(fuente, _lineas(0, 10), 'w')
+    with pytest.raises(ValueError, match="reescrito"):
+        ingestor.ingest(str(fuente))
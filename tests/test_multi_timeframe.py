@@ -0,0 +1,83 @@
+# tests/test_multi_timeframe.py
+
+import numpy as np
+import pandas as pd
+
+from datastore import resample_ohlcv
+from strategies import ForexStrategies, CandleStrategies, IndicatorEngine, HTFInput, MultiTimeframe, MultiTimeframeStrategy
+
+
+def _velas(n=6000, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 1e-4, n))
+    df = pd.DataFrame({
+        'Open': close,
+        'High': close + 2e-4,
+        'Low': close - 2e-4,
+        'Close': close,
+        'Volume': 1.0,
+    }, index=pd.date_range('2024-01-01', periods=n, freq='min'))
+    # Huecos en las velas M1 como en datos reales
+    return df[rng.random(n) > 0.05]
+
+
+def test_alineado_igual_que_merge_asof_sobre_cierres():
+    df = _velas()
+    entrada = HTFInput('H1', 'ema', span=20)
+    alineado = MultiTimeframe(df, engine=IndicatorEngine()).get(entrada)
+
+    h1 = resample_ohlcv(df, 'H1')
+    ema = h1['Close'].ewm(span=20).mean().to_numpy()
+    esperado = pd.merge_asof(pd.DataFrame({'t': df.index + pd.Timedelta('1min')}),
+                             pd.DataFrame({'t': h1.index + pd.Timedelta('1h'), 'v': ema}),
+                             on='t', direction='backward')['v'].to_numpy()
+    np.testing.assert_array_equal(alineado, esperado)
+    assert np.isnan(alineado[:50]).all()
+
+
+def test_sin_lookahead_al_truncar():
+    df = _velas()
+    entradas = [HTFInput('H1', 'close'), HTFInput('H4', 'adx', period=14, output='DIplus')]
+    completo = MultiTimeframe(df, engine=IndicatorEngine())
+    for k in np.random.default_rng(1).integers(100, len(df), 10):
+        truncado = MultiTimeframe(df.iloc[:k], engine=IndicatorEngine())
+        for entrada in entradas:
+            np.testing.assert_array_equal(truncado.get(entrada), completo.get(entrada)[:k])
+
+
+def test_entradas_calculadas_una_vez():
+    df = _velas()
+    engine = IndicatorEngine()
+    mtf = MultiTimeframe(df, engine=engine)
+    primero = mtf.get(HTFInput('H1', 'ema', span=50))
+    misses = engine.misses
+    assert mtf.get(HTFInput('H1', 'ema', span=50)) is primero
+    assert engine.misses == misses
+
+
+def test_filtro_de_tendencia():
+    df = _velas()
+    engine = IndicatorEngine()
+    fs = ForexStrategies(df, engine=engine)
+    entrada = HTFInput('H1', 'ema', span=20)
+    resultado = MultiTimeframeStrategy(fs.trend_following, [entrada], MultiTimeframe(df, engine=engine))()
+
+    base = ForexStrategies(df, engine=IndicatorEngine()).trend_following()
+    np.testing.assert_array_equal(resultado['Raw_Signal'], base['Signal'])
+    close, nivel, senal = resultado['Close'], resultado[entrada.name], resultado['Signal']
+    assert ((senal != 0) <= (base['Signal'] != 0)).all()
+    assert (close[senal > 0] > nivel[senal > 0]).all()
+    assert (close[senal < 0] < nivel[senal < 0]).all()
+    assert (resultado.loc[senal == 0, 'PositionSize'] == 0).all()
+    np.testing.assert_array_equal(resultado['ExecSignal'], senal.shift(1, fill_value=0))
+
+
+def test_estrategia_de_velas():
+    df = _velas()
+    engine = IndicatorEngine()
+    entrada = HTFInput('H4', 'ema', span=10)
+    resultado = MultiTimeframeStrategy(CandleStrategies(df, engine=engine).hammer_reversal, [entrada],
+                                       MultiTimeframe(df, engine=engine))()
+    senal = resultado['Signal']
+    assert ((senal != 0) <= (resultado['Raw_Signal'] != 0)).all()
+    assert (resultado['Close'][senal > 0] > resultado[entrada.name][senal > 0]).all()
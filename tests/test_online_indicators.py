@@ -0,0 +1,77 @@
+# tests/test_online_indicators.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies import ForexStrategies, IndicatorEngine
+from strategies.online_indicators import (
+    OnlineEMA, OnlineRSI, OnlineRollingMax, OnlineRollingMin, OnlineRollingMean, OnlineADX,
+    OnlineTrendFollowing, OnlineBreakout, OnlineRSIStrategy, OnlineADXStrategy,
+)
+
+
+@pytest.fixture(scope='module')
+def velas():
+    rng = np.random.default_rng(11)
+    n = 8000
+    close = 1.10 + np.cumsum(rng.normal(0, 1e-4, n))
+    df = pd.DataFrame({
+        'Open': close + rng.normal(0, 5e-5, n),
+        'High': close + rng.random(n) * 3e-4,
+        'Low': close - rng.random(n) * 3e-4,
+        'Close': close,
+    }, index=pd.date_range('2024-01-01', periods=n, freq='min'))
+    # Una vela NaN y un tramo plano (ventanas constantes en las medias móviles)
+    df.iloc[2500] = np.nan
+    df.iloc[4000:4030] = 1.1
+    return df
+
+
+def _push(indicador, valores):
+    return np.array([indicador.push(v) for v in valores])
+
+
+def _igual(online, batch):
+    np.testing.assert_array_equal(online, np.asarray(batch, dtype=np.float64))
+
+
+@pytest.mark.parametrize('adjust', [False, True])
+def test_ema(velas, adjust):
+    _igual(_push(OnlineEMA(20, adjust=adjust), velas['Close']),
+           IndicatorEngine().ema(velas, 20, adjust=adjust))
+
+
+def test_rsi(velas):
+    _igual(_push(OnlineRSI(14), velas['Close']), IndicatorEngine().rsi(velas, 14))
+
+
+def test_rolling(velas):
+    engine = IndicatorEngine()
+    _igual(_push(OnlineRollingMax(20), velas['High']), engine.rolling_max(velas, 20))
+    _igual(_push(OnlineRollingMin(20), velas['Low']), engine.rolling_min(velas, 20))
+    _igual(_push(OnlineRollingMean(14), velas['Close']), velas['Close'].rolling(14).mean())
+
+
+def test_adx(velas):
+    adx = OnlineADX(14)
+    online = np.array([adx.push(h, l, c) for h, l, c in velas[['High', 'Low', 'Close']].to_numpy()])
+    _igual(online, IndicatorEngine().adx(velas, 14)[['DIplus', 'DIminus', 'ADX']])
+
+
+@pytest.mark.parametrize('online, metodo, kwargs', [
+    (OnlineTrendFollowing, 'trend_following', {'short_window': 10, 'long_window': 30}),
+    (OnlineBreakout, 'breakout', {'window': 20}),
+    (OnlineRSIStrategy, 'rsi_strategy', {'period': 14, 'overbought': 70, 'oversold': 30}),
+    (OnlineADXStrategy, 'adx_strategy', {'adx_period': 14, 'adx_threshold': 25}),
+])
+def test_senales_igual_que_lotes(velas, online, metodo, kwargs):
+    batch = getattr(ForexStrategies(velas, engine=IndicatorEngine()), metodo)(**kwargs)['Signal'].to_numpy()
+    estrategia = online(**kwargs)
+    senales = estrategia.replay(velas)
+    assert np.count_nonzero(senales) > 0
+    np.testing.assert_array_equal(senales, batch)
+
+    # reset() vuelve al estado inicial
+    estrategia.reset()
+    np.testing.assert_array_equal(estrategia.replay(velas), senales)
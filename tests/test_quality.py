@@ -0,0 +1,94 @@
+# tests/test_quality.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from datastore import scan_quality
+
+
+def _velas(index):
+    n = len(index)
+    close = 1.10 + np.arange(n) * 1e-5
+    return pd.DataFrame({'Open': close, 'High': close + 1e-4, 'Low': close - 1e-4, 'Close': close,
+                         'Volume': 1.0}, index=pd.DatetimeIndex(index, name='DateTime'))
+
+
+def test_bloque_limpio():
+    df = _velas(pd.date_range('2024-01-03', periods=500, freq='min'))
+    salida, informe = scan_quality(df)
+    assert salida is df
+    assert informe.rows == 500 and informe.is_clean() and informe.gaps.empty
+
+
+def test_huecos_y_fin_de_semana():
+    # Miércoles con 5 minutos perdidos y cierre de viernes 22:00 a domingo 22:00
+    miercoles = pd.date_range('2024-01-03 10:00', periods=10, freq='min')
+    tras_hueco = pd.date_range('2024-01-03 10:15', periods=10, freq='min')
+    viernes = pd.date_range('2024-01-05 21:50', periods=10, freq='min')
+    domingo = pd.date_range('2024-01-07 22:00', periods=10, freq='min')
+    _, informe = scan_quality(_velas(miercoles.append(tras_hueco).append(viernes).append(domingo)))
+
+    assert len(informe.gaps) == 3
+    entre_semana = informe.unexpected_gaps
+    assert list(entre_semana['start']) == [pd.Timestamp('2024-01-03 10:10'), pd.Timestamp('2024-01-03 10:25')]
+    assert list(entre_semana['missing']) == [5, 3565]  # miércoles 10:25 -> viernes 21:49
+    fin_semana = informe.gaps[informe.gaps['weekend']]
+    assert len(fin_semana) == 1 and fin_semana['missing'].iloc[0] == 48 * 60
+    assert not informe.is_clean()
+
+
+def test_duplicados_y_frontera_entre_bloques():
+    tiempos = pd.date_range('2024-01-03', periods=20, freq='min')
+    df = _velas(tiempos[:10].append(tiempos[9:10]).append(tiempos[5:6]).append(tiempos[10:]))
+    _, informe = scan_quality(df)
+    assert informe.duplicates == 2
+
+    # El primer timestamp repite el último del bloque anterior
+    _, informe = scan_quality(_velas(tiempos[10:]), prev_timestamp=tiempos[10])
+    assert informe.duplicates == 1
+    _, informe = scan_quality(_velas(tiempos[10:]), prev_timestamp=tiempos[5])
+    assert informe.duplicates == 0 and informe.gaps['missing'].tolist() == [4]
+
+
+def test_violaciones_ohlc_y_picos_sin_volumen():
+    df = _velas(pd.date_range('2024-01-03', periods=100, freq='min'))
+    df.iloc[3, df.columns.get_loc('High')] = df['Low'].iloc[3] - 1e-4      # High < Low
+    df.iloc[7, df.columns.get_loc('Close')] = df['High'].iloc[7] + 1e-4    # Close > High
+    df.iloc[11, df.columns.get_loc('Low')] = 0.0                           # precio no positivo
+    df.iloc[13, df.columns.get_loc('Open')] = np.nan
+    df.iloc[20, df.columns.get_loc('High')] += 0.01                        # rango 50 veces el normal
+    df.iloc[20, df.columns.get_loc('Volume')] = 0.0
+    _, informe = scan_quality(df)
+    assert informe.ohlc_violations == 4
+    assert informe.zero_volume_spikes == 1
+
+
+def test_reparaciones():
+    tiempos = pd.date_range('2024-01-03', periods=30, freq='min')
+    df = _velas(tiempos[:10].append(tiempos[9:10]).append(tiempos[13:]))
+    df.iloc[5, df.columns.get_loc('High')] = df['Low'].iloc[5] - 1e-4
+
+    limpio, informe = scan_quality(df, repair='drop')
+    assert informe.repaired == 2 and len(limpio) == len(df) - 2
+    assert limpio.index.is_monotonic_increasing and limpio.index.is_unique
+
+    relleno, informe = scan_quality(df, repair='ffill')
+    assert relleno.index.equals(pd.DatetimeIndex(tiempos, name='DateTime'))
+    assert informe.repaired == 1 + 1 + 3
+    # Vela inválida y huecos -> cierre anterior en O/H/L/C, sin volumen en los huecos
+    for i in (5, 10, 11, 12):
+        assert (relleno.iloc[i][['Open', 'High', 'Low', 'Close']] == relleno['Close'].iloc[i - 1]).all()
+    assert (relleno['Volume'].iloc[10:13] == 0).all()
+    assert scan_quality(relleno)[1].is_clean()
+
+    with pytest.raises(ValueError):
+        scan_quality(df, repair='interpolar')
+
+
+def test_merge_acumula():
+    tiempos = pd.date_range('2024-01-03', periods=40, freq='min')
+    _, a = scan_quality(_velas(tiempos[:10].append(tiempos[15:20])))
+    _, b = scan_quality(_velas(tiempos[20:30].append(tiempos[29:30])), prev_timestamp=tiempos[19])
+    total = a.merge(b)
+    assert total.rows == 26 and total.duplicates == 1 and len(total.gaps) == 1
@@ -0,0 +1,66 @@
+# tests/test_streaming.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from patterns import CandlestickPatterns, StreamingPatternDetector
+
+
+def _velas(n=3000, seed=7, dtype=np.float64, nan_row=None):
+    """Velas sintéticas con cuerpos y mechas variados para que salten todos los patrones."""
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 5e-4, n))
+    open_ = close + rng.normal(0, 4e-4, n)
+    # Algunas velas casi sin cuerpo (doji, spinning top)
+    planas = rng.random(n) < 0.1
+    open_[planas] = close[planas] + rng.normal(0, 1e-5, planas.sum())
+    high = np.maximum(open_, close) + rng.exponential(3e-4, n)
+    low = np.minimum(open_, close) - rng.exponential(3e-4, n)
+    df = pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close},
+                      index=pd.date_range('2024-01-01', periods=n, freq='min')).astype(dtype)
+    if nan_row is not None:
+        df.iloc[nan_row] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+@pytest.mark.parametrize('nan_row', [None, 1500])
+def test_replay_igual_que_lotes(dtype, nan_row):
+    df = _velas(dtype=dtype, nan_row=nan_row)
+    batch = CandlestickPatterns(df).detect()
+    detector = StreamingPatternDetector(dtype=dtype)
+
+    assert detector.names == batch.names
+    stream = detector.replay(df)
+    assert stream.dtype == np.int8
+    for i, name in enumerate(batch.names):
+        diferentes = np.flatnonzero(stream[i] != batch.signals[i])
+        assert len(diferentes) == 0, f"{name} difiere en las velas {diferentes[:10]}"
+
+
+def test_replay_detecta_patrones():
+    # La comparación anterior no sirve de nada si ningún patrón direccional salta
+    df = _velas()
+    stream = StreamingPatternDetector().replay(df)
+    assert (stream == 1).any() and (stream == -1).any()
+
+
+def test_nan_no_contamina_mas_alla_de_la_ventana():
+    df = _velas(nan_row=1500)
+    detector = StreamingPatternDetector()
+    stream = detector.replay(df)
+    assert not stream[:, 1500].any()
+    # Pasada la ventana del detector la vela NaN ya no está en el buffer
+    limpio = StreamingPatternDetector().replay(_velas())
+    desde = 1500 + detector.window
+    np.testing.assert_array_equal(stream[:, desde:], limpio[:, desde:])
+
+
+def test_reset():
+    df = _velas(n=200)
+    detector = StreamingPatternDetector()
+    primera = detector.replay(df)
+    detector.reset()
+    assert detector.bars == 0
+    np.testing.assert_array_equal(detector.replay(df), primera)
@@ -0,0 +1,72 @@
+# tests/test_walk_forward.py
+
+import numpy as np
+import pandas as pd
+
+from backtesting import WalkForward
+from datastore import OHLCVStore
+from strategies import ParameterSweep, IndicatorEngine
+
+GRIDS = {
+    'trend_following': {'short_window': (10, 20), 'long_window': (50, 100)},
+    'breakout': {'window': (20, 50)},
+    'rsi_strategy': {'period': (7, 14), 'overbought': (70,), 'oversold': (30,)},
+    'adx_strategy': {'adx_period': (14,), 'adx_threshold': (20, 25)},
+}
+
+
+def _velas(n=12000, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 1e-4, n))
+    return pd.DataFrame({
+        'Open': close,
+        'High': close + rng.random(n) * 3e-4,
+        'Low': close - rng.random(n) * 3e-4,
+        'Close': close,
+        'Volume': 1.0,
+    }, index=pd.date_range('2024-01-01', periods=n, freq='min'))
+
+
+def test_ventanas():
+    wf = WalkForward(_velas(), train=4000, test=3000)
+    assert wf.windows() == [(0, 0, 4000, 7000), (1, 3000, 7000, 10000), (2, 6000, 10000, 12000)]
+    anclado = WalkForward(_velas(), train=4000, test=3000, anchored=True)
+    assert [v[1] for v in anclado.windows()] == [0, 0, 0]
+    por_tiempo = WalkForward(_velas(), train='2D', test='1D')
+    assert por_tiempo.windows() == [(0, 0, 2880, 4320), (1, 1440, 4320, 5760), (2, 2880, 5760, 7200),
+                                    (3, 4320, 7200, 8640), (4, 5760, 8640, 10080), (5, 7200, 10080, 11520),
+                                    (6, 8640, 11520, 12000)]
+
+
+def test_procesos_igual_que_en_serie(tmp_path):
+    store = OHLCVStore.write(_velas(), str(tmp_path / "EURUSD.ohlcv"))
+    wf = WalkForward(store, train=4000, test=3000)
+    serie, procesos = wf.run(GRIDS), wf.run(GRIDS, workers=2)
+    assert not serie.errors
+    pd.testing.assert_frame_equal(serie.windows, procesos.windows)
+    pd.testing.assert_frame_equal(serie.equity, procesos.equity)
+
+
+def test_optimizacion_y_curva_oos():
+    df = _velas()
+    wf = WalkForward(df, train=4000, test=3000)
+    resultado = wf.run(GRIDS)
+    assert list(resultado.equity.columns) == list(GRIDS)
+    assert resultado.equity.index.equals(df.index[4000:])
+
+    for strategy, grid in GRIDS.items():
+        tabla = resultado.windows[resultado.windows['strategy'] == strategy]
+        partes = []
+        for (_, i0, i1, i2), (_, fila) in zip(wf.windows(), tabla.iterrows()):
+            # Mejor combinación in-sample, solo con las velas [i0, i1)
+            barrido = ParameterSweep(df.iloc[i0:i1], engine=IndicatorEngine()).run(strategy, grid)
+            mejor = barrido.loc[barrido['sharpe'].idxmax()]
+            assert all(fila[p] == mejor[p] for p in grid)
+            params = {p: mejor[p] for p in grid}
+            partes.append(ParameterSweep(df.iloc[i0:i2], engine=IndicatorEngine()).pnl(strategy, **params)[i1 - i0:])
+        np.testing.assert_allclose(resultado.equity[strategy].to_numpy(), np.cumsum(np.concatenate(partes)))
+
+    estabilidad = resultado.stability()
+    assert len(estabilidad) == sum(len(grid) for grid in GRIDS.values())
+    assert (estabilidad['windows'] == 3).all()
+    assert list(resultado.summary()['strategy']) == list(GRIDS)